@@ -0,0 +1,84 @@
+"""Measures how long `import contextio` takes in a fresh interpreter.
+
+Usage:
+    python benchmarks/import_time.py [runs]
+
+Each run starts a new python process so module caches don't skew the
+numbers. The "before" column reproduces what the library used to do: import
+pkg_resources along with contextio, and look the version up through
+pkg_resources.require() to build its user-agent.
+"""
+import subprocess
+import sys
+import timeit
+
+# the version lookup the library used to run, "dev" when not installed
+OLD_VERSION_LOOKUP = """
+try:
+    pkg_resources.require("contextio")[0].version
+except Exception:
+    pass
+"""
+
+# (label, before, after)
+SCENARIOS = [
+    ("import contextio",
+     "import pkg_resources\nimport contextio",
+     "import contextio"),
+    ("import + user-agent",
+     "import pkg_resources\nimport contextio\n" + OLD_VERSION_LOOKUP,
+     "import contextio\nfrom contextio.lib.api import user_agent\nuser_agent('2.0')"),
+]
+
+
+def run(statement):
+    code = "import time\nstart = time.time()\n{0}\nprint(time.time() - start)".format(statement)
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return float(output.decode().strip())
+
+
+def median(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2]
+
+
+def measure(before, after, runs):
+    """Returns the median milliseconds of before (None if it can't run) and after.
+
+    The two are run alternately so that a busy machine slows both down alike.
+    """
+    before_timings, after_timings = [], []
+    for _ in range(runs):
+        after_timings.append(run(after))
+        if before_timings is not None:
+            try:
+                before_timings.append(run(before))
+            except subprocess.CalledProcessError:
+                before_timings = None
+
+    after_ms = median(after_timings) * 1000
+    if before_timings is None:
+        return None, after_ms
+
+    return median(before_timings) * 1000, after_ms
+
+
+def main(runs=10):
+    # warm the filesystem cache once before measuring
+    timeit.timeit(lambda: subprocess.call([sys.executable, "-c", "import contextio"]), number=1)
+
+    print("{0:<22} {1:>10} {2:>10} {3:>10}   (median of {4} runs)".format(
+        "", "before", "after", "delta", runs))
+    for label, before, after in SCENARIOS:
+        before_ms, after_ms = measure(before, after, runs)
+        if before_ms is None:
+            # pkg_resources isn't installed
+            print("{0:<22} {1:>10} {2:>7.1f} ms".format(label, "n/a", after_ms))
+            continue
+
+        print("{0:<22} {1:>7.1f} ms {2:>7.1f} ms {3:>+7.1f} ms".format(
+            label, before_ms, after_ms, after_ms - before_ms))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
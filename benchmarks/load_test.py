@@ -0,0 +1,153 @@
+"""Load tests the client against a local MockServer.
+
+Usage:
+    python benchmarks/load_test.py [--latency SECONDS] [--messages N]
+        [--body-size BYTES] [--file-size BYTES] [--workers N] [--json]
+
+Runs four workloads over real HTTP and prints, for each, the number of
+requests, requests/sec, p50/p99 latency as seen by the client and the peak
+memory allocated during a second, untimed run (tracemalloc, python 3 only):
+
+    list      pages through Account.get_messages(include_body=1)
+    hydrate   Account.get_messages_bulk() on every message
+    download  FileDownloader on every file
+    bulk      Account.post_message_flags_bulk() on every message
+
+With --json the results are printed as JSON, to be kept and compared
+between releases.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextio.lib.downloader import FileDownloader
+from contextio.lib.mock_server import MockServer
+from contextio.lib.v2_0 import V2_0
+
+
+class Timer(object):
+    """Records the duration of every request sent by api."""
+
+    def __init__(self, api):
+        self.durations = []
+        self._lock = threading.Lock()
+        send = api._send
+
+        def timed_send(method, url, request_kwargs):
+            start = time.time()
+            try:
+                return send(method, url, request_kwargs)
+            finally:
+                with self._lock:
+                    self.durations.append(time.time() - start)
+
+        api._send = timed_send
+
+    def reset(self):
+        with self._lock:
+            self.durations = []
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(name, timer, workload):
+    timer.reset()
+    start = time.time()
+    workload()
+    elapsed = time.time() - start
+    durations = list(timer.durations)
+
+    # measured on a second run, tracemalloc slows everything down
+    peak = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        workload()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "workload": name,
+        "requests": len(durations),
+        "requests_per_sec": len(durations) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(durations, 0.50) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "peak_memory_mb": None if peak is None else peak / 1024.0 / 1024.0,
+    }
+
+
+def main(args):
+    server = MockServer(
+        accounts=1, messages=args.messages, body_size=args.body_size,
+        file_size=args.file_size, latency=args.latency)
+    server.start()
+    directory = tempfile.mkdtemp()
+
+    try:
+        api = V2_0(
+            consumer_key="key", consumer_secret="secret", url_base=server.url_base,
+            pool_maxsize=args.workers)
+        timer = Timer(api)
+        account = api.get_accounts()[0]
+        message_ids = ["message-{0}".format(i) for i in range(args.messages)]
+
+        def list_messages():
+            for _ in account.iter_messages(page_size=100, include_body=1):
+                pass
+
+        def hydrate():
+            account.get_messages_bulk(message_ids, max_workers=args.workers)
+
+        def download():
+            downloader = FileDownloader(tempfile.mkdtemp(dir=directory), max_workers=args.workers)
+            downloader.download(account.get_files())
+
+        def bulk():
+            account.post_message_flags_bulk(message_ids, max_workers=args.workers, seen=1)
+
+        results = [run(name, timer, workload) for name, workload in [
+            ("list", list_messages), ("hydrate", hydrate), ("download", download),
+            ("bulk", bulk)]]
+    finally:
+        server.stop()
+        shutil.rmtree(directory)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("{0:<10}{1:>10}{2:>12}{3:>10}{4:>10}{5:>12}".format(
+        "workload", "requests", "req/s", "p50 ms", "p99 ms", "peak MB"))
+    for result in results:
+        peak = result["peak_memory_mb"]
+        print("{0:<10}{1:>10}{2:>12.0f}{3:>10.2f}{4:>10.2f}{5:>12}".format(
+            result["workload"], result["requests"], result["requests_per_sec"],
+            result["p50_ms"], result["p99_ms"], "-" if peak is None else "{0:.1f}".format(peak)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--body-size", type=int, default=2048)
+    parser.add_argument("--file-size", type=int, default=64 * 1024)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--json", action="store_true")
+    main(parser.parse_args())
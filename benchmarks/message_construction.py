@@ -0,0 +1,100 @@
+"""Measures how many Message objects can be built per second.
+
+Usage:
+    python benchmarks/message_construction.py [seconds]
+
+Builds Message resources from a typical get_messages() item, once with keys
+in underscore format (what the API returns) and once with camelCase keys,
+and prints objects/sec for the current helpers.uncamelize next to the
+previous implementation, which ran two re.sub calls per key.
+"""
+import copy
+import os
+import re
+import sys
+import timeit
+
+from mock import Mock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextio.lib import helpers
+from contextio.lib.resources.message import Message
+
+MESSAGE = {
+    "message_id": "4f7f0a9dfa7b2ec5000001",
+    "email_message_id": "<CAF0wzMpfZB@mail.gmail.com>",
+    "gmail_message_id": "1358b28fa9c0f3d7",
+    "gmail_thread_id": "1358b28fa9c0f3d7",
+    "subject": "Re: lunch?",
+    "date": 1333728669,
+    "date_indexed": 1333728700,
+    "date_received": 1333728670,
+    "folders": ["INBOX", "[Gmail]/All Mail"],
+    "addresses": {
+        "from": {"email": "jane@example.com", "name": "Jane"},
+        "to": [{"email": "john@example.com", "name": "John"}],
+    },
+    "person_info": {"jane@example.com": {"thumbnail": "https://example.com/jane.png"}},
+    "sources": [{"label": "jane::imap.gmail.com", "resource_url": "https://api.context.io/2.0/x"}],
+    "list_headers": {},
+    "in_reply_to": None,
+    "references": [],
+    "files": [],
+}
+
+# message_id is checked before keys are converted, so it keeps its name
+CAMEL_MESSAGE = dict(
+    (k if k == "message_id" else re.sub(r"_(\w)", lambda m: m.group(1).upper(), k), v)
+    for k, v in MESSAGE.items())
+
+
+def old_to_underscore(name):
+    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+
+
+def old_uncamelize(d):
+    drop = []
+
+    for k, v in list(d.items()):
+        u = old_to_underscore(k)
+        if u != k and u not in d:
+            d[u] = v
+            drop.append(k)
+
+    for k in drop:
+        del d[k]
+
+    return d
+
+
+def rate(definition, seconds):
+    parent = Mock(spec=["api_version"], api_version="2.0")
+    definitions = [copy.deepcopy(definition) for _ in range(1000)]
+
+    def build():
+        for d in definitions:
+            Message(parent, dict(d))
+
+    runs = 0
+    total = 0.0
+    while total < seconds:
+        total += timeit.timeit(build, number=1)
+        runs += 1
+
+    return runs * len(definitions) / total
+
+
+def main(seconds=2.0):
+    for label, definition in [("underscore keys", MESSAGE), ("camelCase keys", CAMEL_MESSAGE)]:
+        current = rate(definition, seconds)
+        with patch.object(helpers, "uncamelize", old_uncamelize):
+            previous = rate(definition, seconds)
+
+        print("{0:<16} {1:10.0f} objects/sec (previously {2:.0f}, x{3:.2f})".format(
+            label, current, previous, current / previous))
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
@@ -0,0 +1,69 @@
+"""Measures the memory held by Message objects, with and without compact_resources.
+
+Usage:
+    python benchmarks/resource_memory.py [count]
+
+Builds count Message resources (100000 by default) from get_messages()
+style items and reports the memory allocated for them with tracemalloc
+(python 3). The definitions are built before measuring, so only the
+resource objects themselves are counted.
+
+The savings depend on the interpreter: python 3.11 and 3.12 already store
+instance attributes inline, so compact resources save much less there than
+on older versions or 3.13.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextio.lib.v2_0 import V2_0
+from contextio.lib.resources.account import Account
+from contextio.lib.resources.message import Message
+
+
+def definitions(count):
+    return [{
+        "message_id": "message{0}".format(i),
+        "gmail_thread_id": "thread{0}".format(i // 4),
+        "subject": "subject",
+        "date": 1333728669 + i,
+        "date_indexed": 1333728700 + i,
+        "folders": ["INBOX"],
+        "addresses": {},
+        "person_info": {},
+        "sources": [],
+    } for i in range(count)]
+
+
+def measure(compact, count):
+    api = V2_0("key", "secret", compact_resources=compact)
+    account = Account(api, {"id": "account"})
+    items = definitions(count)
+
+    gc.collect()
+    tracemalloc.start()
+    messages = [Message(account, item) for item in items]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(messages) == count
+    return size
+
+
+def main(count=100000):
+    regular = measure(False, count)
+    compact = measure(True, count)
+
+    print("python {0}.{1}, {2} messages".format(sys.version_info[0], sys.version_info[1], count))
+    for label, size in [("regular", regular), ("compact_resources", compact)]:
+        print("{0:<18} {1:8.1f} MB  {2:6.0f} bytes/object".format(
+            label, size / 1024.0 / 1024, size / float(count)))
+
+    print("saved              {0:7.0f}%".format(100 - 100.0 * compact / regular))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
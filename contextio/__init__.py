@@ -15,3 +15,13 @@ from .lib.resources.source import Source
 from .lib.resources.thread import Thread
 from .lib.resources.user import User
 from .lib.resources.webhook import WebHook
+
+
+def __getattr__(name):
+    # imported on first use (python 3.7+), so that asyncio isn't loaded by
+    # every program using the synchronous client
+    if name == "AsyncContextIO":
+        from .lib.async_api import AsyncContextIO
+        return AsyncContextIO
+
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
@@ -1,14 +1,56 @@
-import pkg_resources
-import logging
-import six
+import json
+import threading
+
 from rauth import OAuth1Session
 
 from contextio.lib import helpers
+from contextio.lib.cache import ResponseCache
+from contextio.lib.conditional import NOT_MODIFIED
+from contextio.lib.debug import DEFAULT_BODY_LIMIT, DebugLog
+from contextio.lib.decoding import LazyList, get_decoder, is_json_array
 from contextio.lib.errors import RequestError
+from contextio.lib.hooks import Hooks
+from contextio.lib.metrics import MetricsCollector
+from contextio.lib.retry import RetryEngine
+from contextio.lib.transport import Transport
+from contextio.lib.resources.base_resource import enable_compact_resources
 from contextio.lib.resources.connect_token import ConnectToken
 from contextio.lib.resources.discovery import Discovery
 from contextio.lib.resources.oauth_provider import OauthProvider
 
+# set by get_lib_version()
+_lib_version = None
+
+
+def get_lib_version():
+    """Returns the installed version of this library, or 'dev'.
+
+    The lookup is done once per process. importlib.metadata is preferred since
+    pkg_resources is slow to import and scans every installed distribution.
+    """
+    global _lib_version
+
+    if _lib_version is None:
+        try:
+            try:
+                from importlib.metadata import version
+            except ImportError:
+                from pkg_resources import get_distribution
+
+                def version(name):
+                    return get_distribution(name).version
+
+            _lib_version = version("contextio")
+        except Exception:
+            _lib_version = "dev"
+
+    return _lib_version
+
+
+def user_agent(api_version):
+    return "contextio/{0}/python-lib-{1}".format(api_version, get_lib_version())
+
+
 class Api(object):
 
     """Parent class of module. This handles authentication and requests.
@@ -19,9 +61,57 @@ class Api(object):
         debug: string - Set to None by default. If you want debug messages,
             set to either 'print' or 'log'. If set to 'print', debug messages
             will be printed out. Useful for python's interactive console. If
-            set to 'log' will send debug messages to logging.debug()
+            set to 'log' will send debug messages to the "contextio" logger,
+            formatted only if DEBUG records are emitted (see
+            contextio.lib.debug).
+        debug_body_limit: integer - bytes of request and response bodies
+            included in debug messages, 1024 by default
+        debug_sample: integer - only describe one request in debug_sample
+        debug_errors: bool - always describe 4xx/5xx answers, at WARNING
+            level when logging. On by default.
+        transport: Transport - connection pool and timeout settings used to
+            send requests. If omitted, one is built from the pool_connections,
+            pool_maxsize, pool_block, max_retries, connect_timeout,
+            read_timeout, keep_alive, tcp_keepalive and tcp_nodelay keyword
+            arguments (see contextio.lib.transport.Transport).
+        cache: ResponseCache - caches the responses of read-heavy endpoints
+            (see contextio.lib.cache). Pass True for an in-memory cache with
+            the default TTLs. Off by default.
+        conditional_requests: bool - remember the ETag/Last-Modified
+            validators of resources and refresh them with conditional GET
+            requests (see contextio.lib.conditional). Off by default.
+        retry: RetryEngine - rate limits requests and retries the ones that
+            failed with 429, 5xx or a connection error (see
+            contextio.lib.retry). Pass True for the defaults: 3 retries with
+            backoff, no rate limit and no circuit breaker. Off by default.
+        json_decoder: string or callable - "orjson", "ujson", "json" or
+            "auto" (the fastest one installed), or a function decoding the
+            response bytes. response.json() is used by default.
+        lazy_lists: bool - return list responses as LazyList objects, whose
+            elements are decoded when accessed (see contextio.lib.decoding)
+        compact_resources: bool - build resources as __slots__ based
+            classes, which take much less memory (see
+            contextio.lib.resources.base_resource.compact_class)
+        lazy_resources: bool - Thread and Contact objects built from partial
+            data (e.g. by get_threads()) call get() the first time one of
+            their unset attributes is read
+        hooks: dict - event name => callable or list of callables, called
+            around every HTTP request (see contextio.lib.hooks). More can be
+            registered with add_hook().
+        metrics: MetricsCollector - records latency, sizes, statuses, errors
+            and retries per endpoint (see contextio.lib.metrics). Pass True
+            for a new collector. Off by default.
+        thread_safe: bool - give every thread its own session, all of them
+            sharing the transport's connection pool, so that one Api object
+            can be used by many threads at once. Set pool_maxsize to the
+            number of threads. Off by default.
     """
 
+    transport_options = [
+        "pool_connections", "pool_maxsize", "pool_block", "max_retries", "connect_timeout",
+        "read_timeout", "keep_alive", "tcp_keepalive", "tcp_nodelay"
+    ]
+
     def __init__(self, consumer_key, consumer_secret, debug=None, api_version="2.0", **kwargs):
         """Constructor that creates oauth2 consumer and client.
 
@@ -32,7 +122,22 @@ class Api(object):
         Optional Arguments:
             debug: if used, set to either 'print' or 'log' - if print, debug
                 messages will be sent to stdout. If set to 'log' will send
-                to logging.debug()
+                to the "contextio" logger
+            debug_body_limit, debug_sample, debug_errors: see class docstring
+            transport: Transport - custom transport, see class docstring
+            pool_connections, pool_maxsize, pool_block, max_retries,
+            connect_timeout, read_timeout, keep_alive, tcp_keepalive,
+            tcp_nodelay: options for the default Transport
+            cache: ResponseCache or True - response cache, see class docstring
+            conditional_requests: bool - see class docstring
+            retry: RetryEngine or True - see class docstring
+            json_decoder: string or callable - see class docstring
+            lazy_lists: bool - see class docstring
+            compact_resources: bool - see class docstring
+            lazy_resources: bool - see class docstring
+            hooks: dict - see class docstring
+            metrics: MetricsCollector or True - see class docstring
+            thread_safe: bool - see class docstring
         """
         self.url_base = kwargs.get("url_base")
 
@@ -45,13 +150,92 @@ class Api(object):
         if self.debug is True:   # for people who don't read the code and just set debug=True
             self.debug = "print"
 
+        self.debug_log = None
+        if self.debug in ("print", "log"):
+            self.debug_log = DebugLog(
+                self.debug, body_limit=kwargs.get("debug_body_limit", DEFAULT_BODY_LIMIT),
+                sample=kwargs.get("debug_sample", 1), errors=kwargs.get("debug_errors", True))
+
         self.consumer_key = consumer_key
         self.consumer_secret = consumer_secret
 
+        # sent with every request, callers' headers are merged over a copy
+        self.default_headers = {"user-agent": user_agent(self.api_version)}
+
+        self.transport = kwargs.get("transport")
+        if self.transport is None:
+            self.transport = Transport(**dict(
+                (k, v) for k, v in kwargs.items() if k in self.transport_options))
+
         self.session = OAuth1Session(self.consumer_key, self.consumer_secret)
 
+        # sessions of the other threads are created by _session() when needed
+        self.thread_safe = kwargs.get("thread_safe", False)
+        self._local = None
+        if self.thread_safe:
+            self.transport.mount(self.session, shared=True)
+            self._local = threading.local()
+            self._local.session = self.session
+        else:
+            self.transport.mount(self.session)
+
+        self.cache = kwargs.get("cache")
+        if self.cache is True:
+            self.cache = ResponseCache()
+
+        self.conditional_requests = kwargs.get("conditional_requests", False)
+
+        self.retry = kwargs.get("retry")
+        if self.retry is True:
+            self.retry = RetryEngine()
+
+        self.decoder = get_decoder(kwargs.get("json_decoder"))
+        self.lazy_lists = kwargs.get("lazy_lists", False)
+        self.compact_resources = kwargs.get("compact_resources", False)
+        if self.compact_resources:
+            enable_compact_resources()
+        self.lazy_resources = kwargs.get("lazy_resources", False)
+
+        # stays None without hooks, so that requests skip them entirely
+        self.hooks = None
+        for event, funcs in (kwargs.get("hooks") or {}).items():
+            for func in funcs if isinstance(funcs, (list, tuple)) else [funcs]:
+                self.add_hook(event, func)
+
+        self.metrics = kwargs.get("metrics")
+        if self.metrics is True:
+            self.metrics = MetricsCollector()
+        if self.metrics is not None:
+            self.metrics.install(self)
+
+    def add_hook(self, event, func):
+        """Registers func to be called on event for every HTTP request.
+
+        Required Arguments:
+            event: string - "before_request", "after_response" or "on_error"
+            func: callable - see contextio.lib.hooks for its arguments
+        """
+        if self.hooks is None:
+            self.hooks = Hooks()
+
+        self.hooks.add(event, func)
+
+    def __getstate__(self):
+        # the sessions of other threads aren't kept, see __setstate__
+        state = dict(self.__dict__)
+        state["_local"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.thread_safe:
+            # back on the shared adapter of the unpickled transport
+            self.transport.mount(self.session, shared=True)
+            self._local = threading.local()
+            self._local.session = self.session
+
     def _debug(self, response):
-        """Prints or logs a debug message.
+        """Prints or logs a description of response, see contextio.lib.debug.
 
         Required Arguments:
             response: object - the rauth response object.
@@ -59,21 +243,11 @@ class Api(object):
         Returns:
             None
         """
+        if self.debug_log is not None:
+            self.debug_log(response)
 
-        if self.debug:
-            message = (
-                "--------------------------------------------------\n"
-                "URL:    {0}\nMETHOD: {1}\nSTATUS: 2\n\nREQUEST\n{3}\n\n"
-                "RESPONSE\n{4}\n").format(
-                    response.request.url, response.request.method, response.status_code,
-                    response.request.__dict__, response.__dict__)
-
-            if self.debug == "print":
-                six.print_(message)
-            elif self.debug == "log":
-                logging.debug(message)
-
-    def _request_uri(self, uri="", method="GET", params={}, headers={}, body=""):
+    def _request_uri(self, uri="", method="GET", params=None, headers=None, body="",
+                     validators=None):
         """Assembles the request uri and calls the request method.
 
         Required Arguments:
@@ -85,43 +259,169 @@ class Api(object):
             params: dict - parameters to pass along
             headers: dict - any specific http headers
             body: string - request body, only used on a few PUT statements
+            validators: Validators - for GET requests, the validators of the
+                resource's previous response to send, updated from the response
 
         Returns:
             typically, JSON - depends on the API call, refer to the other
                 method docstrings for more details.
+            NOT_MODIFIED if validators were sent and the server answered 304.
         """
-        url = "/".join((self.url_base, self.api_version, uri))
+        params = params or {}
+        url, request_kwargs = self._request_args(uri, method, params, headers, body)
 
-        try:
-            lib_version = pkg_resources.require("contextio")[0].version
-        except:
-            lib_version = "dev"
+        if method != "GET":
+            validators = None
+        if validators is not None:
+            validator_headers = validators.headers_for(url, params)
+            if validator_headers:
+                request_kwargs["headers"] = dict(request_kwargs["headers"], **validator_headers)
 
-        headers.update(
-            {"user-agent": "contextio/{0}/python-lib-{1}".format(self.api_version, lib_version)})
+        if self.cache is not None and method == "GET":
+            response_body = self.cache.get(self.consumer_key, url, params)
+            if response_body is not None:
+                return response_body
 
-        if method == "POST":
-            params['body'] = body
-            response = self.session.request(
-                method, url, header_auth=True, data=params, headers=headers)
-        else:
-            response = self.session.request(
-                method, url, header_auth=True, params=params, headers=headers, data=body)
+        response = self._send(method, url, request_kwargs)
 
         self._debug(response)
+
+        if validators is not None:
+            if response.status_code == 304:
+                return NOT_MODIFIED
+
+            if 200 <= response.status_code < 300:
+                validators.update(url, params, response.headers)
+
         try:
-            response_body = response.json()
+            response_body = self._decode(response)
         except UnicodeDecodeError:
             response_body = response.content
         except ValueError:
             response_body = response.text
 
-        if response.status_code >= 200 and response.status_code < 300:
+        response_body = self._check_response(url, response.status_code, response_body, response)
+
+        if self.cache is not None:
+            if method == "GET":
+                self.cache.set(self.consumer_key, url, params, response_body)
+            else:
+                # only once the write went through, so that a read made
+                # meanwhile can't cache the old data again
+                self.cache.invalidate(url)
+
+        return response_body
+
+    def _decode(self, response):
+        """Decodes the JSON body of response with the configured decoder."""
+        return self._decode_content(response.content, response.json)
+
+    def _decode_content(self, content, default=None):
+        """Decodes a JSON body given as bytes with the configured decoder.
+
+        Optional Arguments:
+            default: callable - decodes the body when no decoder is configured,
+                json.loads by default
+        """
+        if self.lazy_lists and is_json_array(content):
+            return LazyList(content, self.decoder or json.loads)
+
+        if self.decoder is not None:
+            return self.decoder(content)
+
+        if default is not None:
+            return default()
+
+        return json.loads(content.decode("utf-8"))
+
+    def _session(self):
+        """Returns the session of the current thread, see thread_safe."""
+        if self._local is None:
+            return self.session
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = OAuth1Session(self.consumer_key, self.consumer_secret)
+            self.transport.mount(session, shared=True)
+            self._local.session = session
+
+        return session
+
+    def _send(self, method, url, request_kwargs):
+        """Sends the request through the transport, the hooks and the retry engine if any."""
+        session = self._session()
+
+        def send():
+            return self.transport.request(
+                session, method, url, header_auth=True, **request_kwargs)
+
+        if self.hooks is not None:
+            send = self.hooks.wrap(method, url, request_kwargs, send)
+
+        if self.retry is None:
+            return send()
+
+        return self.retry.send(method, url, send, key=self.consumer_key)
+
+    def _stream_uri(self, uri="", headers=None):
+        """Sends a GET request and returns the response without reading its body.
+
+        Used for downloads: the caller is expected to consume the body with
+        response.iter_content() and then close the response. The body is
+        never decoded as JSON.
+
+        Required Arguments:
+            uri: string - the assembled API endpoint.
+
+        Optional Parameters:
+            headers: dict - any specific http headers
+
+        Returns:
+            A requests.Response object opened in streaming mode.
+        """
+        url, request_kwargs = self._request_args(uri, "GET", {}, headers, "")
+        request_kwargs["stream"] = True
+        response = self._send("GET", url, request_kwargs)
+
+        self._debug(response)
+
+        if response.status_code < 200 or response.status_code >= 300:
+            try:
+                self._check_response(url, response.status_code, response.text, response)
+            finally:
+                response.close()
+
+        return response
+
+    def _request_args(self, uri, method, params, headers, body):
+        """Builds the url and the keyword arguments for the HTTP request.
+
+        Returns:
+            A (url, kwargs) tuple. kwargs holds the params/data/headers to
+                pass along with the request.
+        """
+        url = "/".join((self.url_base, self.api_version, uri))
+
+        if headers:
+            request_headers = dict(self.default_headers)
+            request_headers.update(headers)
+        else:
+            request_headers = self.default_headers
+
+        # the caller's params are never modified, they may be shared between threads
+        if method == "POST":
+            return url, {"data": dict(params, body=body), "headers": request_headers}
+
+        return url, {"params": params, "headers": request_headers, "data": body}
+
+    def _check_response(self, url, status_code, response_body, response=None):
+        """Returns response_body, or raises RequestError on a non-2xx status."""
+        if status_code >= 200 and status_code < 300:
             return response_body
         else:
             raise RequestError(
                 "Request to {0} failed with HTTP status code {1}: {2}".format(
-                    url, response.status_code, response_body), response=response)
+                    url, status_code, response_body), response=response)
 
     # THE FOLLOWING ROUTES ARE COMMON TO BOTH LITE AND 2.0
     def get_connect_tokens(self, **params):
@@ -0,0 +1,348 @@
+"""Asyncio client for the Context.IO API.
+
+Requires python 3.7+ and aiohttp (pip install contextio[async]).
+
+The async client reuses the regular resource classes. Calling a resource
+method through the client first runs it with a stand-in transport that
+records the HTTP request it wants to make, sends that request with aiohttp,
+then runs the method again with the response in hand. Resource methods never
+do I/O of their own, so every method of V2_0, Lite and the resource classes
+gets an awaitable counterpart without being rewritten. Methods that work on
+many resources at once (Account.get_messages_bulk(), the bulk flag and folder
+methods, get_threads(hydrate=True)) send all their requests concurrently.
+
+Streaming downloads, iter_* generators and fan_out() aren't supported, nor
+are the debug, retry, hooks, metrics, conditional_requests and
+lazy_resources options.
+
+    client = AsyncContextIO(consumer_key, consumer_secret)
+    accounts = await client.get_accounts(limit=10)
+    messages = await accounts[0].get_messages(include_body=1)
+    body = await messages[0].get_body()
+    await client.close()
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+
+from rauth import OAuth1Session
+
+from contextio.lib.concurrency import mapping_with
+from contextio.lib.errors import ArgumentError
+from contextio.lib.lite import Lite
+from contextio.lib.resources.base_resource import BaseResource
+from contextio.lib.v2_0 import V2_0
+
+# per-task replay state, see AsyncContextIO.call()
+_replay = contextvars.ContextVar("contextio_replay", default=None)
+
+# Api options whose work happens around the synchronous transport
+UNSUPPORTED_OPTIONS = (
+    "debug", "retry", "hooks", "metrics", "conditional_requests", "lazy_resources")
+
+
+class _PendingRequest(BaseException):
+    """Raised out of a resource method to hand requests over to the event loop.
+
+    Derives from BaseException so that bare `except Exception` blocks in
+    resource code don't swallow it.
+    """
+
+    def __init__(self, requests):
+        super(_PendingRequest, self).__init__()
+        self.requests = requests
+
+
+def _request_key(request):
+    uri, method, params, headers, body = request
+    return repr((uri, method, sorted(params.items()), sorted(headers.items()), body))
+
+
+class _Replay(object):
+    """The responses received so far, by request.
+
+    Each run of the method starts over; the n-th identical request of a run
+    gets the n-th response received for it. Failed requests replay their
+    exception.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.seen = {}
+
+    def start(self):
+        self.seen = {}
+
+    def add(self, request, response):
+        self.responses.setdefault(_request_key(request), []).append(response)
+
+    def next(self, request):
+        key = _request_key(request)
+        position = self.seen.get(key, 0)
+        responses = self.responses.get(key, ())
+        if position >= len(responses):
+            raise _PendingRequest([request])
+
+        self.seen[key] = position + 1
+        response = responses[position]
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    def map(self, func, items):
+        """Stands in for map_bounded(): calls func on every item, then hands
+        the requests all of them are waiting for over at once."""
+        results = []
+        pending = []
+        error = None
+
+        for item in items:
+            try:
+                results.append(func(item))
+            except _PendingRequest as e:
+                pending.extend(e.requests)
+                results.append(None)
+            except Exception as e:
+                if error is None:
+                    error = e
+                results.append(None)
+
+        if pending:
+            raise _PendingRequest(pending)
+        if error is not None:
+            raise error
+
+        return results
+
+
+class _SigningSession(OAuth1Session):
+    """OAuth1Session that signs requests and returns them instead of sending them."""
+
+    def send(self, request, **kwargs):
+        return request
+
+
+class _AsyncApiMixin(object):
+    def __init__(self, consumer_key, consumer_secret, **kwargs):
+        super(_AsyncApiMixin, self).__init__(consumer_key, consumer_secret, **kwargs)
+        self.signer = _SigningSession(self.consumer_key, self.consumer_secret)
+
+    def _request_uri(self, uri="", method="GET", params=None, headers=None, body="",
+                     validators=None):
+        # conditional requests aren't supported here, responses are always full
+        replay = _replay.get()
+        if replay is None:
+            raise RuntimeError(
+                "Resources of an AsyncContextIO client must be called through the client, "
+                "e.g. `await client.wrap(resource).get()`")
+
+        return replay.next((uri, method, dict(params or {}), dict(headers or {}), body))
+
+    def _stream_uri(self, uri="", headers=None):
+        raise NotImplementedError(
+            "Streaming downloads aren't supported by AsyncContextIO, use "
+            "`await client.wrap(file).get_content()`")
+
+
+class _AsyncV2_0(_AsyncApiMixin, V2_0):
+    pass
+
+
+class _AsyncLite(_AsyncApiMixin, Lite):
+    pass
+
+
+class AsyncResource(object):
+    """Wraps an Api or resource object so that its public methods are awaitable.
+
+    Attributes are read from the wrapped object. Methods return coroutines
+    whose results have their resources wrapped as well.
+    """
+
+    def __init__(self, target, client):
+        self.__dict__["_target"] = target
+        self.__dict__["_client"] = client
+
+    @property
+    def target(self):
+        """The wrapped synchronous object."""
+        return self._target
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+
+        if name.startswith("_") or not callable(value) or isinstance(value, type):
+            return value
+
+        @functools.wraps(value)
+        async def method(*args, **kwargs):
+            return self._client.wrap(await self._client.call(value, *args, **kwargs))
+
+        return method
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __repr__(self):
+        return "<Async {0!r}>".format(self._target)
+
+
+class AsyncContextIO(AsyncResource):
+    """Asyncio counterpart of ContextIO().
+
+    Required Arguments:
+        consumer_key: string - your Context.IO consumer key
+        consumer_secret: string - your Context.IO consumer secret
+
+    Optional Arguments:
+        api_version: string - "2.0" (default) or "lite"
+        limit: int - maximum number of simultaneous connections
+        limit_per_host: int - maximum number of simultaneous connections to
+            the API host, 0 means no limit
+        session: aiohttp.ClientSession - use an existing session instead of
+            creating one
+        any other keyword argument accepted by ContextIO(), except the ones
+            in UNSUPPORTED_OPTIONS
+    """
+
+    def __init__(self, consumer_key, consumer_secret, api_version="2.0", limit=100,
+                 limit_per_host=0, session=None, **kwargs):
+        unsupported = [name for name in UNSUPPORTED_OPTIONS if kwargs.get(name)]
+        if unsupported:
+            raise ArgumentError(
+                "AsyncContextIO doesn't support the following arguments: {0}".format(
+                    ", ".join(unsupported)))
+
+        api_class = _AsyncLite if api_version == "lite" else _AsyncV2_0
+        api = api_class(consumer_key, consumer_secret, api_version=api_version, **kwargs)
+
+        super(AsyncContextIO, self).__init__(api, self)
+
+        self.__dict__["limit"] = limit
+        self.__dict__["limit_per_host"] = limit_per_host
+        self.__dict__["session"] = session
+        self.__dict__["_owns_session"] = session is None
+
+    @property
+    def api(self):
+        """The synchronous Api object resources are attached to."""
+        return self._target
+
+    def wrap(self, value):
+        """Makes resources (or lists of resources) awaitable through this client."""
+        if isinstance(value, BaseResource):
+            return AsyncResource(value, self)
+
+        if isinstance(value, list) and value and isinstance(value[0], BaseResource):
+            return [self.wrap(item) for item in value]
+
+        return value
+
+    async def call(self, method, *args, **kwargs):
+        """Runs a synchronous resource or Api method, performing its requests asynchronously."""
+        replay = _Replay()
+
+        while True:
+            token = _replay.set(replay)
+            try:
+                replay.start()
+                with mapping_with(replay.map):
+                    result = method(*args, **kwargs)
+            except _PendingRequest as pending:
+                requests = pending.requests
+            else:
+                if inspect.isgenerator(result):
+                    result.close()
+                    raise TypeError("{0}() returns a generator, which AsyncContextIO can't "
+                                    "run".format(method.__name__))
+
+                return result
+            finally:
+                _replay.reset(token)
+
+            responses = await asyncio.gather(
+                *[self._request_uri_async(*request) for request in requests],
+                return_exceptions=True)
+            for request, response in zip(requests, responses):
+                if isinstance(response, BaseException) and not isinstance(response, Exception):
+                    raise response
+                replay.add(request, response)
+
+    async def fan_out(self, *args, **kwargs):
+        raise NotImplementedError(
+            "fan_out() runs jobs on threads, which can't use AsyncContextIO; use the "
+            "synchronous client, or asyncio.gather() over the accounts")
+
+    async def _request_uri_async(self, uri="", method="GET", params=None, headers=None, body=""):
+        api = self.api
+        params = dict(params or {})
+        url, request_kwargs = api._request_args(uri, method, params, dict(headers or {}), body)
+
+        if api.cache is not None and method == "GET":
+            response_body = api.cache.get(api.consumer_key, url, params)
+            if response_body is not None:
+                return response_body
+
+        prepared = api.signer.request(method, url, header_auth=True, **request_kwargs)
+        status, content = await self._send(prepared)
+
+        try:
+            response_body = api._decode_content(content)
+        except UnicodeDecodeError:
+            response_body = content
+        except ValueError:
+            response_body = content.decode("utf-8")
+
+        response_body = api._check_response(url, status, response_body)
+
+        if api.cache is not None:
+            if method == "GET":
+                api.cache.set(api.consumer_key, url, params, response_body)
+            else:
+                api.cache.invalidate(url)
+
+        return response_body
+
+    def _get_session(self):
+        if self.session is None:
+            import aiohttp
+
+            session_kwargs = {
+                "connector": aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host)
+            }
+
+            timeout = self.api.transport.timeout
+            if timeout is not None:
+                session_kwargs["timeout"] = aiohttp.ClientTimeout(
+                    sock_connect=timeout[0], sock_read=timeout[1])
+
+            self.__dict__["session"] = aiohttp.ClientSession(**session_kwargs)
+
+        return self.session
+
+    async def _send(self, prepared):
+        """Sends a signed requests.PreparedRequest, returns (status, body bytes)."""
+        session = self._get_session()
+
+        async with session.request(
+                prepared.method, prepared.url, headers=dict(prepared.headers),
+                data=prepared.body) as response:
+            return response.status, await response.read()
+
+    async def close(self):
+        if self.session is not None and self._owns_session:
+            await self.session.close()
+            self.__dict__["session"] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __repr__(self):
+        return "<AsyncContextIO api_version={0}>".format(self.api.api_version)
+
@@ -0,0 +1,96 @@
+import threading
+import time
+
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS, map_bounded, mapped
+from contextio.lib.errors import ArgumentError
+from contextio.lib.retry import TokenBucket
+
+
+class BatchReport(object):
+    """Outcome of a batch of per-message requests.
+
+    Properties:
+        succeeded: list of strings - message ids the request succeeded for,
+            in the order they were given
+        failed: dict - message id => exception raised for it, or False when
+            the API answered without success
+        elapsed: float - wall clock seconds the batch took
+    """
+
+    def __init__(self):
+        self.succeeded = []
+        self.failed = {}
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        """True if no request failed."""
+        return not self.failed
+
+    def __len__(self):
+        return len(self.succeeded) + len(self.failed)
+
+    def __repr__(self):
+        return "<BatchReport succeeded={0} failed={1} elapsed={2:.2f}s>".format(
+            len(self.succeeded), len(self.failed), self.elapsed)
+
+
+def run_batch(func, message_ids, max_workers=DEFAULT_MAX_WORKERS, rate=None):
+    """Calls func on every distinct message id, collecting failures.
+
+    Required Arguments:
+        func: callable - takes a message id, returns a truthy value on
+            success
+        message_ids: iterable of strings - duplicates are only sent once
+
+    Optional Arguments:
+        max_workers: integer - maximum number of requests in flight
+        rate: float - maximum number of requests started per second, no limit
+            by default
+
+    Returns:
+        A BatchReport. Exceptions raised by func are stored in it rather than
+            raised.
+    """
+    seen = set()
+    ids = []
+    for message_id in message_ids:
+        if message_id not in seen:
+            seen.add(message_id)
+            ids.append(message_id)
+
+    if rate and mapped():
+        # the calls are replayed by the client, a sleep would block it
+        raise ArgumentError("rate isn't supported here, limit the client's connections instead")
+
+    bucket = TokenBucket(rate) if rate else None
+    outcomes = {}
+    lock = threading.Lock()
+
+    def call(message_id):
+        if bucket is not None:
+            wait = bucket.reserve()
+            if wait > 0:
+                time.sleep(wait)
+
+        try:
+            outcome = True if func(message_id) else False
+        except Exception as e:
+            outcome = e
+
+        with lock:
+            outcomes[message_id] = outcome
+
+    report = BatchReport()
+    start = time.time()
+    map_bounded(call, ids, max_workers)
+    report.elapsed = time.time() - start
+
+    for message_id in ids:
+        outcome = outcomes[message_id]
+        if outcome is True:
+            report.succeeded.append(message_id)
+        else:
+            report.failed[message_id] = outcome
+
+    return report
@@ -0,0 +1,326 @@
+"""Response cache for read-heavy endpoints.
+
+    from contextio.lib.cache import DiskCache, ResponseCache
+
+    directory = os.path.expanduser("~/.cache/contextio")
+    context_io = ContextIO(key, secret, cache=ResponseCache(DiskCache(directory)))
+
+GET responses are cached per (consumer key, url, sorted params) for the TTL
+configured for their endpoint. The url contains the account id, so accounts
+never share entries. A POST, PUT or DELETE drops the cached responses of the
+resource it touched, of the resources below it and of the lists above it,
+once the write succeeded.
+
+Responses are stored as JSON (LazyList bodies as regular lists), so reading
+a cache file never runs code. Responses that aren't JSON aren't cached.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from six.moves.urllib.parse import urlencode, urlsplit
+
+from contextio.lib.decoding import LazyList
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# seconds, keyed by the collection name in the url. A url is matched on its
+# last segment (lists) or the one before it (single resources), so
+# "accounts/<id>/contacts/<email>" uses the "contacts" TTL but
+# "accounts/<id>/contacts/<email>/messages" isn't cached.
+DEFAULT_TTLS = {
+    "folders": 300,
+    "sources": 300,
+    "email_addresses": 300,
+    "oauth_providers": 3600,
+    "contacts": 300,
+}
+
+
+class _LRUCache(object):
+    """Size bounded LRU store of byte strings, the base of the cache backends.
+
+    Subclasses store the data itself through _read(), _write() and _remove().
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # key => (expires, size), least recently used first
+        self._index = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the bytes stored under key, or None if missing or expired."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+
+            if entry[0] <= time.time():
+                self._drop(key)
+                return None
+
+            data = self._read(key)
+            if data is None:
+                self._drop(key)
+                return None
+
+            # move to the most recently used end
+            del self._index[key]
+            self._index[key] = entry
+            return data
+
+    def set(self, key, data, ttl):
+        """Stores data under key for ttl seconds, evicting old entries if needed."""
+        if len(data) > self.max_bytes:
+            return
+
+        expires = time.time() + ttl
+        with self._lock:
+            if key in self._index:
+                self._drop(key)
+
+            while self._index and self.size + len(data) > self.max_bytes:
+                self._drop(next(iter(self._index)))
+
+            self._write(key, data, expires)
+            self._index[key] = (expires, len(data))
+            self.size += len(data)
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._index:
+                self._drop(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._index)
+
+    def clear(self):
+        for key in self.keys():
+            self.delete(key)
+
+    def __len__(self):
+        return len(self._index)
+
+    def _drop(self, key):
+        expires, size = self._index.pop(key)
+        self.size -= size
+        self._remove(key)
+
+    def _read(self, key):
+        raise NotImplementedError
+
+    def _write(self, key, data, expires):
+        raise NotImplementedError
+
+    def _remove(self, key):
+        raise NotImplementedError
+
+
+class MemoryCache(_LRUCache):
+    """Keeps cached responses in memory.
+
+    Optional Arguments:
+        max_bytes: integer - the most bytes of (JSON encoded) responses to keep
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        super(MemoryCache, self).__init__(max_bytes)
+        self._data = {}
+
+    def _read(self, key):
+        return self._data.get(key)
+
+    def _write(self, key, data, expires):
+        self._data[key] = data
+
+    def _remove(self, key):
+        self._data.pop(key, None)
+
+
+class DiskCache(_LRUCache):
+    """Keeps cached responses in files, one per entry.
+
+    Entries written by a previous process are picked up, least recently used
+    first according to their modification time. A file holds a JSON line
+    with the key and expiry time, followed by the data.
+
+    Required Arguments:
+        directory: string - where to write the cache files, created (only
+            accessible to the current user) if missing
+
+    Optional Arguments:
+        max_bytes: integer - the most bytes of (JSON encoded) responses to keep
+    """
+
+    suffix = ".cache"
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        super(DiskCache, self).__init__(max_bytes)
+        self.directory = directory
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+
+        self._load()
+
+    def path_for(self, key):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + self.suffix)
+
+    def _load(self):
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.endswith(self.suffix)]
+
+        for path in sorted(paths, key=os.path.getmtime):
+            try:
+                with open(path, "rb") as f:
+                    key, expires = json.loads(f.readline().decode("utf-8"))
+                    data = f.read()
+            except (IOError, OSError, ValueError):
+                os.remove(path)
+                continue
+
+            self._index[key] = (expires, len(data))
+            self.size += len(data)
+
+        while self._index and self.size > self.max_bytes:
+            self._drop(next(iter(self._index)))
+
+    def _read(self, key):
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                f.readline()
+                data = f.read()
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+
+        return data
+
+    def _write(self, key, data, expires):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps([key, expires]).encode("utf-8") + b"\n")
+            f.write(data)
+
+        getattr(os, "replace", os.rename)(tmp_path, self.path_for(key))
+
+    def _remove(self, key):
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+
+class ResponseCache(object):
+    """Caches decoded API responses, see the module docstring.
+
+    Optional Arguments:
+        backend: MemoryCache or DiskCache (or an object with the same get,
+            set, delete and keys methods) - where responses are kept,
+            a MemoryCache by default
+        ttls: dict - collection name => seconds, merged over DEFAULT_TTLS.
+            Set a collection to 0 to stop caching it.
+        default_ttl: integer - seconds to cache the endpoints not listed in
+            ttls, 0 (the default) means they are not cached
+
+    Properties:
+        hits: integer - requests answered from the cache
+        misses: integer - cacheable requests that went to the API
+        invalidations: integer - entries dropped because of a write
+    """
+
+    def __init__(self, backend=None, ttls=None, default_ttl=0):
+        self.backend = MemoryCache() if backend is None else backend
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url):
+        segments = urlsplit(url).path.strip("/").split("/")
+        for segment in segments[-2:][::-1]:
+            if segment in self.ttls:
+                return self.ttls[segment]
+
+        return self.default_ttl
+
+    @staticmethod
+    def key(consumer_key, url, params):
+        query = urlencode(sorted((params or {}).items()))
+        return "{0} GET {1}?{2}".format(consumer_key, url, query)
+
+    def get(self, consumer_key, url, params):
+        """Returns the cached response body, or None."""
+        if not self.ttl_for(url):
+            return None
+
+        data = self.backend.get(self.key(consumer_key, url, params))
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        # every hit gets its own copy since resources modify the dicts they're built from
+        return json.loads(data.decode("utf-8"))
+
+    def set(self, consumer_key, url, params, response_body):
+        ttl = self.ttl_for(url)
+        if not ttl:
+            return
+
+        try:
+            data = json.dumps(response_body, default=_encode).encode("utf-8")
+        except (TypeError, ValueError):
+            return
+
+        self.backend.set(self.key(consumer_key, url, params), data, ttl)
+
+    def invalidate(self, url):
+        """Drops the cached responses a write to url may have changed."""
+        path = url.rstrip("/")
+        for key in self.backend.keys():
+            cached = key.split(" ", 2)[2].split("?", 1)[0]
+            if _within(cached, path) or _within(path, cached):
+                self.backend.delete(key)
+                with self._lock:
+                    self.invalidations += 1
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Returns the hit/miss counters and the backend size as a dict."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "entries": len(self.backend),
+                "bytes": self.backend.size,
+            }
+
+
+def _encode(value):
+    if isinstance(value, LazyList):
+        return list(value)
+
+    raise TypeError("{0!r} can't be cached".format(value))
+
+
+def _within(url, parent):
+    return url == parent or url.startswith(parent + "/")
@@ -0,0 +1,59 @@
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 8
+
+# per-thread replacement for the thread pool of map_bounded, see mapping_with()
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def mapping_with(runner):
+    """Makes map_bounded() return runner(func, items) on this thread instead.
+
+    Used by clients that can't make requests from other threads, like
+    AsyncContextIO.
+    """
+    previous = getattr(_local, "runner", None)
+    _local.runner = runner
+    try:
+        yield
+    finally:
+        _local.runner = previous
+
+
+def mapped():
+    """True if map_bounded() calls are handed to a runner on this thread."""
+    return getattr(_local, "runner", None) is not None
+
+
+def map_bounded(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """Calls func on every item with at most max_workers threads.
+
+    Required Arguments:
+        func: callable - takes one item
+        items: iterable - the items to process
+
+    Optional Arguments:
+        max_workers: int - maximum number of concurrent calls
+
+    Returns:
+        A list of the results, in the same order as items. If func raised, the
+            first exception (in item order) is re-raised after all calls have
+            finished.
+    """
+    items = list(items)
+    runner = getattr(_local, "runner", None)
+    if runner is not None:
+        return runner(func, items)
+
+    workers = min(max_workers or 1, len(items))
+
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, item) for item in items]
+
+    return [future.result() for future in futures]
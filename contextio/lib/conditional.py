@@ -0,0 +1,64 @@
+"""Validators for conditional GET requests.
+
+With Api(conditional_requests=True), every resource remembers the ETag and
+Last-Modified headers of the last full response it was built from.
+Refreshing it with get() sends them back as If-None-Match /
+If-Modified-Since, and a 304 answer makes the request return NOT_MODIFIED
+so the resource keeps its current attributes. The validators belong to the
+resource and not to the url, so a resource that hasn't been fetched yet
+never sends any.
+"""
+from six.moves.urllib.parse import urlencode
+
+
+class _NotModified(object):
+    def __repr__(self):
+        return "NOT_MODIFIED"
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+
+# returned by Api._request_uri(validators=...) on a 304 response
+NOT_MODIFIED = _NotModified()
+
+
+class Validators(object):
+    """The validators of the last full response to one resource's GET.
+
+    They are only sent back for the same url and params.
+    """
+    __slots__ = ("key", "etag", "last_modified")
+
+    def __init__(self):
+        self.key = None
+        self.etag = None
+        self.last_modified = None
+
+    @staticmethod
+    def key_for(url, params):
+        return "{0}?{1}".format(url, urlencode(sorted((params or {}).items())))
+
+    def headers_for(self, url, params):
+        """Returns the conditional headers to send for url, may be empty."""
+        if self.key is None or self.key != self.key_for(url, params):
+            return {}
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    def update(self, url, params, response_headers):
+        """Stores the validators found in response_headers, if any."""
+        self.etag = response_headers.get("ETag")
+        self.last_modified = response_headers.get("Last-Modified")
+        if self.etag or self.last_modified:
+            self.key = self.key_for(url, params)
+        else:
+            self.key = None
@@ -0,0 +1,132 @@
+"""Debug output of requests and responses.
+
+With Api(debug="log"), a description of each request is logged to the
+"contextio" logger at DEBUG level. The description is only formatted if
+the record is actually emitted, bodies are cut to debug_body_limit bytes,
+the Authorization header is never written out and only one request in
+debug_sample is described. Answers with a 4xx/5xx status are always
+described, at WARNING level, unless debug_errors=False.
+
+debug="print" prints the same descriptions instead.
+"""
+import itertools
+import logging
+
+import six
+
+logger = logging.getLogger("contextio")
+
+DEFAULT_BODY_LIMIT = 1024
+SEPARATOR = "-" * 50
+REDACTED_HEADERS = ("authorization", "proxy-authorization", "cookie")
+
+
+def truncate(body, limit):
+    """Returns body as text, cut to limit characters."""
+    if body is None:
+        return ""
+
+    if isinstance(body, bytes):
+        text = body[:limit].decode("utf-8", "replace")
+        size = len(body)
+    elif isinstance(body, six.string_types):
+        text = body[:limit]
+        size = len(body)
+    else:
+        text = repr(body)
+        size = len(text)
+        text = text[:limit]
+
+    if size > limit:
+        text += "... ({0} more)".format(size - limit)
+
+    return text
+
+
+@six.python_2_unicode_compatible
+class ResponseDescription(object):
+    """Formats a response for the logs when converted to a string."""
+
+    __slots__ = ("response", "body_limit")
+
+    def __init__(self, response, body_limit):
+        self.response = response
+        self.body_limit = body_limit
+
+    def __str__(self):
+        response = self.response
+        request = response.request
+
+        return "\n".join([
+            SEPARATOR,
+            "URL:    {0}".format(request.url),
+            "METHOD: {0}".format(request.method),
+            "STATUS: {0}".format(response.status_code),
+            "",
+            "REQUEST HEADERS",
+            _headers(getattr(request, "headers", None)),
+            "REQUEST BODY",
+            truncate(getattr(request, "body", None), self.body_limit),
+            "",
+            "RESPONSE HEADERS",
+            _headers(getattr(response, "headers", None)),
+            "RESPONSE BODY",
+            truncate(_read_body(response), self.body_limit),
+        ])
+
+
+class DebugLog(object):
+    """Describes requests, see the module docstring.
+
+    Required Arguments:
+        mode: string - "log" or "print"
+
+    Optional Arguments:
+        body_limit: integer - bytes of each body written out
+        sample: integer - describe one request in sample
+        errors: bool - always describe answers with a 4xx/5xx status
+    """
+
+    def __init__(self, mode, body_limit=DEFAULT_BODY_LIMIT, sample=1, errors=True):
+        self.mode = mode
+        self.body_limit = body_limit
+        self.sample = max(int(sample or 1), 1)
+        self.errors = errors
+        self._counter = itertools.count()
+
+    def __call__(self, response):
+        failed = self.errors and response.status_code >= 400
+        sampled = next(self._counter) % self.sample == 0
+
+        if self.mode == "print":
+            if failed or sampled:
+                six.print_(str(ResponseDescription(response, self.body_limit)))
+            return
+
+        if failed:
+            logger.warning("%s", ResponseDescription(response, self.body_limit))
+        elif sampled and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", ResponseDescription(response, self.body_limit))
+
+
+def _headers(headers):
+    if not headers:
+        return ""
+
+    try:
+        items = sorted(headers.items())
+    except (AttributeError, TypeError):
+        return repr(headers)
+
+    return "\n".join(
+        "{0}: {1}".format(name, "<redacted>" if name.lower() in REDACTED_HEADERS else value)
+        for name, value in items)
+
+
+def _read_body(response):
+    # streamed responses (downloads) haven't been read, and mustn't be here
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes):
+        return content
+
+    return "<not read>"
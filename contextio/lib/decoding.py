@@ -0,0 +1,180 @@
+"""JSON decoding of API responses.
+
+By default responses are decoded with response.json(). Api(json_decoder=...)
+selects a faster decoder, and Api(lazy_lists=True) returns list responses as
+LazyList objects whose elements are only decoded when they're accessed.
+"""
+import json
+import re
+
+DECODERS = ("orjson", "ujson", "json")
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_TOKENS = r'(?P<s>{0})|(?P<o>[\[{{])|(?P<c>[\]}}])|(?P<sep>,)'.format(_STRING)
+_tokens = re.compile(_TOKENS)
+_tokens_bytes = re.compile(_TOKENS.encode("ascii"))
+_array = re.compile(r"\s*\[")
+_array_bytes = re.compile(br"\s*\[")
+
+
+def get_decoder(name):
+    """Returns a loads() function.
+
+    Required Arguments:
+        name: string or callable - "orjson", "ujson" or "json", "auto" for
+            the first of them that is installed, or a function taking the
+            response bytes. None means response.json() is used.
+
+    Returns:
+        A callable, or None.
+    """
+    if name is None or callable(name):
+        return name
+
+    names = DECODERS if name == "auto" else (name,)
+    for module_name in names:
+        if module_name not in DECODERS:
+            raise ValueError("Unknown JSON decoder {0!r}".format(module_name))
+
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            if name != "auto":
+                raise
+            continue
+
+        return module.loads
+
+
+def is_json_array(raw):
+    """True if raw (bytes or text) holds a JSON array."""
+    pattern = _array_bytes if isinstance(raw, bytes) else _array
+    return pattern.match(raw) is not None
+
+
+def map_list(func, items):
+    """Applies func to every item, lazily if items is a LazyList."""
+    if isinstance(items, LazyList):
+        return items.map(func)
+
+    return [func(item) for item in items]
+
+
+class LazyList(object):
+    """Read-only sequence over a JSON array, decoding elements on first access.
+
+    The array is split into elements with a single regex pass; each element is
+    then decoded (and passed through transform, if given) the first time it's
+    read and kept for the next reads.
+
+    Required Arguments:
+        raw: bytes or string - the JSON array
+
+    Optional Arguments:
+        loads: callable - decodes one element
+        transform: callable - applied to every decoded element
+    """
+
+    def __init__(self, raw, loads=json.loads, transform=None, _spans=None):
+        self._raw = raw
+        self._loads = loads
+        self._transform = transform
+        self._spans = _spans
+        self._items = {}
+
+    def map(self, func):
+        """Returns a LazyList of func(element), sharing this list's raw data."""
+        transform = func
+        if self._transform is not None:
+            inner = self._transform
+            transform = lambda item: func(inner(item))
+
+        return LazyList(self._raw, self._loads, transform, self._index())
+
+    def _index(self):
+        if self._spans is None:
+            self._spans = _split(self._raw)
+
+        return self._spans
+
+    def _get(self, i):
+        try:
+            return self._items[i]
+        except KeyError:
+            pass
+
+        start, end = self._index()[i]
+        item = self._loads(self._raw[start:end])
+        if self._transform is not None:
+            item = self._transform(item)
+
+        self._items[i] = item
+        return item
+
+    def __len__(self):
+        return len(self._index())
+
+    def __bool__(self):
+        return len(self) > 0
+
+    __nonzero__ = __bool__
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LazyList index out of range")
+
+        return self._get(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._get(i)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # pickled as a regular list
+        return (list, (list(self),))
+
+    def __repr__(self):
+        return "<LazyList of {0} items>".format(len(self))
+
+
+def _split(raw):
+    """Returns the (start, end) offsets of the elements of a JSON array."""
+    pattern = _tokens_bytes if isinstance(raw, bytes) else _tokens
+    spans = []
+    depth = 0
+    start = None
+
+    for match in pattern.finditer(raw):
+        kind = match.lastgroup
+        if kind == "s":
+            continue
+
+        if kind == "o":
+            depth += 1
+            if depth == 1:
+                start = match.end()
+        elif kind == "c":
+            depth -= 1
+            if depth == 0:
+                spans.append((start, match.start()))
+                break
+        elif depth == 1:
+            spans.append((start, match.start()))
+            start = match.end()
+
+    # "[]" holds no elements rather than an empty one
+    if len(spans) == 1 and not raw[spans[0][0]:spans[0][1]].strip():
+        return []
+
+    return spans
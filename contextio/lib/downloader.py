@@ -0,0 +1,179 @@
+import logging
+import os
+import re
+import threading
+import time
+
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS, map_bounded
+from contextio.lib.helpers import replace_file
+from contextio.lib.resources.file import DEFAULT_CHUNK_SIZE
+
+PARTIAL_SUFFIX = ".part"
+
+
+class DownloadReport(object):
+    """Outcome of a FileDownloader run.
+
+    Properties:
+        downloaded: list of strings - file_ids written in this run
+        resumed: list of strings - file_ids (also in downloaded) that were
+            continued from a partial download
+        skipped: list of strings - file_ids that were already present
+        failed: dict - file_id => exception for files that could not be
+            downloaded
+        bytes: integer - number of bytes transferred over the network
+        elapsed: float - wall clock seconds the run took
+    """
+
+    def __init__(self):
+        self.downloaded = []
+        self.resumed = []
+        self.skipped = []
+        self.failed = {}
+        self.bytes = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def throughput(self):
+        """Bytes transferred per second."""
+        if not self.elapsed:
+            return 0.0
+
+        return self.bytes / self.elapsed
+
+    def _add_bytes(self, count):
+        with self._lock:
+            self.bytes += count
+
+    def __repr__(self):
+        return (
+            "<DownloadReport downloaded={0} resumed={1} skipped={2} failed={3} "
+            "bytes={4} throughput={5:.0f}B/s>").format(
+                len(self.downloaded), len(self.resumed), len(self.skipped), len(self.failed),
+                self.bytes, self.throughput)
+
+
+class FileDownloader(object):
+    """Downloads many File resources to a directory concurrently.
+
+    Files are written as "<file_id>_<file_name>". A file already present with
+    the expected size is skipped. Data is first written to a ".part" file;
+    when a ".part" file is found, the download is resumed from where it
+    stopped using an HTTP Range request, or restarted if the server doesn't
+    support ranges.
+
+    Required Arguments:
+        directory: string - where to write files, created if missing
+
+    Optional Arguments:
+        max_workers: integer - number of files downloaded at the same time
+        chunk_size: integer - bytes read from the network at a time
+        resume: bool - set to False to always restart partial downloads
+    """
+
+    def __init__(self, directory, max_workers=DEFAULT_MAX_WORKERS,
+                 chunk_size=DEFAULT_CHUNK_SIZE, resume=True):
+        self.directory = directory
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.resume = resume
+
+    def path_for(self, file):
+        """Returns the path a File is written to."""
+        name = file.file_id
+        if file.file_name:
+            name = "{0}_{1}".format(name, re.sub(r"[^\w.-]", "_", file.file_name))
+
+        return os.path.join(self.directory, name)
+
+    def download(self, files):
+        """Downloads files concurrently.
+
+        Required Arguments:
+            files: iterable of File objects
+
+        Returns:
+            A DownloadReport. Failures are collected in the report instead
+                of being raised.
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        report = DownloadReport()
+        start = time.time()
+
+        map_bounded(lambda file: self._download_one(file, report), files, self.max_workers)
+
+        report.elapsed = time.time() - start
+        return report
+
+    def download_account(self, account, **params):
+        """Downloads every file of an account.
+
+        Required Arguments:
+            account: Account object
+
+        Optional Arguments:
+            any argument accepted by Account.get_files(), e.g. file_name or
+                indexed_after
+
+        Returns:
+            A DownloadReport.
+        """
+        return self.download(account.iter_files(**params))
+
+    def _download_one(self, file, report):
+        path = self.path_for(file)
+
+        try:
+            if self._is_complete(path, file.size):
+                report.skipped.append(file.file_id)
+                return
+
+            partial = path + PARTIAL_SUFFIX
+            offset = 0
+            if self.resume and os.path.exists(partial):
+                offset = os.path.getsize(partial)
+
+            if file.size is not None and offset > file.size:
+                # longer than the file itself, so it can't be a prefix of it
+                offset = 0
+
+            # offset == file.size when the previous run got every byte but was
+            # stopped before the rename
+            if file.size is None or offset < file.size:
+                offset = self._fetch(file, partial, offset, report)
+
+            replace_file(partial, path)
+
+            report.downloaded.append(file.file_id)
+            if offset:
+                report.resumed.append(file.file_id)
+        except Exception as e:
+            logging.warning("Could not download file {0}: {1}".format(file.file_id, e))
+            report.failed[file.file_id] = e
+
+    def _fetch(self, file, partial, offset, report):
+        """Writes the file to partial, returns the offset the download resumed from."""
+        response = file.stream_content(offset=offset)
+        try:
+            if offset and response.status_code != 206:
+                offset = 0
+
+            with open(partial, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        report._add_bytes(len(chunk))
+        finally:
+            response.close()
+
+        return offset
+
+    @staticmethod
+    def _is_complete(path, size):
+        if not os.path.exists(path):
+            return False
+
+        return size is None or os.path.getsize(path) == size
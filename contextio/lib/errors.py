@@ -10,3 +10,11 @@ class MissingResourceId(Exception):
 
 class RequestError(HTTPError):
     pass
+
+class CircuitOpenError(RequestError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+    pass
+
+class SyncTimeout(Exception):
+    """Raised by SyncWatcher when a source didn't finish syncing in time."""
+    pass
@@ -0,0 +1,194 @@
+"""Runs a job over many accounts (or Lite users) at once.
+
+    report = context_io.fan_out(sync_account, max_workers=32, per_account=1)
+
+V2_0.fan_out() and Lite.fan_out() call fan_out() with every account or user
+of the consumer key, fetched one page at a time. The job is called with one
+resource at a time on a thread pool, or on a process pool with
+processes=True. Exceptions raised by the job are collected in the returned
+FanOutReport rather than raised.
+"""
+import threading
+import time
+from collections import deque
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS
+
+# client args => Api instance, in each worker process
+_process_clients = {}
+_process_clients_lock = threading.Lock()
+
+
+class FanOutReport(object):
+    """Outcome of a fan_out() run.
+
+    Properties:
+        results: list of tuples - (resource id, value returned by the job)
+            for each job that succeeded, in the order the resources were given
+        failed: list of tuples - (resource id, exception raised by the job),
+            in the order the resources were given
+        elapsed: float - wall clock seconds the run took
+    """
+
+    def __init__(self):
+        self.results = []
+        self.failed = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        """True if no job failed."""
+        return not self.failed
+
+    def __len__(self):
+        return len(self.results) + len(self.failed)
+
+    def __repr__(self):
+        return "<FanOutReport succeeded={0} failed={1} elapsed={2:.2f}s>".format(
+            len(self.results), len(self.failed), self.elapsed)
+
+
+def fan_out(func, resources, max_workers=DEFAULT_MAX_WORKERS, per_account=None,
+            processes=False, progress=None):
+    """Calls func on every resource concurrently.
+
+    Resources are read from the iterable as workers free up, so a paged
+    generator like V2_0.iter_accounts() is never held in memory at once.
+
+    Required Arguments:
+        func: callable - takes an Account (or User). With processes=True it
+            must be picklable, e.g. a module level function.
+        resources: iterable of Account or User objects. The same account may
+            appear more than once, e.g. to run several jobs on it.
+
+    Optional Arguments:
+        max_workers: integer - maximum number of jobs running at once
+        per_account: integer - maximum number of jobs running at once for the
+            same account, no limit by default
+        processes: bool - run jobs on a process pool instead of threads. Each
+            process builds its own client from the consumer key and secret;
+            other client options (cache, retry, transport...) aren't carried
+            over.
+        progress: callable - called with (jobs done, jobs total) after each
+            job. The total is None while resources are still being read
+            from an iterator.
+
+    Returns:
+        A FanOutReport.
+    """
+    report = FanOutReport()
+    start = time.time()
+
+    total = len(resources) if hasattr(resources, "__len__") else None
+    items = enumerate(resources)
+    held = deque()
+    running = {}
+    in_flight = {}
+    outcomes = []
+
+    def pull():
+        return next(items, None)
+
+    # one item is read ahead to know when the iterable is exhausted
+    upcoming = [pull()]
+
+    def next_item():
+        # items held back by per_account go first, in order
+        for _ in range(len(held)):
+            index, resource, key = held.popleft()
+            if per_account is None or in_flight.get(key, 0) < per_account:
+                return index, resource, key
+            held.append((index, resource, key))
+
+        while upcoming[0] is not None:
+            index, resource = upcoming[0]
+            upcoming[0] = pull()
+            key = resource_key(resource)
+            if per_account is None or in_flight.get(key, 0) < per_account:
+                return index, resource, key
+            held.append((index, resource, key))
+
+        return None
+
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    executor = pool(max_workers=max_workers)
+    try:
+        while True:
+            while len(running) < max_workers:
+                item = next_item()
+                if item is None:
+                    break
+
+                index, resource, key = item
+                if processes:
+                    future = executor.submit(_call_in_process, func, *_process_args(resource))
+                else:
+                    future = executor.submit(func, resource)
+                running[future] = (index, key)
+                in_flight[key] = in_flight.get(key, 0) + 1
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                index, key = running.pop(future)
+                in_flight[key] -= 1
+                if not in_flight[key]:
+                    del in_flight[key]
+
+                error = future.exception()
+                if error is None:
+                    outcomes.append((index, key, True, future.result()))
+                else:
+                    outcomes.append((index, key, False, error))
+
+                if progress is not None:
+                    if upcoming[0] is None:
+                        total = len(outcomes) + len(running) + len(held)
+                    progress(len(outcomes), total)
+    finally:
+        executor.shutdown(wait=True)
+
+    for index, key, succeeded, value in sorted(outcomes, key=lambda outcome: outcome[0]):
+        if succeeded:
+            report.results.append((key, value))
+        else:
+            report.failed.append((key, value))
+
+    report.elapsed = time.time() - start
+    return report
+
+
+def resource_key(resource):
+    """The id of an Account or User, used to group its jobs."""
+    return getattr(resource, getattr(resource, "resource_id", "id"), None)
+
+
+def _process_args(resource):
+    """What a worker process needs to rebuild resource, all picklable."""
+    api = resource.parent
+    client = (
+        type(api), api.consumer_key, api.consumer_secret, api.api_version, api.url_base)
+    definition = dict(
+        (key, getattr(resource, key)) for key in resource._resource_keys()
+        if getattr(resource, key, None) is not None)
+
+    # the type of a compact resource is built at runtime, its __class__ is
+    # the regular class the worker builds it from
+    resource_class = resource.__class__
+
+    return client, resource_class, definition
+
+
+def _call_in_process(func, client, resource_class, definition):
+    with _process_clients_lock:
+        api = _process_clients.get(client)
+        if api is None:
+            api_class, consumer_key, consumer_secret, api_version, url_base = client
+            api = _process_clients[client] = api_class(
+                consumer_key, consumer_secret, api_version=api_version, url_base=url_base)
+
+    return func(resource_class(api, definition))
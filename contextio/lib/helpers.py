@@ -1,25 +1,41 @@
 from datetime import datetime
 import logging
+import os
 import re
 
 from contextio.lib.errors import ArgumentError
 
+_first_cap_re = re.compile('(.)([A-Z][a-z]+)')
+_all_cap_re = re.compile('([a-z0-9])([A-Z])')
+
+# API responses use a small, fixed set of keys, so conversions are memoized.
+# Once the memo is full, new names are converted without being stored.
+UNDERSCORE_MEMO_SIZE = 4096
+_underscore_memo = {}
+
+
 def to_underscore(name):
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    try:
+        return _underscore_memo[name]
+    except KeyError:
+        pass
 
+    s1 = _first_cap_re.sub(r'\1_\2', name)
+    u = _all_cap_re.sub(r'\1_\2', s1).lower()
 
-def uncamelize(d):
-    drop = []
+    if len(_underscore_memo) < UNDERSCORE_MEMO_SIZE:
+        _underscore_memo[name] = u
+
+    return u
 
-    for k, v in list(d.items()):
+
+def uncamelize(d):
+    # keys without upper case letters are already in underscore format, most
+    # responses only have those and are returned as is
+    for k in [k for k in d.keys() if not k.islower()]:
         u = to_underscore(k)
         if u != k and u not in d:
-            d[u] = v
-            drop.append(k)
-
-    for k in drop:
-        del d[k]
+            d[u] = d.pop(k)
 
     return d
 
@@ -35,6 +51,11 @@ def as_datetime(v):
         return datetime.fromtimestamp(v)
 
 
+# moves a file over another one atomically; os.replace overwrites the
+# destination on Windows too, python 2 only has rename
+replace_file = getattr(os, "replace", os.rename)
+
+
 def process_person_info(parent, person_info, addresses):
     try:
         from contextIO2 import Contact
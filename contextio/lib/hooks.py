@@ -0,0 +1,119 @@
+"""Hooks called around every HTTP request sent by Api.
+
+    def log_slow(request, response):
+        if request.elapsed > 1:
+            print(request.method, request.endpoint, request.elapsed)
+
+    context_io = ContextIO(key, secret, hooks={"after_response": log_slow})
+    context_io.add_hook("on_error", lambda request, error: print(error))
+
+Events:
+    before_request(request) - before each attempt. Hooks may replace
+        request.kwargs["headers"] with a new dict to add headers.
+    after_response(request, response) - after each attempt that got an
+        answer, whatever its status.
+    on_error(request, exception) - after each attempt that raised, e.g. a
+        connection error. The exception is raised again afterwards.
+
+request is a RequestInfo. With a RetryEngine, hooks run for every attempt
+and request.attempt tells retries apart. When no hook is registered
+requests are sent without any extra work.
+"""
+import logging
+import time
+
+from six.moves.urllib.parse import urlsplit
+
+EVENTS = ("before_request", "after_response", "on_error")
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint(url):
+    """Returns the path of url without the version and with ids replaced.
+
+    e.g. https://api.context.io/2.0/accounts/abc/messages/def/flags gives
+    accounts/{id}/messages/{id}/flags, which keeps the number of distinct
+    endpoints (and metric labels) small.
+    """
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment][1:]
+    return "/".join(
+        "{id}" if i % 2 else segment for i, segment in enumerate(segments))
+
+
+class RequestInfo(object):
+    """What hooks know about a request attempt.
+
+    Properties:
+        method: string - the HTTP method
+        url: string - the full request url
+        endpoint: string - the url path with ids replaced, see endpoint()
+        kwargs: dict - the params/data/headers passed to the transport
+        attempt: integer - 0 for the first attempt, 1 for the first retry...
+        started: float - time.time() when the attempt was sent
+        elapsed: float - seconds the attempt took, set before
+            after_response and on_error hooks are called
+    """
+
+    __slots__ = ("method", "url", "endpoint", "kwargs", "attempt", "started", "elapsed")
+
+    def __init__(self, method, url, kwargs, attempt):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint(url)
+        self.kwargs = kwargs
+        self.attempt = attempt
+        self.started = None
+        self.elapsed = None
+
+    def __repr__(self):
+        return "<RequestInfo {0} {1} attempt={2}>".format(self.method, self.endpoint, self.attempt)
+
+
+class Hooks(object):
+    """The hooks registered on an Api object, by event."""
+
+    def __init__(self):
+        self.hooks = dict((event, []) for event in EVENTS)
+
+    def add(self, event, func):
+        if event not in self.hooks:
+            raise ValueError("Unknown hook event {0!r}, expected one of {1}".format(
+                event, ", ".join(EVENTS)))
+
+        self.hooks[event].append(func)
+
+    def remove(self, event, func):
+        self.hooks[event].remove(func)
+
+    def wrap(self, method, url, request_kwargs, send):
+        """Returns send() wrapped so that every call runs the hooks."""
+        attempts = [0]
+
+        def hooked_send():
+            request = RequestInfo(method, url, request_kwargs, attempts[0])
+            attempts[0] += 1
+
+            self._run("before_request", request)
+
+            request.started = time.time()
+            try:
+                response = send()
+            except Exception as e:
+                request.elapsed = time.time() - request.started
+                self._run("on_error", request, e)
+                raise
+
+            request.elapsed = time.time() - request.started
+            self._run("after_response", request, response)
+            return response
+
+        return hooked_send
+
+    def _run(self, event, *args):
+        for func in self.hooks[event]:
+            try:
+                func(*args)
+            except Exception:
+                # a broken hook shouldn't break the request
+                logger.exception("{0} hook {1!r} failed".format(event, func))
@@ -1,4 +1,7 @@
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS
+from contextio.lib.fanout import fan_out
 from contextio.lib.helpers import sanitize_params, check_for_account_credentials
+from contextio.lib.pagination import DEFAULT_PAGE_SIZE, iter_pages
 from contextio.lib.resources.user import User
 
 from contextio.lib.api import Api
@@ -10,6 +13,33 @@ class Lite(Api):
         params = sanitize_params(kwargs, all_args)
         return [User(self, obj) for obj in self._request_uri("users", params=params)]
 
+    def fan_out(self, func, users=None, max_workers=DEFAULT_MAX_WORKERS, per_account=None,
+                processes=False, progress=None, page_size=DEFAULT_PAGE_SIZE, **kwargs):
+        """Run a job over many users concurrently.
+
+        See contextio.lib.fanout.fan_out().
+
+        Required Arguments:
+            func: callable - called with each User
+
+        Optional Arguments:
+            users: iterable of User objects. By default every user matching
+                kwargs is used, fetched page_size at a time.
+            max_workers: int - maximum number of jobs running at once
+            per_account: int - maximum number of jobs running at once for
+                the same user
+            processes: bool - use a process pool instead of threads
+            progress: callable - called with (jobs done, jobs total)
+            any argument accepted by get_users(), e.g. status_ok
+
+        Returns:
+            A FanOutReport
+        """
+        if users is None:
+            users = iter_pages(self.get_users, kwargs, page_size)
+
+        return fan_out(func, users, max_workers, per_account, processes, progress)
+
     def post_user(self, **kwargs):
         req_args = ["email", "server", "username", "use_ssl", "port", "type"]
 
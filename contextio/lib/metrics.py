@@ -0,0 +1,244 @@
+"""Request metrics, collected through hooks.
+
+    from contextio.lib.metrics import MetricsCollector
+
+    metrics = MetricsCollector()
+    context_io = ContextIO(key, secret, metrics=metrics)
+    ...
+    metrics.snapshot()        # dict
+    metrics.prometheus()      # Prometheus text exposition format
+    metrics.serve(9100)       # or serve it on http://host:9100/metrics
+
+Per method and endpoint (see contextio.lib.hooks.endpoint), the collector
+records a latency histogram, bytes sent and received, answers by status,
+errors by exception type and retries.
+"""
+import threading
+
+from six.moves.urllib.parse import urlencode
+
+from contextio.lib.http_server import RequestHandler, ThreadingServer
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Endpoint(object):
+    def __init__(self, buckets):
+        self.buckets = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses = {}
+        self.errors = {}
+        self.retries = 0
+
+
+class MetricsCollector(object):
+    """Records metrics about the requests of one or more Api objects.
+
+    Optional Arguments:
+        buckets: tuple of floats - upper bounds, in seconds, of the latency
+            histogram buckets
+        prefix: string - prefix of the Prometheus metric names
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="contextio"):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def install(self, api):
+        """Registers the collector's hooks on api."""
+        api.add_hook("before_request", self.before_request)
+        api.add_hook("after_response", self.after_response)
+        api.add_hook("on_error", self.on_error)
+
+    def before_request(self, request):
+        sent = _body_size(request.kwargs.get("data"))
+        with self._lock:
+            stats = self._stats(request)
+            stats.bytes_sent += sent
+            if request.attempt:
+                stats.retries += 1
+
+    def after_response(self, request, response):
+        received = _response_size(response, request.kwargs.get("stream"))
+        with self._lock:
+            stats = self._observe(request)
+            stats.bytes_received += received
+            stats.statuses[response.status_code] = stats.statuses.get(response.status_code, 0) + 1
+
+    def on_error(self, request, error):
+        name = type(error).__name__
+        with self._lock:
+            stats = self._observe(request)
+            stats.errors[name] = stats.errors.get(name, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def snapshot(self):
+        """Returns the metrics as a dict.
+
+        Returns:
+            A dict keyed by (method, endpoint), data format below.
+
+            {
+              ("GET", "accounts/{id}/messages"): {
+                "count": integer - attempts that got an answer or an error,
+                "sum": float - total seconds they took,
+                "buckets": dict - upper bound => cumulative count, the last
+                    bound is float("inf"),
+                "bytes_sent": integer,
+                "bytes_received": integer,
+                "statuses": dict - HTTP status => count,
+                "errors": dict - exception class name => count,
+                "retries": integer
+              },
+              ...
+            }
+        """
+        with self._lock:
+            snapshot = {}
+            for key, stats in self._endpoints.items():
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.bucket_bounds + (float("inf"),), stats.buckets):
+                    cumulative += count
+                    buckets[bound] = cumulative
+
+                snapshot[key] = {
+                    "count": stats.count,
+                    "sum": stats.sum,
+                    "buckets": buckets,
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "statuses": dict(stats.statuses),
+                    "errors": dict(stats.errors),
+                    "retries": stats.retries,
+                }
+
+        return snapshot
+
+    def prometheus(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        name = self.prefix + "_request"
+        lines = []
+        families = [
+            ("duration_seconds", "histogram", "Request latency"),
+            ("bytes_sent_total", "counter", "Request body bytes sent"),
+            ("bytes_received_total", "counter", "Response body bytes received"),
+            ("responses_total", "counter", "Answers received, by HTTP status"),
+            ("errors_total", "counter", "Requests that raised, by exception"),
+            ("retries_total", "counter", "Retried attempts"),
+        ]
+        snapshot = sorted(self.snapshot().items())
+
+        for family, kind, help_text in families:
+            metric = "{0}_{1}".format(name, family)
+            lines.append("# HELP {0} {1}".format(metric, help_text))
+            lines.append("# TYPE {0} {1}".format(metric, kind))
+
+            for (method, endpoint), stats in snapshot:
+                labels = 'method="{0}",endpoint="{1}"'.format(method, _escape(endpoint))
+
+                if family == "duration_seconds":
+                    for bound, count in sorted(stats["buckets"].items()):
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                            metric, labels, le, count))
+                    lines.append("{0}_sum{{{1}}} {2!r}".format(metric, labels, stats["sum"]))
+                    lines.append("{0}_count{{{1}}} {2}".format(metric, labels, stats["count"]))
+                elif family == "responses_total":
+                    for status, count in sorted(stats["statuses"].items()):
+                        lines.append('{0}{{{1},status="{2}"}} {3}'.format(
+                            metric, labels, status, count))
+                elif family == "errors_total":
+                    for error, count in sorted(stats["errors"].items()):
+                        lines.append('{0}{{{1},error="{2}"}} {3}'.format(
+                            metric, labels, error, count))
+                else:
+                    value = stats[family[:-len("_total")]]
+                    lines.append("{0}{{{1}}} {2}".format(metric, labels, value))
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host=""):
+        """Serves prometheus() on http://host:port/metrics from a background thread.
+
+        Returns:
+            The HTTP server, call its shutdown() method to stop it.
+        """
+        collector = self
+
+        class Handler(RequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                content = collector.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        server = ThreadingServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name="contextio-metrics")
+        thread.daemon = True
+        thread.start()
+        return server
+
+    def _stats(self, request):
+        key = (request.method, request.endpoint)
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _Endpoint(self.bucket_bounds)
+        return stats
+
+    def _observe(self, request):
+        stats = self._stats(request)
+        stats.count += 1
+        stats.sum += request.elapsed
+
+        for i, bound in enumerate(self.bucket_bounds):
+            if request.elapsed <= bound:
+                break
+        else:
+            i = len(self.bucket_bounds)
+        stats.buckets[i] += 1
+
+        return stats
+
+
+def _body_size(data):
+    if not data:
+        return 0
+
+    if isinstance(data, dict):
+        return len(urlencode(data))
+
+    return len(data)
+
+
+def _response_size(response, stream):
+    length = getattr(response, "headers", {}).get("Content-Length")
+    if length is not None:
+        try:
+            return int(length)
+        except (TypeError, ValueError):
+            pass
+
+    # reading a streamed body here would consume it
+    if stream:
+        return 0
+
+    return len(getattr(response, "content", b"") or b"")
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
@@ -0,0 +1,296 @@
+import json
+import sqlite3
+import threading
+
+from contextio.lib import helpers
+from contextio.lib.pagination import DEFAULT_PAGE_SIZE, iter_pages
+from contextio.lib.resources.contact import Contact
+from contextio.lib.resources.file import File
+from contextio.lib.resources.message import Message
+from contextio.lib.resources.thread import Thread
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    message_id TEXT PRIMARY KEY,
+    gmail_thread_id TEXT,
+    date INTEGER,
+    date_indexed INTEGER,
+    subject TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_date ON messages (date);
+CREATE INDEX IF NOT EXISTS messages_date_indexed ON messages (date_indexed);
+CREATE INDEX IF NOT EXISTS messages_thread ON messages (gmail_thread_id);
+
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY,
+    message_id TEXT,
+    file_name TEXT,
+    size INTEGER,
+    date INTEGER,
+    date_indexed INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_message ON files (message_id);
+CREATE INDEX IF NOT EXISTS files_date_indexed ON files (date_indexed);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    email TEXT PRIMARY KEY,
+    name TEXT,
+    count INTEGER,
+    last_activity INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_name ON contacts (name);
+CREATE INDEX IF NOT EXISTS contacts_last_activity ON contacts (last_activity);
+
+CREATE TABLE IF NOT EXISTS threads (
+    gmail_thread_id TEXT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+
+class AccountMirror(object):
+    """Local SQLite copy of an account's messages, files, contacts and threads.
+
+    sync() pulls what changed since the previous sync: messages and files
+    indexed after the newest date_indexed already stored, contacts active
+    after the latest activity already stored, and threads of new messages.
+    The get_* methods then answer from the local database.
+
+    Required Arguments:
+        account: Account object - the account to mirror
+
+    Optional Arguments:
+        path: string - SQLite database file, in memory by default
+        page_size: integer - items requested per API call while syncing
+    """
+
+    def __init__(self, account, path=":memory:", page_size=DEFAULT_PAGE_SIZE):
+        self.account = account
+        self.page_size = page_size
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+    def close(self):
+        self.db.close()
+
+    # SYNC
+
+    def sync(self):
+        """Pulls new and updated items from the API.
+
+        Returns:
+            A dict with the number of items stored per kind, e.g.
+                {"messages": 10, "files": 2, "contacts": 3, "threads": 4}
+        """
+        with self._lock:
+            messages_mark = self._get_state("messages")
+
+            counts = {
+                "messages": self._sync_messages(messages_mark),
+                "files": self._sync_files(),
+                "contacts": self._sync_contacts(),
+                "threads": self._sync_threads(messages_mark),
+            }
+            self.db.commit()
+
+        return counts
+
+    def _fetch(self, endpoint, params, key=None):
+        def fetch(**page_params):
+            response = self.account._request_uri(endpoint, params=page_params)
+            return response.get(key) if key else response
+
+        return iter_pages(fetch, params, self.page_size)
+
+    def _since(self, mark):
+        # the API filters are strict, step back one second and rely on the
+        # primary keys to drop what we already have
+        return {} if mark is None else {"indexed_after": mark - 1}
+
+    def _sync_messages(self, mark):
+        count = 0
+        newest = mark
+        for obj in self._fetch("messages", self._since(mark)):
+            obj = helpers.uncamelize(obj)
+            self.db.execute(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?)", (
+                    obj["message_id"], obj.get("gmail_thread_id"), obj.get("date"),
+                    obj.get("date_indexed"), obj.get("subject"), json.dumps(obj)))
+            newest = _max(newest, obj.get("date_indexed"))
+            count += 1
+
+        self._set_state("messages", newest)
+        return count
+
+    def _sync_files(self):
+        mark = self._get_state("files")
+        count = 0
+        newest = mark
+        for obj in self._fetch("files", self._since(mark)):
+            obj = helpers.uncamelize(obj)
+            self.db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", (
+                    obj["file_id"], obj.get("message_id"), obj.get("file_name"),
+                    obj.get("size"), obj.get("date"), obj.get("date_indexed"), json.dumps(obj)))
+            newest = _max(newest, obj.get("date_indexed"))
+            count += 1
+
+        self._set_state("files", newest)
+        return count
+
+    def _sync_contacts(self):
+        mark = self._get_state("contacts")
+        params = {} if mark is None else {"active_after": mark - 1}
+        count = 0
+        newest = mark
+        for obj in self._fetch("contacts", params, key="matches"):
+            obj = helpers.uncamelize(obj)
+            if obj.get("email") is None and obj.get("emails"):
+                obj["email"] = obj["emails"][0]
+
+            activity = _max(obj.get("last_received"), obj.get("last_sent"))
+            self.db.execute(
+                "INSERT OR REPLACE INTO contacts VALUES (?, ?, ?, ?, ?)", (
+                    obj["email"], obj.get("name"), obj.get("count"), activity, json.dumps(obj)))
+            newest = _max(newest, activity)
+            count += 1
+
+        self._set_state("contacts", newest)
+        return count
+
+    def _sync_threads(self, mark):
+        count = 0
+        for thread_url in self._fetch("threads", self._since(mark)):
+            self.db.execute(
+                "INSERT OR IGNORE INTO threads VALUES (?)", (thread_url.split("/")[-1],))
+            count += 1
+
+        return count
+
+    def _get_state(self, name):
+        row = self.db.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name, value):
+        if value is not None:
+            self.db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (name, value))
+
+    # READS
+
+    def _query(self, sql, args):
+        with self._lock:
+            return self.db.execute(sql, args).fetchall()
+
+    def get_message(self, message_id):
+        """Returns the stored Message with this id, or None."""
+        rows = self._query("SELECT data FROM messages WHERE message_id = ?", (message_id,))
+        return Message(self.account, json.loads(rows[0][0])) if rows else None
+
+    def get_messages(self, gmail_thread_id=None, date_before=None, date_after=None,
+                     indexed_after=None, limit=None, offset=0):
+        """Stored messages, newest first.
+
+        Optional Arguments:
+            gmail_thread_id: string - only messages of this thread
+            date_before: integer (unix time) - only messages dated before
+            date_after: integer (unix time) - only messages dated after
+            indexed_after: integer (unix time) - only messages indexed after
+            limit: integer - maximum number of messages to return
+            offset: integer - start the list at this offset (zero-based)
+
+        Returns:
+            A list of Message objects
+        """
+        clauses = []
+        args = []
+        for column, op, value in [
+                ("gmail_thread_id", "=", gmail_thread_id), ("date", "<", date_before),
+                ("date", ">", date_after), ("date_indexed", ">", indexed_after)]:
+            if value is not None:
+                clauses.append("{0} {1} ?".format(column, op))
+                args.append(value)
+
+        sql = "SELECT data FROM messages"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date DESC LIMIT ? OFFSET ?"
+        args += [-1 if limit is None else limit, offset]
+
+        return [Message(self.account, json.loads(row[0])) for row in self._query(sql, args)]
+
+    def get_files(self, message_id=None, file_name=None, limit=None, offset=0):
+        """Stored files, newest first.
+
+        Optional Arguments:
+            message_id: string - only files attached to this message
+            file_name: string - SQL LIKE pattern the file name must match,
+                e.g. '%.pdf'
+            limit: integer - maximum number of files to return
+            offset: integer - start the list at this offset (zero-based)
+
+        Returns:
+            A list of File objects
+        """
+        clauses = []
+        args = []
+        if message_id is not None:
+            clauses.append("message_id = ?")
+            args.append(message_id)
+        if file_name is not None:
+            clauses.append("file_name LIKE ?")
+            args.append(file_name)
+
+        sql = "SELECT data FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date DESC LIMIT ? OFFSET ?"
+        args += [-1 if limit is None else limit, offset]
+
+        return [File(self.account, json.loads(row[0])) for row in self._query(sql, args)]
+
+    def get_contacts(self, search=None, limit=None, offset=0):
+        """Stored contacts, most active first.
+
+        Optional Arguments:
+            search: string - substring of the contact's name or email address
+            limit: integer - maximum number of contacts to return
+            offset: integer - start the list at this offset (zero-based)
+
+        Returns:
+            A list of Contact objects
+        """
+        sql = "SELECT data FROM contacts"
+        args = []
+        if search is not None:
+            sql += " WHERE email LIKE ? OR name LIKE ?"
+            args += ["%" + search + "%"] * 2
+        sql += " ORDER BY count DESC LIMIT ? OFFSET ?"
+        args += [-1 if limit is None else limit, offset]
+
+        return [Contact(self.account, json.loads(row[0])) for row in self._query(sql, args)]
+
+    def get_threads(self):
+        """Stored threads.
+
+        Returns:
+            A list of Thread objects (nearly empty, use get_messages() with
+                gmail_thread_id or Thread.get() for their content)
+        """
+        rows = self._query("SELECT gmail_thread_id FROM threads", ())
+        return [Thread(self.account, {"gmail_thread_id": row[0]}) for row in rows]
+
+
+def _max(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
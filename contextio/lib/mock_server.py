@@ -0,0 +1,332 @@
+"""A local stand-in for the Context.IO API, for load tests and benchmarks.
+
+    from contextio.lib.mock_server import MockServer
+
+    server = MockServer(accounts=10, messages=1000, latency=0.02)
+    server.start()
+    context_io = ContextIO("key", "secret", url_base=server.url_base)
+    ...
+    server.stop()
+
+Serves generated, deterministic data for the 2.0 endpoints used by
+Account, Message, File, Source and Folder and the Lite endpoints used by
+User, EmailAccount, Folder and Message. Signatures aren't checked. Every
+request waits latency seconds before being answered; message bodies and
+file contents are body_size and file_size bytes long.
+"""
+import json
+import re
+import threading
+import time
+from collections import deque
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from contextio.lib.http_server import RequestHandler, ThreadingServer
+
+EPOCH = 1420070400
+LABEL = "mock::imap.example.com"
+FOLDERS = ["INBOX", "Archive", "Sent"]
+
+
+class _Handler(RequestHandler):
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        url = urlparse(self.path)
+        params = dict((k, v[-1]) for k, v in parse_qs(url.query).items())
+        if method == "POST" and body:
+            params.update((k, v[-1]) for k, v in parse_qs(body.decode("utf-8")).items())
+
+        server = self.server.mock
+        if server.latency:
+            time.sleep(server.latency)
+
+        status, content, headers = server.respond(
+            method, url.path, params, self.headers.get("Range"),
+            dict((name.lower(), value) for name, value in self.headers.items()))
+
+        if not isinstance(content, bytes):
+            content = json.dumps(content).encode("utf-8")
+            headers = dict(headers, **{"Content-Type": "application/json"})
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class MockServer(object):
+    """HTTP server answering like the Context.IO API.
+
+    Optional Arguments:
+        host: string - interface to listen on
+        port: integer - port to listen on, 0 for any free port
+        accounts: integer - number of accounts (and Lite users)
+        messages: integer - number of messages per account, every other one
+            has a file attached
+        body_size: integer - bytes of each message body
+        file_size: integer - bytes of each file
+        latency: float - seconds every request waits before being answered
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, accounts=10, messages=100, body_size=2048,
+                 file_size=64 * 1024, latency=0.0):
+        self.accounts = accounts
+        self.messages = messages
+        self.body_size = body_size
+        self.file_size = file_size
+        self.latency = latency
+        self.requests = 0
+        # (method, path, params, headers) of the most recent requests
+        self.log = deque(maxlen=1000)
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._server = ThreadingServer((host, port), _Handler)
+        self._server.mock = self
+
+        routes = [
+            ("GET", r"2\.0/accounts", self._list_accounts),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)", self._get_account),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/messages", self._list_messages),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/messages/(?P<message>[^/]+)",
+                self._get_message),
+            ("POST", r"2\.0/accounts/(?P<account>[^/]+)/messages/(?P<message>[^/]+)/flags",
+                self._post_flags),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/messages/(?P<message>[^/]+)/folders",
+                self._get_message_folders),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/files", self._list_files),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/files/(?P<file>[^/]+)", self._get_file),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/files/(?P<file>[^/]+)/content",
+                self._file_content),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/sources", self._list_sources),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/sources/(?P<label>[^/]+)",
+                self._get_source),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/sources/(?P<label>[^/]+)/folders",
+                self._list_folders),
+            ("GET", r"2\.0/accounts/(?P<account>[^/]+)/sources/(?P<label>[^/]+)/folders/"
+                r"(?P<folder>[^/]+)/messages", self._list_messages),
+            ("GET", r"lite/users", self._list_users),
+            ("GET", r"lite/users/(?P<account>[^/]+)", self._get_user),
+            ("GET", r"lite/users/(?P<account>[^/]+)/email_accounts", self._list_sources),
+            ("GET", r"lite/users/(?P<account>[^/]+)/email_accounts/(?P<label>[^/]+)",
+                self._get_source),
+            ("GET", r"lite/users/(?P<account>[^/]+)/email_accounts/(?P<label>[^/]+)/folders",
+                self._list_folders),
+            ("GET", r"lite/users/(?P<account>[^/]+)/email_accounts/(?P<label>[^/]+)/folders/"
+                r"(?P<folder>[^/]+)/messages", self._list_messages),
+            ("GET", r"lite/users/(?P<account>[^/]+)/email_accounts/(?P<label>[^/]+)/folders/"
+                r"(?P<folder>[^/]+)/messages/(?P<message>[^/]+)", self._get_message),
+        ]
+        self._routes = [
+            (method, re.compile("^/" + pattern + "$"), func) for method, pattern, func in routes]
+
+    @property
+    def url_base(self):
+        """The url_base to give the client."""
+        return "http://{0}:{1}".format(*self._server.server_address)
+
+    def start(self):
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-server")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def respond(self, method, path, params, range_header=None, request_headers=None):
+        """Returns (status, content, headers) for a request.
+
+        content is bytes for file contents, else a JSON serializable object.
+        request_headers, with lowercase names, are only logged.
+        """
+        with self._lock:
+            self.requests += 1
+            self.log.append((method, path, params, request_headers or {}))
+
+        path = path.rstrip("/")
+        for route_method, pattern, func in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+
+            if route_method != method:
+                # writes the library sends but that need no special answer
+                if method in ("POST", "PUT", "DELETE"):
+                    return 200, {"success": True}, {}
+                continue
+
+            args = match.groupdict()
+            if "account" in args and not self._valid_account(args["account"]):
+                break
+
+            if func == self._file_content:
+                return func(range_header, **args)
+
+            return 200, func(params, **args), {}
+
+        if method in ("POST", "PUT", "DELETE") and self._known_prefix(path):
+            return 200, {"success": True}, {}
+
+        return 404, {"type": "error", "value": "Not found: {0}".format(path)}, {}
+
+    # data
+
+    def _valid_account(self, account_id):
+        prefix, _, number = account_id.rpartition("-")
+        return prefix in ("account", "user") and number.isdigit() and int(number) < self.accounts
+
+    def _known_prefix(self, path):
+        return re.match(r"^/(2\.0/accounts|lite/users)/[^/]+/", path) is not None
+
+    @staticmethod
+    def _page(params, count):
+        offset = int(params.get("offset") or 0)
+        limit = params.get("limit")
+        end = count if limit is None else min(count, offset + int(limit))
+        return range(offset, max(offset, end))
+
+    def _account(self, i, prefix="account"):
+        return {
+            "id": "{0}-{1}".format(prefix, i),
+            "username": "user{0}".format(i),
+            "created": EPOCH,
+            "suspended": 0,
+            "email_addresses": ["user{0}@example.com".format(i)],
+            "first_name": "User",
+            "last_name": str(i),
+            "password_expired": 0,
+            "sources": [self._source()],
+            "resource_url": "https://api.context.io/2.0/accounts/{0}-{1}".format(prefix, i),
+        }
+
+    def _source(self):
+        return {
+            "label": LABEL, "username": "user@example.com", "server": "imap.example.com",
+            "port": 993, "use_ssl": True, "type": "imap", "status": "OK",
+        }
+
+    def _message(self, j, params):
+        message = {
+            "message_id": "message-{0}".format(j),
+            "email_message_id": "<message-{0}@example.com>".format(j),
+            "gmail_message_id": format(j, "x"),
+            "gmail_thread_id": format(j // 3, "x"),
+            "subject": "Message {0}".format(j),
+            "date": EPOCH + j,
+            "date_indexed": EPOCH + j + 1,
+            "addresses": {
+                "from": {"email": "sender{0}@example.com".format(j % 7), "name": "Sender"},
+                "to": [{"email": "user@example.com", "name": "User"}],
+            },
+            "person_info": {},
+            "folders": ["INBOX"],
+            "sources": [{"label": LABEL}],
+            "files": [self._file(j)] if j % 2 == 0 else [],
+        }
+
+        if params.get("include_body"):
+            message["body"] = [{
+                "type": "text/plain", "charset": "UTF-8",
+                "content": "x" * self.body_size}]
+        if params.get("include_headers"):
+            message["headers"] = {"Subject": [message["subject"]]}
+        if params.get("include_flags"):
+            message["flags"] = {"seen": False, "flagged": False}
+
+        return message
+
+    def _file(self, j):
+        return {
+            "file_id": "file-{0}".format(j),
+            "file_name": "file-{0}.bin".format(j),
+            "size": self.file_size,
+            "type": "application/octet-stream",
+            "message_id": "message-{0}".format(j),
+            "date": EPOCH + j,
+        }
+
+    @staticmethod
+    def _number(resource_id):
+        return int(resource_id.rpartition("-")[2])
+
+    # routes
+
+    def _list_accounts(self, params):
+        return [self._account(i) for i in self._page(params, self.accounts)]
+
+    def _get_account(self, params, account):
+        return self._account(self._number(account))
+
+    def _list_users(self, params):
+        return [self._account(i, "user") for i in self._page(params, self.accounts)]
+
+    def _get_user(self, params, account):
+        return self._account(self._number(account), "user")
+
+    def _list_messages(self, params, account, label=None, folder=None):
+        return [self._message(j, params) for j in self._page(params, self.messages)]
+
+    def _get_message(self, params, account, message, label=None, folder=None):
+        return self._message(self._number(message), params)
+
+    def _post_flags(self, params, account, message):
+        flags = dict((k, v == "1") for k, v in params.items() if k != "body")
+        return {"success": True, "flags": flags}
+
+    def _get_message_folders(self, params, account, message):
+        return [{"name": "INBOX"}]
+
+    def _list_files(self, params, account):
+        return [self._file(j) for j in self._page(params, self.messages) if j % 2 == 0]
+
+    def _get_file(self, params, account, file):
+        return self._file(self._number(file))
+
+    def _file_content(self, range_header, account, file):
+        content = b"\0" * self.file_size
+        match = re.match(r"bytes=(\d+)-$", range_header or "")
+        if match is None:
+            return 200, content, {}
+
+        start = int(match.group(1))
+        headers = {"Content-Range": "bytes {0}-{1}/{2}".format(
+            start, self.file_size - 1, self.file_size)}
+        return 206, content[start:], headers
+
+    def _list_sources(self, params, account):
+        return [self._source()]
+
+    def _get_source(self, params, account, label):
+        return self._source()
+
+    def _list_folders(self, params, account, label):
+        return [{"name": name, "nb_messages": self.messages} for name in FOLDERS]
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def iter_pages(fetch, params, page_size=DEFAULT_PAGE_SIZE, read_ahead=False):
+    """Yields the items of a list endpoint, requesting one page at a time.
+
+    Required Arguments:
+        fetch: callable - called with the endpoint parameters plus limit and
+            offset, returns a list of items
+        params: dict - parameters for the endpoint. 'offset' is where the
+            iteration starts and 'limit' is the total number of items to
+            yield (all of them if omitted).
+
+    Optional Arguments:
+        page_size: int - the number of items requested per call
+        read_ahead: bool - if True, the next page is requested on a background
+            thread while the items of the current one are being consumed
+
+    Returns:
+        A generator of items.
+    """
+    params = dict(params)
+    offset = int(params.pop("offset", 0) or 0)
+    remaining = params.pop("limit", None)
+    if remaining is not None:
+        remaining = int(remaining)
+
+    def request(offset, remaining):
+        limit = page_size if remaining is None else min(page_size, remaining)
+        if limit <= 0:
+            return None, limit
+
+        page_params = dict(params, limit=limit, offset=offset)
+        return fetch(**page_params), limit
+
+    if not read_ahead:
+        while True:
+            page, limit = request(offset, remaining)
+            if not page:
+                return
+
+            for item in page:
+                yield item
+
+            offset, remaining = _advance(offset, remaining, len(page))
+            if len(page) < limit:
+                return
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = executor.submit(request, offset, remaining)
+        while True:
+            page, limit = pending.result()
+            if not page:
+                return
+
+            offset, remaining = _advance(offset, remaining, len(page))
+            if len(page) < limit:
+                pending = None
+            else:
+                pending = executor.submit(request, offset, remaining)
+
+            for item in page:
+                yield item
+
+            if pending is None:
+                return
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _advance(offset, remaining, count):
+    return offset + count, None if remaining is None else remaining - count
@@ -0,0 +1,314 @@
+"""Polls accounts for new messages.
+
+    from contextio.lib.poller import JSONFileStore, PollScheduler
+
+    store = JSONFileStore("/data/pollers.json")
+    pollers = [account.message_poller(store=store) for account in context_io.iter_accounts()]
+
+    def handle(account, messages):
+        for message in messages:
+            print(account.id, message.subject)
+
+    scheduler = PollScheduler(pollers, handle, min_interval=30, max_interval=900)
+    scheduler.run_forever()
+
+A MessagePoller remembers a high-water mark: the newest date_indexed seen
+and the ids of the messages indexed at that second. Each poll() asks for
+the messages indexed since the mark, one page at a time, and returns only
+the ones it hasn't returned before. The mark is saved to the store after
+every poll, so a restarted process carries on where it stopped.
+
+The scheduler polls an account again after min_interval when it had new
+messages and backs off towards max_interval while it stays quiet. Every
+interval is jittered so that accounts drift apart instead of being polled
+in bursts.
+"""
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS, map_bounded
+from contextio.lib.helpers import replace_file
+from contextio.lib.pagination import DEFAULT_PAGE_SIZE, iter_pages
+
+DEFAULT_MIN_INTERVAL = 30
+DEFAULT_MAX_INTERVAL = 900
+
+logger = logging.getLogger(__name__)
+
+
+class JSONFileStore(object):
+    """Keeps the state of pollers in a JSON file, keyed by account id.
+
+    Required Arguments:
+        path: string - the file, created on the first save
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._states = None
+
+    def load(self, key):
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key, state):
+        with self._lock:
+            states = self._read()
+            states[key] = state
+
+            # written to a temporary file first so that a crash can't leave
+            # half a file behind
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(states, f)
+            replace_file(tmp, self.path)
+
+    def _read(self):
+        if self._states is None:
+            try:
+                with open(self.path) as f:
+                    self._states = json.load(f)
+            except (IOError, OSError):
+                self._states = {}
+
+        return self._states
+
+
+class MessagePoller(object):
+    """Returns the messages of an account indexed since the previous poll.
+
+    Required Arguments:
+        account: Account object - the account to poll
+
+    Optional Arguments:
+        store: object with load(key) and save(key, state) methods, e.g. a
+            JSONFileStore - keeps the high-water mark between processes
+        since: integer (unix time) - on the very first poll, only messages
+            indexed at or after since are new. All of them by default.
+        page_size: integer - messages requested per call
+        **params: other arguments of Account.get_messages(), e.g. folder or
+            include_body
+    """
+
+    def __init__(self, account, store=None, since=None, page_size=DEFAULT_PAGE_SIZE, **params):
+        self.account = account
+        self.store = store
+        self.page_size = page_size
+        self.params = params
+        self._lock = threading.Lock()
+
+        state = store.load(self.key) if store is not None else None
+        if state is None:
+            state = {"date_indexed": since, "ids": []}
+
+        self.date_indexed = state.get("date_indexed")
+        self.ids = set(state.get("ids") or ())
+
+    @property
+    def key(self):
+        """The key the state is stored under."""
+        return self.account.id
+
+    @property
+    def state(self):
+        """The high-water mark as a JSON serializable dict."""
+        return {"date_indexed": self.date_indexed, "ids": sorted(self.ids)}
+
+    def poll(self):
+        """Fetches the messages indexed since the previous poll.
+
+        Returns:
+            A list of new Message objects, sorted by date
+        """
+        with self._lock:
+            params = dict(self.params, sort_order="asc")
+            if self.date_indexed is not None:
+                # the filter is strict, step back one second and drop the
+                # messages of that second already returned
+                params["indexed_after"] = self.date_indexed - 1
+
+            mark, boundary = self.date_indexed, set(self.ids)
+            new = []
+            fetched = set()
+
+            for message in iter_pages(self.account.get_messages, params, self.page_size):
+                message_id = message.message_id
+                indexed = getattr(message, "date_indexed", None)
+
+                # pages shift when messages arrive during the poll
+                if message_id in fetched:
+                    continue
+                fetched.add(message_id)
+
+                if indexed is not None and self.date_indexed is not None and (
+                        indexed < self.date_indexed or
+                        indexed == self.date_indexed and message_id in self.ids):
+                    continue
+
+                new.append(message)
+
+                if indexed is None:
+                    continue
+                if mark is None or indexed > mark:
+                    mark, boundary = indexed, set([message_id])
+                elif indexed == mark:
+                    boundary.add(message_id)
+
+            changed = (mark, boundary) != (self.date_indexed, self.ids)
+            self.date_indexed, self.ids = mark, boundary
+            if changed and self.store is not None:
+                self.store.save(self.key, self.state)
+
+        return new
+
+
+class _Entry(object):
+    __slots__ = ("poller", "interval", "due")
+
+    def __init__(self, poller, interval, due):
+        self.poller = poller
+        self.interval = interval
+        self.due = due
+
+
+class PollScheduler(object):
+    """Polls many MessagePollers, each at its own adaptive, jittered pace.
+
+    Required Arguments:
+        pollers: iterable of MessagePoller objects
+        handler: callable - called with (account, messages) when a poll
+            returned new messages. By then the poller's mark has moved past
+            them, so exceptions are logged and the messages aren't returned
+            again.
+
+    Optional Arguments:
+        min_interval: float - seconds between polls of an active account
+        max_interval: float - seconds between polls of a quiet account
+        backoff: float - factor the interval grows by after each poll that
+            found nothing (or failed)
+        jitter: float - every interval is multiplied by a random factor
+            between 1 - jitter and 1 + jitter
+        max_workers: integer - accounts polled at once
+    """
+
+    def __init__(self, pollers, handler, min_interval=DEFAULT_MIN_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, backoff=2.0, jitter=0.1,
+                 max_workers=DEFAULT_MAX_WORKERS):
+        self.handler = handler
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.counters = dict.fromkeys(["polls", "messages", "errors"], 0)
+
+        self._heap = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        for poller in pollers:
+            self.add(poller)
+
+    def add(self, poller, delay=None):
+        """Schedules poller, by default at a random time within min_interval."""
+        if delay is None:
+            delay = random.uniform(0, self.min_interval)
+
+        self._push(_Entry(poller, self.min_interval, time.time() + delay))
+
+    def next_due(self):
+        """Returns the time.time() of the next poll, or None without pollers."""
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now=None):
+        """Polls every poller that is due.
+
+        Returns:
+            The number of new messages handed to the handler
+        """
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+
+        counts = map_bounded(self._poll, due, self.max_workers)
+        for entry in due:
+            self._push(entry)
+
+        return sum(counts)
+
+    def run_forever(self):
+        """Polls the accounts as they become due until stop() is called."""
+        while not self._stop.is_set():
+            self.run_pending()
+
+            due = self.next_due()
+            wait = self.max_interval if due is None else due - time.time()
+            self._stop.wait(min(max(wait, 0), self.max_interval))
+
+    def start(self):
+        """Runs run_forever() on a background thread."""
+        self._thread = threading.Thread(target=self.run_forever, name="message-poller")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, wait=True):
+        """Stops polling, after the polls in progress are done if wait is True."""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+
+        stats["pollers"] = len(self._heap)
+        return stats
+
+    def _poll(self, entry):
+        try:
+            messages = entry.poller.poll()
+        except Exception:
+            logger.exception("Polling {0} failed".format(entry.poller.key))
+            messages = None
+
+        self._count("polls")
+        if messages is None:
+            self._count("errors")
+        elif messages:
+            self._count("messages", len(messages))
+            try:
+                self.handler(entry.poller.account, messages)
+            except Exception:
+                logger.exception("Poll handler failed for {0}".format(entry.poller.key))
+
+        if messages:
+            entry.interval = self.min_interval
+        else:
+            entry.interval = min(self.max_interval, entry.interval * self.backoff)
+
+        entry.due = time.time() + entry.interval * random.uniform(
+            1 - self.jitter, 1 + self.jitter)
+        return len(messages or ())
+
+    def _push(self, entry):
+        with self._lock:
+            heapq.heappush(self._heap, (entry.due, next(self._sequence), entry))
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
@@ -1,6 +1,12 @@
 import logging
 
 from contextio.lib import helpers
+from contextio.lib.batch import run_batch
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS, map_bounded
+from contextio.lib.decoding import map_list
+from contextio.lib.errors import ArgumentError
+from contextio.lib.pagination import DEFAULT_PAGE_SIZE, iter_pages
+from contextio.lib.poller import MessagePoller
 from contextio.lib.resources.base_resource import BaseResource
 from contextio.lib.resources.source import Source
 from contextio.lib.resources.connect_token import ConnectToken
@@ -151,6 +157,22 @@ class Account(BaseResource):
 
         return [Contact(self, obj) for obj in contacts.get('matches')]
 
+    def iter_contacts(self, page_size=DEFAULT_PAGE_SIZE, read_ahead=False, **params):
+        """Iterate over the contacts in an account, one page at a time.
+
+        Takes the same arguments as get_contacts(). limit is the total number
+        of contacts to yield, offset is where to start.
+
+        Optional Arguments:
+            page_size: integer - number of contacts requested per call.
+            read_ahead: bool - fetch the next page on a background thread
+                while the current one is being consumed.
+
+        Returns:
+            A generator of Contact objects
+        """
+        return iter_pages(self.get_contacts, params, page_size, read_ahead)
+
     def get_email_addresses(self):
         """List of email addresses used by an account.
 
@@ -229,7 +251,23 @@ class Account(BaseResource):
 
         params = helpers.sanitize_params(params, all_args)
 
-        return [File(self, obj) for obj in self._request_uri('files', params=params)]
+        return map_list(lambda obj: File(self, obj), self._request_uri('files', params=params))
+
+    def iter_files(self, page_size=DEFAULT_PAGE_SIZE, read_ahead=False, **params):
+        """Iterate over the files of an account, one page at a time.
+
+        Takes the same arguments as get_files(). limit is the total number of
+        files to yield, offset is where to start.
+
+        Optional Arguments:
+            page_size: integer - number of files requested per call.
+            read_ahead: bool - fetch the next page on a background thread
+                while the current one is being consumed.
+
+        Returns:
+            A generator of File objects
+        """
+        return iter_pages(self.get_files, params, page_size, read_ahead)
 
     def get_messages(self, **params):
         """List email messages for an account.
@@ -336,8 +374,155 @@ class Account(BaseResource):
             params['from'] = params['from_']
             del params['from_']
 
-        return [
-            Message(self, obj) for obj in self._request_uri('messages', params=params)]
+        return map_list(
+            lambda obj: Message(self, obj), self._request_uri('messages', params=params))
+
+    def iter_messages(self, page_size=DEFAULT_PAGE_SIZE, read_ahead=False, **params):
+        """Iterate over the messages of an account, one page at a time.
+
+        Takes the same arguments as get_messages(). limit is the total number
+        of messages to yield, offset is where to start.
+
+        Optional Arguments:
+            page_size: integer - number of messages requested per call.
+            read_ahead: bool - fetch the next page on a background thread
+                while the current one is being consumed.
+
+        Returns:
+            A generator of Message objects
+        """
+        return iter_pages(self.get_messages, params, page_size, read_ahead)
+
+    def message_poller(self, store=None, since=None, page_size=DEFAULT_PAGE_SIZE, **params):
+        """A poller returning the messages indexed since its previous poll.
+
+        Optional Arguments:
+            store: object - keeps the poller's high-water mark, e.g. a
+                contextio.lib.poller.JSONFileStore
+            since: integer (unix time) - on the first poll, only messages
+                indexed at or after since are new. All of them by default.
+            page_size: integer - number of messages requested per call.
+            **params: other arguments of get_messages()
+
+        Returns:
+            A MessagePoller object, see contextio.lib.poller
+        """
+        return MessagePoller(self, store=store, since=since, page_size=page_size, **params)
+
+    def get_messages_bulk(self, message_ids, include=("body", "headers", "flags"),
+                          max_workers=DEFAULT_MAX_WORKERS, **params):
+        """Fetch many messages concurrently.
+
+        Each message is fetched with a single GET that includes the requested
+        parts, rather than one call per part, and the calls are spread over a
+        bounded pool of threads.
+
+        Required Arguments:
+            message_ids: list of strings - Context.IO ids of the messages.
+                Duplicates are only fetched once.
+
+        Optional Arguments:
+            include: tuple of strings - Parts to include, any of "body",
+                "headers" and "flags". Pass an empty tuple to only fetch the
+                message details.
+            max_workers: integer - Maximum number of requests in flight.
+            any other argument accepted by Message.get(), e.g. body_type
+
+        Returns:
+            A list of Message objects, one per distinct id, in the order the
+                ids were given.
+        """
+        parts = {"body": "include_body", "headers": "include_headers", "flags": "include_flags"}
+
+        unknown = [part for part in include if part not in parts]
+        if unknown:
+            raise ArgumentError("Unknown message parts: {0}".format(", ".join(unknown)))
+
+        for part in include:
+            params[parts[part]] = 1
+
+        seen = set()
+        messages = []
+        for message_id in message_ids:
+            if message_id not in seen:
+                seen.add(message_id)
+                messages.append(Message(self, {"message_id": message_id}))
+
+        map_bounded(lambda message: message.get(**params), messages, max_workers)
+
+        return messages
+
+    def post_message_flags_bulk(self, message_ids, max_workers=DEFAULT_MAX_WORKERS, rate=None,
+                                **params):
+        """Set the same flags on many messages concurrently.
+
+        Calls Message.post_flag() once per message.
+
+        Required Arguments:
+            message_ids: list of strings - Context.IO ids of the messages.
+                Duplicates are only sent once.
+
+        Optional Arguments:
+            max_workers: integer - Maximum number of requests in flight.
+            rate: float - Maximum number of requests started per second.
+            seen, answered, flagged, deleted, draft: integer - 1 to set the
+                flag, 0 to unset it, see Message.post_flag()
+
+        Returns:
+            A BatchReport. Failed messages are listed in its failed dict
+                instead of raising.
+        """
+        return run_batch(
+            lambda message_id: Message(self, {"message_id": message_id}).post_flag(**params),
+            message_ids, max_workers, rate)
+
+    def post_message_folders_bulk(self, message_ids, max_workers=DEFAULT_MAX_WORKERS, rate=None,
+                                  **params):
+        """Add and/or remove folders for many messages concurrently.
+
+        Calls Message.post_folder() once per message.
+
+        Required Arguments:
+            message_ids: list of strings - Context.IO ids of the messages.
+                Duplicates are only sent once.
+
+        Optional Arguments:
+            max_workers: integer - Maximum number of requests in flight.
+            rate: float - Maximum number of requests started per second.
+            add: string - New folder the messages should appear in.
+            remove: string - Folder the messages should be removed from.
+
+        Returns:
+            A BatchReport. Failed messages are listed in its failed dict
+                instead of raising.
+        """
+        return run_batch(
+            lambda message_id: Message(self, {"message_id": message_id}).post_folder(**params),
+            message_ids, max_workers, rate)
+
+    def put_message_folders_bulk(self, message_ids, body, max_workers=DEFAULT_MAX_WORKERS,
+                                 rate=None):
+        """Set the folders of many messages concurrently.
+
+        Calls Message.put_folders() once per message.
+
+        Required Arguments:
+            message_ids: list of strings - Context.IO ids of the messages.
+                Duplicates are only sent once.
+            body: string - The folders every message should be in, see
+                Message.put_folders()
+
+        Optional Arguments:
+            max_workers: integer - Maximum number of requests in flight.
+            rate: float - Maximum number of requests started per second.
+
+        Returns:
+            A BatchReport. Failed messages are listed in its failed dict
+                instead of raising.
+        """
+        return run_batch(
+            lambda message_id: Message(self, {"message_id": message_id}).put_folders(body),
+            message_ids, max_workers, rate)
 
     def get_sources(self, **params):
         """Lists IMAP sources assigned for an account.
@@ -384,7 +569,7 @@ class Account(BaseResource):
         """
         return self._request_uri('sync')
 
-    def get_threads(self, **params):
+    def get_threads(self, hydrate=False, max_workers=DEFAULT_MAX_WORKERS, **params):
         """List of threads on an account.
 
         Documentation: http://context.io/docs/2.0/accounts/threads#get
@@ -440,10 +625,15 @@ class Account(BaseResource):
                 to the time the message is sent from the origin.
             limit: integer - The maximum number of results to return.
             offset: integer - Start the list at this offset (zero-based).
+            hydrate: bool - Set to True to populate every thread with
+                Thread.get(). The requests are made concurrently.
+            max_workers: integer - Maximum number of concurrent requests when
+                hydrate is True.
 
         Returns:
-            A list of Thread objects (nearly empty thread objects). Use the
-                Thread.get() method to populate the object.
+            A list of Thread objects (nearly empty thread objects unless
+                hydrate is True). Use the Thread.get() method to populate the
+                object.
         """
         all_args = [
             'subject', 'email', 'to', 'sender', 'from_', 'cc', 'bcc', 'folder',
@@ -470,7 +660,28 @@ class Account(BaseResource):
             url_components = thread_url.split('/')
             objs.append({'gmail_thread_id': url_components[-1]})
 
-        return [Thread(self, obj) for obj in objs]
+        threads = [Thread(self, obj) for obj in objs]
+
+        if hydrate:
+            Thread.hydrate(threads, max_workers)
+
+        return threads
+
+    def iter_threads(self, page_size=DEFAULT_PAGE_SIZE, read_ahead=False, **params):
+        """Iterate over the threads of an account, one page at a time.
+
+        Takes the same arguments as get_threads(). limit is the total number
+        of threads to yield, offset is where to start.
+
+        Optional Arguments:
+            page_size: integer - number of threads requested per call.
+            read_ahead: bool - fetch the next page on a background thread
+                while the current one is being consumed.
+
+        Returns:
+            A generator of Thread objects (nearly empty, see get_threads())
+        """
+        return iter_pages(self.get_threads, params, page_size, read_ahead)
 
     def get_webhooks(self):
         """Listing of WebHooks configured for an account.
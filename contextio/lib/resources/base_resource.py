@@ -1,5 +1,6 @@
 import functools
 import logging
+import threading
 import six
 
 if six.PY2:
@@ -8,6 +9,7 @@ else:
     from urllib.parse import quote
 
 from contextio.lib import helpers
+from contextio.lib.conditional import NOT_MODIFIED, Validators
 from contextio.lib.errors import MissingResourceId
 
 no_resource_id_required = ["BaseResource", "Discovery"]
@@ -24,9 +26,184 @@ def only(*versions):
         return wrapper
     return _only
 
+# (class, api_version) => compact class, see compact_class()
+_compact_classes = {}
+
+# class attributes that aren't copied into compact classes
+_uncopied = ("__dict__", "__weakref__", "__new__", "__slots__", "__qualname__")
+
+# guards lazy hydration, shared between resources to keep them small
+_hydrate_locks = [threading.RLock() for _ in range(32)]
+
+
+def api_option(parent, name):
+    """True if the Api object at the top of parent's chain has option name set to True."""
+    while isinstance(parent, BaseResource):
+        parent = getattr(parent, "parent", None)
+
+    return getattr(parent, name, False) is True
+
+
+# default of _Extra attributes without a class attribute
+_missing = object()
+
+
+class _Extra(object):
+    """An attribute of a compact class that isn't a slot.
+
+    Its value is kept in the _extra dict of the resource, which is only
+    created when such an attribute is first set. Reading it before falls
+    back to the class attribute of the same name, if any.
+    """
+    __slots__ = ("name", "default")
+
+    def __init__(self, name, default):
+        self.name = name
+        self.default = default
+
+    def __get__(self, resource, owner=None):
+        if resource is None:
+            return self
+
+        extra = resource._extra
+        if extra is not None and self.name in extra:
+            return extra[self.name]
+
+        if self.default is _missing:
+            raise AttributeError(self.name)
+
+        return self.default
+
+    def __set__(self, resource, value):
+        if resource._extra is None:
+            resource._extra = {}
+
+        resource._extra[self.name] = value
+
+
+
+def compact_class(cls, api_version):
+    """Returns a class whose instances store the attributes of cls in __slots__.
+
+    The slots are parent, api_version, base_uri and the class' keys for
+    api_version. The class' extra_attributes (and the bookkeeping attributes
+    of BaseResource) share one more slot holding a dict, which is only
+    created when one of them is set. Instances have no __dict__, so setting
+    any other attribute raises AttributeError.
+
+    Deriving from cls would bring its __dict__ back, so the compact class
+    gets a copy of the attributes of cls and its bases instead, taken when it
+    is first built. Its __class__ is cls, which keeps isinstance() and
+    super(cls, self) working. Instances are pickled as cls and api_version
+    plus the values of their slots, see _rebuild_compact().
+    """
+    compact = _compact_classes.get((cls, api_version))
+    if compact is not None:
+        return compact
+
+    keys = cls.keys
+    if isinstance(keys, dict):
+        keys = keys.get(api_version, [])
+
+    slots = ["parent", "api_version", "base_uri", "_extra"]
+    for name in keys:
+        if name not in slots:
+            slots.append(name)
+
+    namespace = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        namespace.update(vars(klass))
+    for name in _uncopied:
+        namespace.pop(name, None)
+
+    # a slot can't share its name with a class attribute, e.g. Message.folders
+    defaults = tuple(
+        (name, namespace.pop(name)) for name in slots
+        if name in namespace and not callable(namespace[name]))
+
+    for name in ("_hydrated", "_conditional") + tuple(cls.extra_attributes):
+        if name not in slots:
+            namespace[name] = _Extra(name, namespace.get(name, _missing))
+
+    namespace.update({
+        "__slots__": tuple(slots),
+        "__class__": property(lambda self: cls),
+        "compact_resources": True,
+        "_slot_defaults": defaults,
+        "__reduce__": _reduce_compact,
+        "__setstate__": _setstate_compact,
+    })
+    compact = type(cls.__name__, (object,), namespace)
+    _compact_classes[(cls, api_version)] = compact
+    return compact
+
+
+def _rebuild_compact(cls, api_version):
+    """Returns an empty instance of compact_class(cls, api_version)."""
+    resource = object.__new__(compact_class(cls, api_version))
+    resource._extra = None
+    for name, value in resource._slot_defaults:
+        setattr(resource, name, value)
+
+    return resource
+
+
+def _reduce_compact(resource):
+    # the compact class is built at runtime, so it's rebuilt from cls;
+    # the slots go in the state, which lets the parent chain hold cycles
+    compact = type(resource)
+    state = {}
+    for name in compact.__slots__:
+        # read through the slot, a missing key of a lazy resource isn't fetched
+        try:
+            state[name] = getattr(compact, name).__get__(resource, compact)
+        except AttributeError:
+            pass
+
+    return _rebuild_compact, (resource.__class__, resource.api_version), state
+
+
+def _setstate_compact(resource, state):
+    for name, value in state.items():
+        setattr(resource, name, value)
+
+
+def _new_resource(cls, parent=None, *args, **kwargs):
+    if getattr(parent, "compact_resources", False) is not True:
+        return object.__new__(cls)
+
+    resource = _rebuild_compact(cls, getattr(parent, "api_version", "2.0"))
+
+    # type.__call__ only runs __init__ on instances of cls
+    resource.__init__(parent, *args, **kwargs)
+    return resource
+
+
+def enable_compact_resources():
+    """Makes resources created under a compact_resources parent compact.
+
+    Called by Api when compact_resources is set, so that until then creating
+    a resource doesn't go through a __new__ method at all.
+    """
+    if "__new__" not in vars(BaseResource):
+        BaseResource.__new__ = staticmethod(_new_resource)
+
+
 class BaseResource(object):
-    """Base class for resource objects."""
+    """Base class for resource objects.
+
+    When the Api object at the top of the parent chain was created with
+    compact_resources=True, resources are instances of a compact_class() of
+    their class, which uses much less memory per object. Attributes set by
+    the class besides its keys must be listed in extra_attributes.
+
+    With lazy_resources=True, resources of classes that set hydrate_on_access
+    leave the keys missing from their definition unset. Reading one of them
+    calls get() once, after which every key is set.
+    """
     keys = []
+    extra_attributes = ()
+    hydrate_on_access = False
 
     def __init__(self, parent, base_uri, definition):
         class_name = self.__class__.__name__
@@ -54,23 +231,59 @@ class BaseResource(object):
         unidict = {six.text_type(k): six.text_type(v) for k, v in definition.items()}
         self.base_uri = quote(base_uri.format(**unidict))
 
-    def _set_instance_attributes(self, parent, definition):
+    def _resource_keys(self):
         if isinstance(self.__class__.keys, dict):
-            keys = self.__class__.keys[self.api_version]
-        else:
-            keys = self.__class__.keys
+            return self.__class__.keys[self.api_version]
+
+        return self.__class__.keys
 
-        for k in keys:
+    def _is_lazy(self):
+        return self.hydrate_on_access and api_option(self.parent, "lazy_resources")
+
+    def _set_instance_attributes(self, parent, definition):
+        # lazy stubs leave the missing keys unset until they are hydrated
+        skip_missing = self._is_lazy() and not getattr(self, "_hydrated", False)
+
+        for k in self._resource_keys():
             if k in definition:
                 setattr(self, k, definition[k])
-            else:
+            elif not skip_missing:
                 setattr(self, k, None)
 
+    def __getattr__(self, name):
+        # only called for attributes that aren't set: hydrate lazy stubs
+        if name.startswith("_") or not self.hydrate_on_access or name not in self._all_keys() \
+                or not self._is_lazy():
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(
+                self.__class__.__name__, name))
+
+        with _hydrate_locks[id(self) % len(_hydrate_locks)]:
+            if not getattr(self, "_hydrated", False):
+                self._hydrated = True
+                try:
+                    self.get()
+                except Exception:
+                    self._hydrated = False
+                    raise
+
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return None
+
+    @classmethod
+    def _all_keys(cls):
+        if isinstance(cls.keys, dict):
+            return set(k for keys in cls.keys.values() for k in keys)
+
+        return cls.keys
+
     def _uri_for(self, *elems):
         """Joins API endpoint elements and returns a string."""
         return '/'.join([self.base_uri] + list(elems))
 
-    def _request_uri(self, uri_endpoint="", method="GET", params={}, headers={}, body=''):
+    def _request_uri(self, uri_endpoint="", method="GET", params=None, headers=None, body='',
+                     validators=None):
         """Gathers up request elements and helps form the request object.
 
         Required Arguments:
@@ -82,13 +295,43 @@ class BaseResource(object):
             params: dict - parameters to pass along
             headers: dict - any specific http headers
             body: string - request body, only used on a few PUT statements
+            validators: Validators - make a conditional GET, the result is
+                NOT_MODIFIED if the resource didn't change (see Api)
         """
         uri = self._uri_for(uri_endpoint)
         return self.parent._request_uri(
-            uri, method=method, params=params, headers=headers, body=body)
+            uri, method=method, params=params or {}, headers=headers or {}, body=body,
+            validators=validators)
+
+    def _validators(self):
+        """Returns the Validators of this resource, None without conditional_requests."""
+        validators = getattr(self, "_conditional", None)
+        if validators is None and api_option(self.parent, "conditional_requests"):
+            validators = self._conditional = Validators()
+
+        return validators
+
+    def _stream_uri(self, uri_endpoint="", headers=None):
+        """Like _request_uri, but returns the streaming response of a GET request.
+
+        Required Arguments:
+            uri_endpoint: string - the endpoint.
+
+        Optional Arguments:
+            headers: dict - any specific http headers
+        """
+        uri = self._uri_for(uri_endpoint)
+        return self.parent._stream_uri(uri, headers=headers or {})
+
+    def get(self, uri="", return_bool=True, params=None, all_args=None, required_args=None):
+        # only a refresh can be answered with "not modified", callers asking
+        # for the body always get it
+        response = self._request_uri(
+            uri, params=helpers.sanitize_params(params or {}, all_args or [], required_args),
+            validators=self._validators() if return_bool else None)
+        if response is NOT_MODIFIED:
+            return True
 
-    def get(self, uri="", return_bool=True, params={}, all_args=[], required_args=[]):
-        response = self._request_uri(uri, params=helpers.sanitize_params(params, all_args, required_args))
         self.__init__(self.parent, response)
 
         if return_bool:
@@ -100,9 +343,10 @@ class BaseResource(object):
         response = self._request_uri(uri, method='DELETE')
         return bool(response['success'])
 
-    def post(self, uri="", return_bool=True, params={}, headers={}, all_args=[], required_args=[]):
-        params = helpers.sanitize_params(params, all_args, required_args)
-        response = self._request_uri(uri, method="POST", params=params, headers=headers)
+    def post(self, uri="", return_bool=True, params=None, headers=None, all_args=None,
+             required_args=None):
+        params = helpers.sanitize_params(params or {}, all_args or [], required_args)
+        response = self._request_uri(uri, method="POST", params=params, headers=headers or {})
 
         if return_bool:
             return bool(response['success'])
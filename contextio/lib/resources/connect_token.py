@@ -31,6 +31,7 @@ class ConnectToken(BaseResource):
             "callback_url", "first_name", "last_name", "email_account_id", "resource_url", "expires"
         ]
     }
+    extra_attributes = ("account", "user")
 
     def __init__(self, parent, definition):
         """Constructor.
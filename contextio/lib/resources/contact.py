@@ -1,6 +1,9 @@
 import logging
 
 from contextio.lib import helpers
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS
+from contextio.lib.conditional import NOT_MODIFIED
+from contextio.lib.decoding import map_list
 from contextio.lib.resources.base_resource import BaseResource
 from contextio.lib.resources.file import File
 from contextio.lib.resources.message import Message
@@ -28,6 +31,8 @@ class Contact(BaseResource):
     resource_id = "email"
     keys = ["emails", "name", "thumbnail", "last_received", "last_sent",
         "count", "sent_count", "received_count", "sent_from_account_count", "email"]
+    # with lazy_resources=True, contact stubs fetch themselves when needed
+    hydrate_on_access = True
 
     def __init__(self, parent, definition):
         """Constructor.
@@ -56,7 +61,10 @@ class Contact(BaseResource):
         """
         # since the data returned doesn't have an email key, add it from emails
         # cannot use the BaseResource get method here =/
-        data = self._request_uri()
+        data = self._request_uri(validators=self._validators())
+        if data is NOT_MODIFIED:
+            return True
+
         if data.get("email") is None:
             emails = data.get("emails")
             if emails is not None and len(emails) > 0:
@@ -89,7 +97,8 @@ class Contact(BaseResource):
         all_args = ['limit', 'offset']
         params = helpers.sanitize_params(params, all_args)
 
-        return [File(self.parent, obj) for obj in self._request_uri('files', params=params)]
+        return map_list(
+            lambda obj: File(self.parent, obj), self._request_uri('files', params=params))
 
     def get_messages(self, **params):
         """List messages where a contact is present.
@@ -107,9 +116,10 @@ class Contact(BaseResource):
         all_args = ['limit', 'offset']
         params = helpers.sanitize_params(params, all_args)
 
-        return [Message(self.parent, obj) for obj in self._request_uri('messages', params=params)]
+        return map_list(
+            lambda obj: Message(self.parent, obj), self._request_uri('messages', params=params))
 
-    def get_threads(self, **params):
+    def get_threads(self, hydrate=False, max_workers=DEFAULT_MAX_WORKERS, **params):
         """List threads where contact is present.
 
         Documentation: http://context.io/docs/2.0/accounts/contacts/threads#get
@@ -117,6 +127,10 @@ class Contact(BaseResource):
         Optional Arguments:
             limit: integer - The maximum number of results to return.
             offset: integer - Start the list at this offset (zero-based).
+            hydrate: bool - Set to True to populate every thread with
+                Thread.get(). The requests are made concurrently.
+            max_workers: integer - Maximum number of concurrent requests when
+                hydrate is True.
 
         Returns:
             A list of Thread objects.
@@ -132,4 +146,9 @@ class Contact(BaseResource):
             url_components = thread_url.split('/')
             objs.append({'gmail_thread_id': url_components[-1]})
 
-        return [Thread(self.parent, obj) for obj in objs]
+        threads = [Thread(self.parent, obj) for obj in objs]
+
+        if hydrate:
+            Thread.hydrate(threads, max_workers)
+
+        return threads
@@ -8,6 +8,7 @@ class EmailAccount(BaseResource):
         "status", "resource_url", "type", "authentication_type", "use_ssl", "server", "label",
         "username", "port"
     ]
+    extra_attributes = ("delimiter",)
 
     def __init__(self, parent, definition):
         super(EmailAccount, self).__init__(parent, 'email_accounts/{label}', definition)
@@ -1,7 +1,11 @@
 import logging
+import six
 
+from contextio.lib.errors import ArgumentError
 from contextio.lib.resources.base_resource import BaseResource
 
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
 class File(BaseResource):
     """Class to represent the File resource.
 
@@ -102,6 +106,96 @@ class File(BaseResource):
 
         return self._request_uri('content', headers=headers)
 
+    def stream_content(self, offset=0):
+        """Open a streaming download of the file.
+
+        Documentation: http://context.io/docs/2.0/accounts/files/content
+
+        Optional Arguments:
+            offset: integer - byte position to start from. A Range header is
+                sent; check response.status_code for 206 to know whether the
+                server honored it or sent the whole file.
+
+        Returns:
+            A requests.Response object, which the caller must close.
+        """
+        headers = {}
+        if offset:
+            headers["Range"] = "bytes={0}-".format(offset)
+
+        return self._stream_uri("content", headers=headers)
+
+    def iter_content(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream the content of a file.
+
+        Unlike get_content(), the file is never held in memory as a whole and
+        the payload is not run through the JSON decoder.
+
+        Documentation: http://context.io/docs/2.0/accounts/files/content
+
+        Optional Arguments:
+            chunk_size: integer - number of bytes per chunk
+
+        Returns:
+            A generator of byte strings.
+        """
+        response = self.stream_content()
+        try:
+            for chunk in response.iter_content(chunk_size):
+                if chunk:
+                    yield chunk
+        finally:
+            response.close()
+
+    def download(self, destination, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream the content of a file to a path, file object or buffer.
+
+        Required Arguments:
+            destination: one of
+                string - path of a file to write, it is created or truncated
+                file object - anything with a write() method, opened in binary
+                    mode
+                buffer - a writable object supporting the buffer protocol
+                    (bytearray, memoryview, mmap...), which must be large
+                    enough to hold the file
+
+        Optional Arguments:
+            chunk_size: integer - number of bytes read from the network at a
+                time
+
+        Returns:
+            The number of bytes written.
+        """
+        chunks = self.iter_content(chunk_size)
+
+        if isinstance(destination, six.string_types):
+            with open(destination, "wb") as f:
+                return _write_chunks(chunks, f)
+
+        if hasattr(destination, "write"):
+            return _write_chunks(chunks, destination)
+
+        view = memoryview(destination)
+        if view.readonly:
+            raise ArgumentError("Cannot download into a read-only buffer")
+
+        if view.itemsize != 1 or view.ndim != 1:
+            view = view.cast("B")
+
+        written = 0
+        for chunk in chunks:
+            end = written + len(chunk)
+            if end > len(view):
+                chunks.close()
+                raise ArgumentError(
+                    "Buffer of {0} bytes is too small for file {1}".format(
+                        len(view), self.file_id))
+
+            view[written:end] = chunk
+            written = end
+
+        return written
+
     def get_related(self):
         """Get list of other files related to a given file.
 
@@ -115,3 +209,10 @@ class File(BaseResource):
         """
         return [File(self, obj) for obj in self._request_uri("related")]
 
+
+def _write_chunks(chunks, f):
+    written = 0
+    for chunk in chunks:
+        f.write(chunk)
+        written += len(chunk)
+    return written
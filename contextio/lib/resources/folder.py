@@ -1,6 +1,8 @@
 import logging
 
 from contextio.lib import helpers
+from contextio.lib.decoding import map_list
+from contextio.lib.pagination import DEFAULT_PAGE_SIZE, iter_pages
 from contextio.lib.resources.base_resource import BaseResource
 from contextio.lib.resources.message import Message
 
@@ -128,6 +130,21 @@ class Folder(BaseResource):
         ]
         params = helpers.sanitize_params(params, all_args)
 
-        return [
-            Message(self, obj) for obj in self._request_uri('messages', params=params)
-        ]
+        return map_list(
+            lambda obj: Message(self, obj), self._request_uri('messages', params=params))
+
+    def iter_messages(self, page_size=DEFAULT_PAGE_SIZE, read_ahead=False, **params):
+        """Iterate over the messages in a folder, one page at a time.
+
+        Takes the same arguments as get_messages(). limit is the total number
+        of messages to yield, offset is where to start.
+
+        Optional Arguments:
+            page_size: integer - number of messages requested per call.
+            read_ahead: bool - fetch the next page on a background thread
+                while the current one is being consumed.
+
+        Returns:
+            A generator of Message objects
+        """
+        return iter_pages(self.get_messages, params, page_size, read_ahead)
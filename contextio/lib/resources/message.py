@@ -44,6 +44,9 @@ class Message(BaseResource):
         ]
     }
 
+    extra_attributes = (
+        "files", "body", "flags", "headers", "folders", "source", "thread", "raw", "attachments")
+
     # set empty properties that will get populated by the get methods
     body = None
     flags = None
@@ -326,8 +329,7 @@ class Message(BaseResource):
             Bool
         """
         all_args = ['add', 'remove', 'add[]', 'remove[]']
-        params = helpers.sanitize_params(params, all_args)
-        return super(Message, self).post("folders", params=params)
+        return super(Message, self).post("folders", params=params, all_args=all_args)
 
     @only("2.0")
     def put_folders(self, body):
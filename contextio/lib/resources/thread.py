@@ -1,5 +1,7 @@
 import logging
 
+from contextio.lib import helpers
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS, map_bounded
 from contextio.lib.resources.base_resource import BaseResource
 
 class Thread(BaseResource):
@@ -22,6 +24,8 @@ class Thread(BaseResource):
         "gmail_thread_id", "email_message_ids", "person_info", "messages", "subject", "folders",
         "sources"
     ]
+    # with lazy_resources=True, thread stubs fetch themselves when needed
+    hydrate_on_access = True
 
     def __init__(self, parent, definition):
         """Constructor.
@@ -80,7 +84,31 @@ class Thread(BaseResource):
             'include_body', 'include_headers', 'include_flags', 'body_type', 'limit', 'offset'
         ]
 
-        return super(Thread, self).get(self.parent, params=params, all_args=all_args)
+        params = helpers.sanitize_params(params, all_args)
+        data = self._request_uri(params=params)
+
+        # keep addressing the thread by the id it was requested with
+        data["gmail_thread_id"] = self.gmail_thread_id
+
+        self.__init__(self.parent, data)
+        return True
+
+    @staticmethod
+    def hydrate(threads, max_workers=DEFAULT_MAX_WORKERS, **params):
+        """Calls get() on many threads concurrently.
+
+        Required Arguments:
+            threads: list of Thread objects
+
+        Optional Arguments:
+            max_workers: integer - maximum number of requests in flight
+            any argument accepted by Thread.get()
+
+        Returns:
+            The list of threads, populated and in the same order.
+        """
+        map_bounded(lambda thread: thread.get(**params), threads, max_workers)
+        return threads
 
 
     def put(self):
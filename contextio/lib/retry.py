@@ -0,0 +1,313 @@
+"""Rate limiting, retries and circuit breaking for API requests.
+
+    from contextio.lib.retry import RetryEngine
+
+    context_io = ContextIO(key, secret, retry=RetryEngine(max_retries=5, rate=20, account_rate=2))
+
+A RetryEngine wraps every request sent by Api:
+
+- token buckets limit the request rate per consumer key and per account,
+- 429 answers are retried after the delay given by their Retry-After header,
+  which also pauses the account (or the whole key) for that long,
+- 5xx answers and connection errors are retried with exponential backoff and
+  full jitter, for idempotent methods only,
+- a circuit breaker stops sending requests for reset_timeout seconds after
+  failure_threshold consecutive failures and raises CircuitOpenError instead.
+
+What happened is counted in stats().
+"""
+import calendar
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_tz, mktime_tz
+
+from requests.exceptions import ConnectionError, Timeout
+
+from contextio.lib.errors import CircuitOpenError
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+_clock = getattr(time, "monotonic", time.time)
+_account_re = re.compile(r"/(?:accounts|users)/([^/?]+)")
+
+
+class TokenBucket(object):
+    """Allows rate requests per second on average, with bursts of capacity.
+
+    Required Arguments:
+        rate: float - tokens added per second
+
+    Optional Arguments:
+        capacity: float - the most tokens that can be saved up, rate by default
+    """
+
+    def __init__(self, rate, capacity=None, clock=_clock):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self.paused_until = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token, returns the number of seconds to wait before using it."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            wait = 0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.paused_until - now)
+
+    def pause(self, seconds):
+        """Holds back every token for the next seconds, e.g. after a 429."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class CircuitBreaker(object):
+    """Opens after failure_threshold consecutive failures.
+
+    While open, allow() is False. After reset_timeout seconds a single trial
+    request is let through: its success closes the circuit, its failure opens
+    it again, and release() lets another request be the trial.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=_clock):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._trial = False
+
+    def release(self):
+        """Ends a request that was neither a success nor a failure."""
+        with self._lock:
+            self._trial = False
+
+
+class RetryEngine(object):
+    """Sends requests with rate limiting, retries and a circuit breaker.
+
+    Optional Arguments:
+        max_retries: integer - retries after the first attempt
+        backoff_factor: float - the backoff before retry n is a random
+            delay between 0 and backoff_factor * 2 ** n seconds
+        max_backoff: float - upper bound of the backoff and of Retry-After
+        retry_statuses: tuple - HTTP statuses that are retried. 429 is
+            retried for every method, the others for idempotent ones only.
+        rate: float - requests per second allowed per consumer key, no limit
+            by default
+        burst: float - requests that can be sent at once per consumer key,
+            rate by default
+        account_rate: float - requests per second allowed per account
+        account_burst: float - requests that can be sent at once per account
+        failure_threshold: integer - consecutive failures (5xx or connection
+            errors) that open the circuit, None disables the breaker
+        reset_timeout: float - seconds the circuit stays open
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30,
+                 retry_statuses=RETRY_STATUSES, rate=None, burst=None, account_rate=None,
+                 account_burst=None, failure_threshold=None, reset_timeout=30):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.rate = rate
+        self.burst = burst
+        self.account_rate = account_rate
+        self.account_burst = account_burst
+
+        self.circuit_breaker = None
+        if failure_threshold is not None:
+            self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self.sleep = time.sleep
+        self.counters = dict.fromkeys(
+            ["requests", "retries", "throttled", "rate_limited", "failures", "circuit_open"], 0)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def send(self, method, url, send, key=None):
+        """Calls send() until it returns a response that shouldn't be retried.
+
+        Required Arguments:
+            method: string - the HTTP method, used to tell idempotent requests
+            url: string - the request url, used to find the account
+            send: callable - sends the request and returns the response
+
+        Optional Arguments:
+            key: string - the consumer key the request is signed with
+
+        Returns:
+            The last response. Raises CircuitOpenError if the circuit is open,
+                or the last connection error.
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        buckets = self._buckets_for(key, url)
+        attempt = 0
+
+        while True:
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+                self._count("circuit_open")
+                raise CircuitOpenError(
+                    "Not sending {0} {1}: too many failures, the circuit is open".format(method, url))
+
+            self._throttle(buckets)
+            self._count("requests")
+
+            recorded = False
+            try:
+                response = send()
+            except (ConnectionError, Timeout):
+                recorded = True
+                self._record(failed=True)
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                recorded = True
+                status = response.status_code
+                self._record(failed=status >= 500)
+
+                if status not in self.retry_statuses or attempt >= self.max_retries:
+                    return response
+
+                if status == 429:
+                    self._count("rate_limited")
+                    delay = self.retry_after(response)
+                    if delay is None:
+                        delay = self.backoff(attempt)
+                    for bucket in buckets[-1:]:
+                        bucket.pause(delay)
+                elif idempotent:
+                    delay = self.backoff(attempt)
+                else:
+                    return response
+
+                # give the connection back to the pool before trying again
+                close = getattr(response, "close", None)
+                if close is not None:
+                    close()
+            finally:
+                # any other error says nothing about the API, but must not
+                # leave a half-open circuit waiting for a trial forever
+                if not recorded and self.circuit_breaker is not None:
+                    self.circuit_breaker.release()
+
+            attempt += 1
+            self._count("retries")
+            self.sleep(delay)
+
+    def backoff(self, attempt):
+        """Seconds to wait before retry number attempt + 1, with full jitter."""
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    def retry_after(self, response):
+        """Seconds asked for by the Retry-After header of response, or None."""
+        value = (getattr(response, "headers", None) or {}).get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            seconds = float(value)
+        except ValueError:
+            date = parsedate_tz(value)
+            if date is None:
+                return None
+            seconds = mktime_tz(date) - calendar.timegm(time.gmtime())
+
+        return min(max(seconds, 0), self.max_backoff)
+
+    def stats(self):
+        """Returns the counters as a dict, plus the state of the circuit."""
+        with self._lock:
+            stats = dict(self.counters)
+
+        if self.circuit_breaker is not None:
+            stats["circuit"] = self.circuit_breaker.state
+
+        return stats
+
+    def _buckets_for(self, key, url):
+        """Returns the buckets a request draws from, the most specific last."""
+        names = []
+        if self.rate is not None:
+            names.append((key, None, self.rate, self.burst))
+
+        match = _account_re.search(url)
+        if self.account_rate is not None and match:
+            names.append((key, match.group(1), self.account_rate, self.account_burst))
+
+        buckets = []
+        with self._lock:
+            for key, account, rate, burst in names:
+                bucket = self._buckets.get((key, account))
+                if bucket is None:
+                    bucket = self._buckets[(key, account)] = TokenBucket(rate, burst)
+                buckets.append(bucket)
+
+        return buckets
+
+    def _throttle(self, buckets):
+        wait = max([bucket.reserve() for bucket in buckets] or [0])
+        if wait > 0:
+            self._count("throttled")
+            self.sleep(wait)
+
+    def _record(self, failed):
+        if failed:
+            self._count("failures")
+
+        if self.circuit_breaker is not None:
+            if failed:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
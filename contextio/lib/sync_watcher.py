@@ -0,0 +1,374 @@
+"""Waits for sources to finish syncing.
+
+    from contextio.lib.sync_watcher import SyncWatcher
+
+    with SyncWatcher(min_interval=2, max_interval=60) as watcher:
+        # blocking
+        status = watcher.wait(source, timeout=600)
+
+        # callback, called with the future on the watcher's thread
+        watcher.watch(account, callback=lambda future: print(future.result()))
+
+        # futures, e.g. from asyncio
+        status = await watcher.wait_async(source)
+
+By default a watch is done once the initial import is finished. With
+since=<unix time>, it is done once a sync stopped at or after that time,
+e.g. after post_sync().
+
+All the watches on sources of the same account are answered by a single
+Account.get_sync() call per round. A source missing from that answer is
+asked for with Source.get_sync(). Accounts are polled again after
+min_interval, and the interval grows by backoff (up to max_interval) after
+every round in which none of their watches finished.
+"""
+import logging
+import random
+import threading
+import time
+
+from concurrent.futures import Future
+
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS, map_bounded
+from contextio.lib.errors import SyncTimeout
+from contextio.lib.resources.source import Source
+
+DEFAULT_MIN_INTERVAL = 2
+DEFAULT_MAX_INTERVAL = 60
+DEFAULT_MAX_ERRORS = 5
+
+STATUS_KEYS = ("initial_import_finished", "last_sync_start", "last_sync_stop")
+
+logger = logging.getLogger(__name__)
+
+
+def sync_status(response, label=None):
+    """Returns the status of a source in a get_sync() answer, or None.
+
+    Statuses found under label (per folder, say) are combined: the initial
+    import is finished once it is finished everywhere, and the source last
+    synced at the oldest last_sync_stop.
+
+    Required Arguments:
+        response: dict - answer of Account.get_sync() or Source.get_sync()
+
+    Optional Arguments:
+        label: string - the source, all of them by default
+
+    Returns:
+        A dict with initial_import_finished, last_sync_start and
+            last_sync_stop keys, or None if label wasn't found
+    """
+    node = response if label is None else _find(response, label)
+    statuses = list(_statuses(node)) if node is not None else []
+    if not statuses:
+        return None
+
+    starts = [status.get("last_sync_start") for status in statuses]
+    stops = [status.get("last_sync_stop") for status in statuses]
+    return {
+        "initial_import_finished": all(
+            bool(status.get("initial_import_finished")) for status in statuses),
+        "last_sync_start": max(starts) if None not in starts else None,
+        "last_sync_stop": min(stops) if None not in stops else None,
+    }
+
+
+class _Watch(object):
+    __slots__ = ("label", "since", "deadline", "future")
+
+    def __init__(self, label, since, deadline, future):
+        self.label = label
+        self.since = since
+        self.deadline = deadline
+        self.future = future
+
+    def done(self, status):
+        if status is None:
+            return False
+        if self.since is None:
+            return status["initial_import_finished"]
+        return status["last_sync_stop"] is not None and status["last_sync_stop"] >= self.since
+
+
+class _Account(object):
+    __slots__ = ("account", "watches", "interval", "due", "errors")
+
+    def __init__(self, account, interval, due):
+        self.account = account
+        self.watches = []
+        self.interval = interval
+        self.due = due
+        self.errors = 0
+
+
+class SyncWatcher(object):
+    """Tracks the sync status of many sources with as few calls as possible.
+
+    Optional Arguments:
+        min_interval: float - seconds between the first polls of an account
+        max_interval: float - longest interval between polls of an account
+        backoff: float - factor the interval grows by after each round in
+            which none of the account's watches finished
+        jitter: float - every interval is multiplied by a random factor
+            between 1 - jitter and 1 + jitter
+        max_workers: integer - accounts polled at once
+        max_errors: integer - consecutive failed polls of an account after
+            which its watches fail with the last exception
+        background: bool - poll from a thread started by the first watch().
+            If False, call poll() yourself.
+    """
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL,
+                 backoff=2.0, jitter=0.1, max_workers=DEFAULT_MAX_WORKERS,
+                 max_errors=DEFAULT_MAX_ERRORS, background=True):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.max_errors = max_errors
+        self.background = background
+        self.counters = dict.fromkeys(["polls", "finished", "timeouts", "errors"], 0)
+
+        self._accounts = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def watch(self, target, since=None, timeout=None, callback=None):
+        """Starts watching a source, or every source of an account.
+
+        Required Arguments:
+            target: Source or Account object
+
+        Optional Arguments:
+            since: integer (unix time) - wait for a sync that stopped at or
+                after since instead of the initial import
+            timeout: float - seconds after which the watch fails with
+                SyncTimeout
+            callback: callable - called with the future once it is done
+
+        Returns:
+            A concurrent.futures.Future, whose result is the status of the
+                source (see sync_status())
+        """
+        if isinstance(target, Source):
+            account, label = target.parent, target.label
+        else:
+            account, label = target, None
+
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        now = time.time()
+        deadline = None if timeout is None else now + timeout
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("SyncWatcher is closed")
+
+            entry = self._accounts.get(account.id)
+            if entry is None:
+                entry = self._accounts[account.id] = _Account(account, self.min_interval, now)
+            entry.watches.append(_Watch(label, since, deadline, future))
+
+            if self.background and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sync-watcher")
+                self._thread.daemon = True
+                self._thread.start()
+
+        self._wake.set()
+        return future
+
+    def wait(self, target, since=None, timeout=None):
+        """Blocks until a watch is done, see watch().
+
+        Returns:
+            The status of the source
+
+        Raises:
+            SyncTimeout if timeout seconds went by first
+        """
+        return self.watch(target, since=since, timeout=timeout).result()
+
+    def wait_async(self, target, since=None, timeout=None):
+        """Returns an asyncio future for a watch, see watch().
+
+        Python 3 only, to be called from a coroutine running on the loop.
+        """
+        import asyncio
+
+        return asyncio.wrap_future(self.watch(target, since=since, timeout=timeout))
+
+    def poll(self, now=None):
+        """Polls the accounts that are due and finishes the watches that are done.
+
+        Called by the watcher's thread, it can also be called directly.
+
+        Returns:
+            The number of accounts polled
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [entry for entry in self._accounts.values() if entry.due <= now]
+
+        map_bounded(self._poll, due, self.max_workers)
+        self._expire(time.time())
+        return len(due)
+
+    def next_due(self):
+        """Returns the time.time() of the next poll, or None when nothing is watched."""
+        with self._lock:
+            times = [entry.due for entry in self._accounts.values()]
+            times += [watch.deadline for entry in self._accounts.values()
+                      for watch in entry.watches if watch.deadline is not None]
+
+        return min(times) if times else None
+
+    def close(self):
+        """Stops polling and cancels the watches still pending."""
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+
+        # lets the round in progress finish first
+        self._wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        with self._lock:
+            watches = [watch for entry in self._accounts.values() for watch in entry.watches]
+            self._accounts = {}
+
+        for watch in watches:
+            watch.future.cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats["watching"] = sum(len(entry.watches) for entry in self._accounts.values())
+
+        return stats
+
+    def _run(self):
+        while not self._closed:
+            self.poll()
+
+            due = self.next_due()
+            wait = self.max_interval if due is None else due - time.time()
+            self._wake.wait(min(max(wait, 0), self.max_interval))
+            self._wake.clear()
+
+    def _poll(self, entry):
+        with self._lock:
+            watches = [watch for watch in entry.watches if not watch.future.done()]
+
+        if not watches:
+            self._finish(entry, [])
+            return
+
+        try:
+            response = entry.account.get_sync()
+            self._count("polls")
+
+            statuses = {}
+            for label in set(watch.label for watch in watches):
+                statuses[label] = sync_status(response, label)
+                if statuses[label] is None and label is not None:
+                    statuses[label] = sync_status(
+                        Source(entry.account, {"label": label}).get_sync(), label)
+                    self._count("polls")
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Polling the sync status of {0} failed: {1}".format(
+                entry.account.id, e))
+            entry.errors += 1
+            if entry.errors >= self.max_errors:
+                self._finish(entry, [(watch, e) for watch in watches])
+            self._reschedule(entry, False)
+            return
+
+        entry.errors = 0
+        finished = [(watch, statuses[watch.label]) for watch in watches
+                    if watch.done(statuses[watch.label])]
+        self._finish(entry, finished)
+        self._reschedule(entry, bool(finished))
+
+    def _finish(self, entry, results):
+        with self._lock:
+            finished = set(id(watch) for watch, _ in results)
+            entry.watches = [watch for watch in entry.watches
+                             if id(watch) not in finished and not watch.future.done()]
+            if not entry.watches and self._accounts.get(entry.account.id) is entry:
+                del self._accounts[entry.account.id]
+
+        # futures run their callbacks, outside of the lock
+        for watch, result in results:
+            if watch.future.done():
+                continue
+            if isinstance(result, Exception):
+                watch.future.set_exception(result)
+            else:
+                self._count("finished")
+                watch.future.set_result(result)
+
+    def _reschedule(self, entry, progress):
+        if not progress:
+            entry.interval = min(self.max_interval, entry.interval * self.backoff)
+
+        entry.due = time.time() + entry.interval * random.uniform(
+            1 - self.jitter, 1 + self.jitter)
+
+    def _expire(self, now):
+        expired = []
+        with self._lock:
+            for entry in list(self._accounts.values()):
+                for watch in entry.watches:
+                    if watch.deadline is not None and watch.deadline <= now:
+                        expired.append((entry, watch))
+
+        for entry, watch in expired:
+            self._count("timeouts")
+            self._finish(entry, [(watch, SyncTimeout(
+                "{0} didn't finish syncing in time".format(watch.label or entry.account.id)))])
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+
+def _find(node, label):
+    if not isinstance(node, dict):
+        return None
+
+    value = node.get(label)
+    if isinstance(value, dict):
+        return value
+
+    for value in node.values():
+        found = _find(value, label)
+        if found is not None:
+            return found
+
+    return None
+
+
+def _statuses(node):
+    if not isinstance(node, dict):
+        return
+
+    if any(key in node for key in STATUS_KEYS):
+        yield node
+        return
+
+    for value in node.values():
+        for status in _statuses(value):
+            yield status
@@ -0,0 +1,139 @@
+import socket
+import threading
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connection import HTTPConnection
+
+
+class PoolingAdapter(HTTPAdapter):
+    """HTTPAdapter that passes socket options down to the urllib3 pool manager."""
+    # attributes kept when pickled, the pool manager is rebuilt from them
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options"]
+
+    def __init__(self, socket_options=None, **kwargs):
+        self.socket_options = socket_options
+        super(PoolingAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.socket_options is not None:
+            pool_kwargs["socket_options"] = self.socket_options
+
+        super(PoolingAdapter, self).init_poolmanager(
+            connections, maxsize, block=block, **pool_kwargs)
+
+
+class Transport(object):
+    """Connection pool and timeout settings for the HTTP session used by Api.
+
+    A Transport is mounted on the session created by Api and is then used to
+    send every request. Subclass it and override request() to plug in a
+    different HTTP layer.
+
+    Optional Arguments:
+        pool_connections: int - number of per-host connection pools to cache
+        pool_maxsize: int - maximum number of connections kept open per host
+        pool_block: bool - if True, requests wait for a free connection
+            instead of opening (and then discarding) an extra one when the
+            pool is full
+        max_retries: int - number of connection-level retries done by urllib3.
+            HTTP error statuses are never retried here.
+        connect_timeout: float - seconds to wait for a connection to open
+        read_timeout: float - seconds to wait between bytes from the server
+        keep_alive: bool - set to False to close the connection after every
+            request
+        tcp_keepalive: bool - enable SO_KEEPALIVE on pooled sockets so idle
+            connections are not silently dropped by intermediaries
+        tcp_nodelay: bool - disable Nagle's algorithm on pooled sockets
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, max_retries=0,
+                 connect_timeout=None, read_timeout=None, keep_alive=True, tcp_keepalive=False,
+                 tcp_nodelay=True):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.tcp_keepalive = tcp_keepalive
+        self.tcp_nodelay = tcp_nodelay
+        self._shared_adapter = None
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self):
+        """Timeout value in the form accepted by requests, or None to use the default."""
+        if self.connect_timeout is None and self.read_timeout is None:
+            return None
+
+        return (self.connect_timeout, self.read_timeout)
+
+    def socket_options(self):
+        options = [
+            opt for opt in HTTPConnection.default_socket_options
+            if opt[:2] != (socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        ]
+
+        options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if self.tcp_nodelay else 0))
+
+        if self.tcp_keepalive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+        return options
+
+    def adapter(self):
+        return PoolingAdapter(
+            socket_options=self.socket_options(),
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=self.max_retries
+        )
+
+    def shared_adapter(self):
+        """Returns the adapter shared by the sessions mounted with shared=True.
+
+        It is built on first use. Its urllib3 pools are thread-safe, so
+        sessions used by different threads can share their connections.
+        """
+        with self._lock:
+            if self._shared_adapter is None:
+                self._shared_adapter = self.adapter()
+
+            return self._shared_adapter
+
+    def __getstate__(self):
+        # locks can't be pickled, and the pooled connections are only
+        # worth sharing within one process
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state["_shared_adapter"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def mount(self, session, shared=False):
+        """Installs the pooled adapter on a requests/rauth session.
+
+        Optional Arguments:
+            shared: bool - install shared_adapter() instead of a new adapter
+        """
+        adapter = self.shared_adapter() if shared else self.adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def request(self, session, method, url, **kwargs):
+        """Sends a request through session, applying the configured timeouts."""
+        timeout = self.timeout
+        if timeout is not None:
+            kwargs.setdefault("timeout", timeout)
+
+        return session.request(method, url, **kwargs)
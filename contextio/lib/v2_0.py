@@ -1,5 +1,8 @@
 from contextio.lib.api import Api
 from contextio.lib import helpers
+from contextio.lib.concurrency import DEFAULT_MAX_WORKERS
+from contextio.lib.fanout import fan_out
+from contextio.lib.pagination import DEFAULT_PAGE_SIZE, iter_pages
 from contextio.lib.resources.account import Account
 
 
@@ -37,6 +40,49 @@ class V2_0(Api):
         params = helpers.sanitize_params(params, all_args)
         return [Account(self, obj) for obj in self._request_uri("accounts", params=params)]
 
+    def iter_accounts(self, page_size=DEFAULT_PAGE_SIZE, read_ahead=False, **params):
+        """Iterate over accounts, one page at a time.
+
+        Takes the same arguments as get_accounts(). limit is the total number
+        of accounts to yield, offset is where to start.
+
+        Optional Arguments:
+            page_size: int - number of accounts requested per call
+            read_ahead: bool - fetch the next page on a background thread
+                while the current one is being consumed
+
+        Returns:
+            A generator of Account objects
+        """
+        return iter_pages(self.get_accounts, params, page_size, read_ahead)
+
+    def fan_out(self, func, accounts=None, max_workers=DEFAULT_MAX_WORKERS, per_account=None,
+                processes=False, progress=None, page_size=DEFAULT_PAGE_SIZE, **params):
+        """Run a job over many accounts concurrently.
+
+        See contextio.lib.fanout.fan_out().
+
+        Required Arguments:
+            func: callable - called with each Account
+
+        Optional Arguments:
+            accounts: iterable of Account objects. By default every account
+                matching params is used, fetched page_size at a time.
+            max_workers: int - maximum number of jobs running at once
+            per_account: int - maximum number of jobs running at once for
+                the same account
+            processes: bool - use a process pool instead of threads
+            progress: callable - called with (jobs done, jobs total)
+            any argument accepted by get_accounts(), e.g. status_ok
+
+        Returns:
+            A FanOutReport
+        """
+        if accounts is None:
+            accounts = self.iter_accounts(page_size=page_size, **params)
+
+        return fan_out(func, accounts, max_workers, per_account, processes, progress)
+
     def post_account(self, **params):
         """Add a new account.
 
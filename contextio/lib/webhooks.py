@@ -0,0 +1,280 @@
+"""Receives the callbacks of Context.IO webhooks.
+
+    from contextio.lib.webhooks import WebhookReceiver
+
+    def handle(event):
+        print(event.account.id, event.message.subject)
+
+    receiver = WebhookReceiver(context_io, handle, port=8080, workers=8)
+    receiver.serve_forever()
+
+Each POST is checked against its signature, put on a bounded queue and
+answered with 200 right away; worker threads then build the Account (or
+User) and Message objects and call the handler. When the queue is full the
+callback is answered with 503 so that Context.IO sends it again later.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+
+import six
+from six.moves import queue
+
+from contextio.lib.http_server import RequestHandler, ThreadingServer
+from contextio.lib.resources.account import Account
+from contextio.lib.resources.message import Message
+from contextio.lib.resources.user import User
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_WORKERS = 4
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def verify_signature(payload, consumer_secret):
+    """Checks the signature of a callback payload.
+
+    Context.IO signs callbacks with an HMAC-SHA256 of timestamp + token,
+    keyed with the consumer secret.
+
+    Required Arguments:
+        payload: dict - the decoded callback body
+        consumer_secret: string - your Context.IO consumer secret
+
+    Returns:
+        Bool
+    """
+    try:
+        message = "{0}{1}".format(payload["timestamp"], payload["token"])
+        signature = payload["signature"]
+    except (KeyError, TypeError):
+        return False
+
+    if not isinstance(signature, six.string_types):
+        return False
+
+    expected = hmac.new(
+        consumer_secret.encode("utf-8"), message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    # compared as bytes, which compare_digest accepts on python 2 and 3
+    return hmac.compare_digest(expected.encode("ascii"), signature.encode("utf-8"))
+
+
+class WebhookEvent(object):
+    """A webhook callback.
+
+    Properties:
+        account: Account object (User object for Lite callbacks), or None
+        message: Message object, or None for failure notifications
+        webhook_id: string - Id of the webhook that fired
+        timestamp: integer (unix timestamp) - when the callback was sent
+        payload: dict - the decoded callback body
+    """
+
+    def __init__(self, api, payload):
+        self.payload = payload
+        self.webhook_id = payload.get("webhook_id")
+        self.timestamp = payload.get("timestamp")
+
+        self.account = None
+        if payload.get("account_id"):
+            self.account = Account(api, {"id": payload["account_id"]})
+        elif payload.get("user_id"):
+            self.account = User(api, {"id": payload["user_id"]})
+
+        self.message = None
+        message_data = payload.get("message_data")
+        if self.account is not None and message_data and message_data.get("message_id"):
+            self.message = Message(self.account, message_data)
+
+    def __repr__(self):
+        return "<WebhookEvent webhook_id={0} account={1}>".format(
+            self.webhook_id, getattr(self.account, "id", None))
+
+
+class _Handler(RequestHandler):
+    def do_POST(self):
+        receiver = self.server.receiver
+        # the body of a refused request is left unread, so the connection
+        # can't be reused for the next one
+        if receiver.path is not None and self.path.split("?", 1)[0] != receiver.path:
+            return self._respond(404, close=True)
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 < length <= MAX_BODY_SIZE:
+            return self._respond(400, close=True)
+
+        self._respond(receiver.accept(self.rfile.read(length)))
+
+    def _respond(self, status, close=False):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        if close:
+            # also sets self.close_connection
+            self.send_header("Connection", "close")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class WebhookReceiver(object):
+    """HTTP server dispatching webhook callbacks to a handler.
+
+    Required Arguments:
+        api: ContextIO object - used to build the resources and, unless
+            secret is given, for its consumer secret
+        handler: callable - called with a WebhookEvent on a worker thread
+
+    Optional Arguments:
+        host: string - interface to listen on, all of them by default
+        port: integer - port to listen on, 0 for any free port
+        path: string - only accept callbacks POSTed to this path
+        workers: integer - number of threads calling handler
+        queue_size: integer - callbacks waiting for a worker, beyond which
+            new ones are answered with 503
+        secret: string - key used to check signatures, api.consumer_secret by
+            default
+        verify: bool - reject callbacks with a bad signature (401)
+        max_age: integer - reject callbacks whose timestamp is more than this
+            many seconds away from now (401), so that a captured callback
+            can't be replayed later; not checked by default
+    """
+
+    def __init__(self, api, handler, host="", port=8080, path=None, workers=DEFAULT_WORKERS,
+                 queue_size=DEFAULT_QUEUE_SIZE, secret=None, verify=True, max_age=None):
+        self.api = api
+        self.handler = handler
+        self.path = path
+        self.workers = workers
+        self.secret = secret if secret is not None else api.consumer_secret
+        self.verify = verify
+        self.max_age = max_age
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.counters = dict.fromkeys(
+            ["received", "rejected", "dropped", "handled", "failed"], 0)
+
+        self._lock = threading.Lock()
+        self._workers = []
+        self._server_thread = None
+        self._serving = False
+        self._stopped = False
+        self._server = ThreadingServer((host, port), _Handler)
+        self._server.receiver = self
+
+    @property
+    def address(self):
+        """The (host, port) the server listens on."""
+        return self._server.server_address
+
+    def accept(self, body):
+        """Queues a raw callback body, returns the HTTP status to answer with."""
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except ValueError:
+            self._count("rejected")
+            return 400
+
+        if not isinstance(payload, dict):
+            self._count("rejected")
+            return 400
+
+        if self.verify and not verify_signature(payload, self.secret):
+            self._count("rejected")
+            return 401
+
+        if self.max_age is not None and not self._is_fresh(payload):
+            self._count("rejected")
+            return 401
+
+        try:
+            self.queue.put_nowait(payload)
+        except queue.Full:
+            self._count("dropped")
+            return 503
+
+        self._count("received")
+        return 200
+
+    def start(self):
+        """Starts the workers and serves requests on a background thread."""
+        self._start_workers()
+        self._serving = True
+        self._server_thread = threading.Thread(
+            target=self._server.serve_forever, name="webhook-server")
+        self._server_thread.daemon = True
+        self._server_thread.start()
+
+    def serve_forever(self):
+        """Starts the workers and serves requests until stop() is called."""
+        self._start_workers()
+        self._serving = True
+        self._server.serve_forever()
+
+    def stop(self, wait=True):
+        """Stops accepting callbacks, then lets the workers drain the queue."""
+        if self._stopped:
+            return
+        self._stopped = True
+
+        # shutdown() waits for serve_forever(), which may never have run
+        if self._serving:
+            self._server.shutdown()
+        self._server.server_close()
+
+        # one stop marker per worker, queued after the pending callbacks
+        for _ in self._workers:
+            self.queue.put(None)
+
+        if wait:
+            for thread in self._workers:
+                thread.join()
+            if self._server_thread is not None:
+                self._server_thread.join()
+
+    def stats(self):
+        """Returns the counters as a dict, plus the number of queued callbacks."""
+        with self._lock:
+            stats = dict(self.counters)
+
+        stats["queued"] = self.queue.qsize()
+        return stats
+
+    def _is_fresh(self, payload):
+        timestamp = payload.get("timestamp")
+        if isinstance(timestamp, bool) or not isinstance(timestamp, six.integer_types + (float,)):
+            return False
+
+        return abs(time.time() - timestamp) <= self.max_age
+
+    def _start_workers(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name="webhook-worker-{0}".format(i))
+            thread.daemon = True
+            thread.start()
+            self._workers.append(thread)
+
+    def _work(self):
+        while True:
+            payload = self.queue.get()
+            if payload is None:
+                return
+
+            try:
+                self.handler(WebhookEvent(self.api, payload))
+            except Exception:
+                self._count("failed")
+                logger.exception("Webhook handler failed")
+            else:
+                self._count("handled")
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
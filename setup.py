@@ -1,6 +1,6 @@
 from setuptools import setup, find_packages
 
-requires=['rauth', 'six']
+requires=['rauth', 'six', 'futures; python_version < "3"']
 
 setup(name='contextio',
     version='v1.11.2',
@@ -13,5 +13,6 @@ setup(name='contextio',
     include_package_data=True,
     zip_safe=False,
     install_requires=requires,
+    extras_require={'async': ['aiohttp']},
     download_url='https://github.com/contextio/Python-ContextIO/archive/v1.11.2.tar.gz',
 )
@@ -1,6 +1,8 @@
 from mock import Mock, patch
 import unittest
 
+from contextio.lib.api import Api
+from contextio.lib.decoding import LazyList
 from contextio.lib.resources.account import Account
 from contextio.lib.resources.contact import Contact
 from contextio.lib.resources.connect_token import ConnectToken
@@ -10,6 +12,7 @@ from contextio.lib.resources.source import Source
 from contextio.lib.resources.thread import Thread
 from contextio.lib.resources.webhook import WebHook
 from contextio.lib.resources.file import File
+from contextio.lib.errors import RequestError
 from contextio.lib.helpers import ArgumentError
 
 class TestAccount(unittest.TestCase):
@@ -74,6 +77,125 @@ class TestAccount(unittest.TestCase):
 
         self.assertIsInstance(response[0], Message)
 
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_get_messages_builds_Messages_lazily_from_LazyList(self, mock_request):
+        mock_request.return_value = LazyList(b'[{"message_id": "foo"}, {"message_id": "bar"}]')
+
+        response = self.account.get_messages()
+
+        self.assertIsInstance(response, LazyList)
+        self.assertEqual(2, len(response))
+        self.assertIsInstance(response[1], Message)
+        self.assertEqual("bar", response[1].message_id)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_iter_messages_pages_through_messages(self, mock_request):
+        mock_request.side_effect = [
+            [{"message_id": "foo"}, {"message_id": "bar"}],
+            [{"message_id": "baz"}]
+        ]
+
+        messages = list(self.account.iter_messages(page_size=2, folder="INBOX"))
+
+        self.assertEqual(["foo", "bar", "baz"], [message.message_id for message in messages])
+        mock_request.assert_called_with(
+            "messages", params={"folder": "INBOX", "limit": 2, "offset": 2})
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_message_poller_asks_for_messages_indexed_since_the_last_poll(self, mock_request):
+        mock_request.side_effect = [
+            [{"message_id": "foo", "date_indexed": 10}, {"message_id": "bar", "date_indexed": 12}],
+            [{"message_id": "bar", "date_indexed": 12}]
+        ]
+        poller = self.account.message_poller(page_size=5, folder="INBOX")
+
+        self.assertEqual(["foo", "bar"], [message.message_id for message in poller.poll()])
+        self.assertEqual([], poller.poll())
+        mock_request.assert_called_with("messages", params={
+            "folder": "INBOX", "sort_order": "asc", "indexed_after": 11, "limit": 5,
+            "offset": 0})
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_iter_contacts_pages_through_contacts(self, mock_request):
+        mock_request.side_effect = [{"matches": [{"email": "foo@bar.com"}]}]
+
+        contacts = list(self.account.iter_contacts(page_size=2))
+
+        self.assertEqual(1, len(contacts))
+        self.assertIsInstance(contacts[0], Contact)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri", autospec=True)
+    def test_get_messages_bulk_fetches_each_distinct_message_once(self, mock_request):
+        def respond(message, uri, params, validators=None):
+            return {
+                "message_id": message.message_id, "subject": "hi", "body": [{"content": "body"}],
+                "headers": {"Subject": ["hi"]}, "flags": {"seen": True}
+            }
+
+        mock_request.side_effect = respond
+
+        messages = self.account.get_messages_bulk(["foo", "bar", "foo"], max_workers=2)
+
+        self.assertEqual(2, mock_request.call_count)
+        self.assertEqual(["foo", "bar"], [message.message_id for message in messages])
+        self.assertEqual([{"content": "body"}], messages[0].body)
+        self.assertEqual({"Subject": ["hi"]}, messages[0].headers)
+        self.assertEqual({"seen": True}, messages[1].flags)
+        mock_request.assert_any_call(
+            messages[0], "", params={"include_body": 1, "include_headers": 1, "include_flags": 1},
+            validators=None)
+
+    def test_get_messages_bulk_raises_ArgumentError_for_unknown_parts(self):
+        with self.assertRaises(ArgumentError):
+            self.account.get_messages_bulk(["foo"], include=("body", "attachments"))
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_post_message_flags_bulk_reports_failures(self, mock_request):
+        mock_request.side_effect = [
+            {"success": True, "flags": {"seen": True}},
+            RequestError(500, "boom"),
+            {"success": False},
+            {"success": True, "flags": {"seen": True}},
+        ]
+
+        report = self.account.post_message_flags_bulk(
+            ["foo", "bad", "refused", "bar", "foo"], max_workers=1, seen=1)
+
+        self.assertEqual(4, mock_request.call_count)
+        self.assertEqual(["foo", "bar"], report.succeeded)
+        self.assertIsInstance(report.failed["bad"], RequestError)
+        self.assertIs(False, report.failed["refused"])
+        mock_request.assert_called_with("flags", method="POST", params={"seen": 1})
+
+    @patch("contextio.lib.api.OAuth1Session")
+    def test_post_message_folders_bulk_posts_folders_per_message(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"success": True}
+        account = Account(Api(consumer_key="foo", consumer_secret="bar"), {"id": "fake_id"})
+
+        report = account.post_message_folders_bulk(
+            ["foo", "bar"], max_workers=1, add="Archive", remove="INBOX")
+
+        self.assertEqual(["foo", "bar"], report.succeeded)
+        self.assertEqual(2, mock_request.call_count)
+        args, kwargs = mock_request.call_args
+        self.assertEqual(
+            ("POST", "https://api.context.io/2.0/accounts/fake_id/messages/bar/folders"), args)
+        self.assertEqual("Archive", kwargs["data"]["add"])
+        self.assertEqual("INBOX", kwargs["data"]["remove"])
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_put_message_folders_bulk_puts_body_per_message(self, mock_request):
+        mock_request.return_value = {"success": True}
+        body = '[{"name": "Archive"}]'
+
+        report = self.account.put_message_folders_bulk(["foo", "bar"], body, max_workers=1)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(2, mock_request.call_count)
+        mock_request.assert_called_with("folders", method="PUT", body=body)
+
     @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
     def test_get_sources_returns_list_of_Sources(self, mock_request):
         mock_request.return_value = [{"label": "foobar"}]
@@ -98,6 +220,16 @@ class TestAccount(unittest.TestCase):
 
         self.assertIsInstance(response[0], Thread)
 
+    @patch("contextio.lib.resources.thread.Thread.get")
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_get_threads_hydrates_threads_when_asked(self, mock_request, mock_thread_get):
+        mock_request.return_value = ["threads/gm-1", "threads/gm-2"]
+
+        response = self.account.get_threads(hydrate=True, max_workers=2)
+
+        self.assertEqual(["gm-1", "gm-2"], [thread.gmail_thread_id for thread in response])
+        self.assertEqual(2, mock_thread_get.call_count)
+
     @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
     def test_get_webhooks_returns_list_of_WebHooks(self, mock_request):
         mock_request.return_value = [{"webhook_id": "foobar"}]
@@ -1,8 +1,15 @@
 from mock import Mock, patch
+import copy
+import pickle
 import unittest
 
+from contextio.lib.conditional import NOT_MODIFIED, Validators
 from contextio.lib.errors import MissingResourceId
-from contextio.lib.resources.base_resource import BaseResource
+from contextio.lib.resources.account import Account
+from contextio.lib.resources.base_resource import (
+    BaseResource, compact_class, enable_compact_resources)
+from contextio.lib.resources.message import Message
+from contextio.lib.v2_0 import V2_0
 
 
 class MockResource(BaseResource):
@@ -94,6 +101,53 @@ class TestBaseResource(unittest.TestCase):
         self.assertEqual(mock_parent, mock_resource.parent)
         self.assertEqual(True, response)
 
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_get_keeps_attributes_if_resource_was_not_modified(self, mock_request):
+        mock_request.return_value = NOT_MODIFIED
+        mock_resource = MockResource(Mock(), {"id": "fake_id", "foo": "bar"})
+
+        self.assertTrue(mock_resource.get())
+        self.assertEqual("bar", mock_resource.foo)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_get_sends_the_validators_of_the_resource(self, mock_request):
+        mock_request.return_value = {"id": "fake_id"}
+        mock_parent = Mock(conditional_requests=True)
+        first = MockResource(mock_parent, {"id": "fake_id"})
+        second = MockResource(mock_parent, {"id": "fake_id"})
+
+        first.get()
+        first.get()
+        second.get()
+
+        sent = [call[1]["validators"] for call in mock_request.call_args_list]
+        self.assertIsInstance(sent[0], Validators)
+        self.assertIs(sent[0], sent[1])
+        self.assertIsNot(sent[0], sent[2])
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_get_is_not_conditional_without_conditional_requests_or_if_return_bool_False(
+            self, mock_request):
+        mock_request.return_value = {"id": "fake_id"}
+        mock_resource = MockResource(Mock(conditional_requests=True), {"id": "fake_id"})
+        plain_resource = MockResource(Mock(), {"id": "fake_id"})
+
+        mock_resource.get(return_bool=False)
+        plain_resource.get()
+
+        self.assertIsNone(mock_request.call_args_list[0][1]["validators"])
+        self.assertIsNone(mock_request.call_args_list[1][1]["validators"])
+
+    def test_request_uri_passes_validators_to_parent(self):
+        mock_parent = Mock()
+        mock_resource = MockResource(mock_parent, {"id": "fake_id"})
+        validators = Validators()
+
+        mock_resource._request_uri("foo", validators=validators)
+
+        mock_parent._request_uri.assert_called_with(
+            "test/fake_id/foo", method="GET", params={}, headers={}, body="", validators=validators)
+
     @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
     def test_get_returns_bool_by_default(self, mock_request):
         mock_parent = Mock()
@@ -152,3 +206,120 @@ class TestBaseResource(unittest.TestCase):
 
         self.assertEqual({"success": True}, response)
 
+
+
+class TestCompactResources(unittest.TestCase):
+    def setUp(self):
+        enable_compact_resources()
+        self.parent = Mock(compact_resources=True, api_version="2.0")
+
+    def test_resources_of_compact_parents_use_slots(self):
+        resource = MockResource(self.parent, {"id": "fake_id", "foo": "bar"})
+
+        self.assertIsInstance(resource, MockResource)
+        self.assertIsInstance(resource, BaseResource)
+        self.assertIs(MockResource, resource.__class__)
+        self.assertIs(compact_class(MockResource, "2.0"), type(resource))
+        self.assertEqual("MockResource", type(resource).__name__)
+        self.assertEqual(
+            ("parent", "api_version", "base_uri", "_extra", "id", "foo", "baz"),
+            type(resource).__slots__)
+        self.assertFalse(hasattr(resource, "__dict__"))
+        self.assertEqual("bar", resource.foo)
+        self.assertIsNone(resource.baz)
+        self.assertEqual("test/fake_id", resource.base_uri)
+
+    def test_compact_resources_only_take_listed_attributes(self):
+        resource = MockResource(self.parent, {"id": "fake_id"})
+
+        with self.assertRaises(AttributeError):
+            resource.catpants = True
+
+    def test_methods_of_compact_resources_reach_their_bases(self):
+        self.parent._request_uri.return_value = {"message_id": "fake_id", "subject": "hi"}
+        message = Message(self.parent, {"message_id": "fake_id"})
+
+        self.assertTrue(message.get())
+        self.assertEqual("hi", message.subject)
+        self.parent._request_uri.assert_called_with(
+            "messages/fake_id/", method="GET", params={}, headers={}, body="", validators=None)
+
+    def test_regular_parents_get_regular_resources(self):
+        self.assertIs(MockResource, type(MockResource(Mock(), {"id": "fake_id"})))
+
+    def test_children_of_compact_resources_are_compact(self):
+        resource = MockResource(self.parent, {"id": "fake_id"})
+        child = MockResource(resource, {"id": "child_id"})
+
+        self.assertIs(type(resource), type(child))
+
+    def test_slots_follow_api_version_keys(self):
+        self.assertIn("gmail_thread_id", compact_class(Message, "2.0").__slots__)
+        self.assertIn("sent_at", compact_class(Message, "lite").__slots__)
+        self.assertNotIn("sent_at", compact_class(Message, "2.0").__slots__)
+
+    def test_class_defaults_and_extra_attributes_still_work(self):
+        message = Message(self.parent, {"message_id": "fake_id", "folders": ["INBOX"]})
+
+        self.assertIsNone(message.body)
+        self.assertEqual(["INBOX"], message.folders)
+
+        self.assertIsNone(message._extra)
+
+        message.body = [{"content": "hi"}]
+        self.assertEqual([{"content": "hi"}], message.body)
+        self.assertFalse(hasattr(message, "__dict__"))
+        self.assertNotIn("body", type(message).__slots__)
+
+    def test_compact_resources_survive_pickle_and_deepcopy(self):
+        api = V2_0(consumer_key="foo", consumer_secret="bar", compact_resources=True)
+        account = Account(api, {"id": "fake_id", "email_addresses": ["a@b.c"]})
+        message = Message(account, {"message_id": "fake_message_id", "subject": "hi"})
+        message.body = [{"content": "hi"}]
+
+        for clone in (pickle.loads(pickle.dumps(message)), copy.deepcopy(message)):
+            self.assertIs(type(message), type(clone))
+            self.assertIs(type(account), type(clone.parent))
+            self.assertEqual("hi", clone.subject)
+            self.assertIsNone(clone.date)
+            self.assertEqual([{"content": "hi"}], clone.body)
+            self.assertEqual("messages/fake_message_id", clone.base_uri)
+            self.assertEqual(["a@b.c"], clone.parent.email_addresses)
+            self.assertEqual("foo", clone.parent.parent.consumer_key)
+
+
+class LazyResource(MockResource):
+    hydrate_on_access = True
+
+
+class TestLazyResources(unittest.TestCase):
+    def setUp(self):
+        self.api = Mock(lazy_resources=True, compact_resources=False, api_version="2.0")
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_unknown_attributes_raise_without_fetching(self, mock_request):
+        resource = LazyResource(self.api, {"id": "fake_id"})
+
+        with self.assertRaises(AttributeError):
+            resource.catpants
+
+        self.assertFalse(mock_request.called)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_lazy_mode_is_inherited_from_the_api_through_parents(self, mock_request):
+        mock_request.return_value = {"id": "child_id", "foo": "bar"}
+        parent = MockResource(self.api, {"id": "fake_id"})
+        child = LazyResource(parent, {"id": "child_id"})
+
+        self.assertEqual("bar", child.foo)
+        self.assertIsNone(child.baz)
+
+    def test_lazy_compact_resources(self):
+        enable_compact_resources()
+        self.api._request_uri.return_value = {"id": "fake_id", "foo": "bar"}
+        self.api.compact_resources = True
+        resource = LazyResource(self.api, {"id": "fake_id"})
+
+        self.assertIn("__slots__", vars(type(resource)))
+        self.assertEqual("bar", resource.foo)
+        self.assertEqual(1, self.api._request_uri.call_count)
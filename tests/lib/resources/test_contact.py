@@ -1,6 +1,7 @@
 import unittest
 from mock import Mock, patch
 
+from contextio.lib.conditional import NOT_MODIFIED
 from contextio.lib.errors import MissingResourceId
 from contextio.lib.resources.contact import Contact
 from contextio.lib.resources.file import File
@@ -62,6 +63,26 @@ class TestContact(unittest.TestCase):
 
         self.assertEqual("new@email.com", self.contact.email)
 
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_get_keeps_attributes_if_contact_was_not_modified(self, mock_request):
+        mock_request.return_value = NOT_MODIFIED
+
+        self.assertTrue(self.contact.get())
+        self.assertEqual("fake@email.com", self.contact.email)
+        mock_request.assert_called_with(validators=None)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_lazy_contact_fetches_missing_attributes_once(self, mock_request):
+        mock_request.return_value = {"email": "fake@email.com", "count": 5, "name": "Fake"}
+        contact = Contact(
+            Mock(lazy_resources=True, api_version="2.0"), {"email": "fake@email.com", "name": "Fake"})
+
+        self.assertEqual("Fake", contact.name)
+        self.assertFalse(mock_request.called)
+        self.assertEqual(5, contact.count)
+        self.assertIsNone(contact.thumbnail)
+        self.assertEqual(1, mock_request.call_count)
+
     @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
     def test_get_raises_error_when_email_and_emails_is_empty_in_response(self, mock_request):
         mock_request.return_value = {}
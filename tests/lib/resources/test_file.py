@@ -1,6 +1,11 @@
 from mock import Mock, patch
+import io
+import os
+import shutil
+import tempfile
 import unittest
 
+from contextio.lib.errors import ArgumentError
 from contextio.lib.resources.file import File
 
 
@@ -54,3 +59,70 @@ class TestFile(unittest.TestCase):
         self.assertEqual(1, len(related_files))
         self.assertIsInstance(related_files[0], File)
 
+
+    def _mock_stream(self, *chunks):
+        response = Mock()
+        response.iter_content.return_value = iter(chunks)
+        return response
+
+    @patch("contextio.lib.resources.file.File._stream_uri")
+    def test_iter_content_streams_chunks_and_closes_response(self, mock_stream):
+        response = self._mock_stream(b"foo", b"", b"bar")
+        mock_stream.return_value = response
+
+        chunks = list(self.file.iter_content(chunk_size=3))
+
+        self.assertEqual([b"foo", b"bar"], chunks)
+        mock_stream.assert_called_with("content", headers={})
+        response.iter_content.assert_called_with(3)
+        response.close.assert_called_with()
+
+    @patch("contextio.lib.resources.file.File._stream_uri")
+    def test_download_writes_to_file_object(self, mock_stream):
+        mock_stream.return_value = self._mock_stream(b"foo", b"bar")
+        destination = io.BytesIO()
+
+        written = self.file.download(destination)
+
+        self.assertEqual(6, written)
+        self.assertEqual(b"foobar", destination.getvalue())
+
+    @patch("contextio.lib.resources.file.File._stream_uri")
+    def test_download_writes_to_path(self, mock_stream):
+        mock_stream.return_value = self._mock_stream(b"foo", b"bar")
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "attachment.bin")
+
+        try:
+            self.file.download(path)
+
+            with open(path, "rb") as f:
+                self.assertEqual(b"foobar", f.read())
+        finally:
+            shutil.rmtree(directory)
+
+    @patch("contextio.lib.resources.file.File._stream_uri")
+    def test_download_writes_into_buffer(self, mock_stream):
+        mock_stream.return_value = self._mock_stream(b"foo", b"bar")
+        buf = bytearray(10)
+
+        written = self.file.download(memoryview(buf))
+
+        self.assertEqual(6, written)
+        self.assertEqual(b"foobar", bytes(buf[:written]))
+
+    @patch("contextio.lib.resources.file.File._stream_uri")
+    def test_download_raises_ArgumentError_if_buffer_is_too_small(self, mock_stream):
+        response = self._mock_stream(b"foo", b"bar")
+        mock_stream.return_value = response
+
+        with self.assertRaises(ArgumentError):
+            self.file.download(bytearray(4))
+
+        response.close.assert_called_with()
+
+    @patch("contextio.lib.resources.file.File._stream_uri")
+    def test_stream_content_sends_range_header_when_offset_given(self, mock_stream):
+        self.file.stream_content(offset=1024)
+
+        mock_stream.assert_called_with("content", headers={"Range": "bytes=1024-"})
@@ -42,3 +42,12 @@ class TestFolder(unittest.TestCase):
 
         self.assertEqual(1, len(messages))
         self.assertIsInstance(messages[0], Message)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_iter_messages_pages_through_messages(self, mock_request):
+        mock_request.side_effect = [[{"message_id": "foo"}], []]
+
+        messages = list(self.folder.iter_messages(page_size=1, read_ahead=True))
+
+        self.assertEqual(1, len(messages))
+        self.assertIsInstance(messages[0], Message)
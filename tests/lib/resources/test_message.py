@@ -1,8 +1,12 @@
+import pickle
 import unittest
 from mock import Mock, patch
 
+from contextio.lib.api import Api
+from contextio.lib.resources.account import Account
 from contextio.lib.resources.message import Message
 from contextio.lib.resources.thread import Thread
+from contextio.lib.v2_0 import V2_0
 
 
 class TestMessage(unittest.TestCase):
@@ -128,17 +132,45 @@ class TestMessage(unittest.TestCase):
         self.assertEqual([{"foo": "bar"}], self.message.folders)
         self.assertEqual([{"foo": "bar"}], response)
 
-    @patch("contextio.lib.resources.base_resource.BaseResource.post")
-    def test_post_folder_calls_request_uri_with_correct_args(self, mock_request):
-        params = {"add": "catpants", "remove": "dogpants"}
-        mock_request.return_value = {"success": True}
-
-        response = self.message.post_folder(**params)
-
-        mock_request.assert_called_with("folders", params=params)
-
+    @patch("contextio.lib.api.OAuth1Session")
+    def test_post_folder_sends_add_and_remove(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"success": True}
+        account = Account(Api(consumer_key="foo", consumer_secret="bar"), {"id": "fake_id"})
+        message = Message(account, {"message_id": "fake_message_id"})
+
+        response = message.post_folder(add="catpants", remove="dogpants")
+
+        args, kwargs = mock_request.call_args
+        self.assertEqual(
+            ("POST", "https://api.context.io/2.0/accounts/fake_id/messages/fake_message_id/folders"),
+            args)
+        self.assertEqual("catpants", kwargs["data"]["add"])
+        self.assertEqual("dogpants", kwargs["data"]["remove"])
         self.assertTrue(response)
 
+    @patch("contextio.lib.api.OAuth1Session")
+    def test_get_of_a_new_message_is_never_conditional(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.headers = {"ETag": '"v1"'}
+        mock_request.return_value.json.return_value = {
+            "message_id": "fake_message_id", "subject": "hi"}
+        api = Api(consumer_key="foo", consumer_secret="bar", conditional_requests=True)
+        account = Account(api, {"id": "fake_id"})
+        Message(account, {"message_id": "fake_message_id"}).get()
+
+        message = Message(account, {"message_id": "fake_message_id"})
+        message.get()
+        self.assertNotIn("If-None-Match", mock_request.call_args[1]["headers"])
+        self.assertEqual("hi", message.subject)
+
+        mock_request.return_value.status_code = 304
+        self.assertTrue(message.get())
+        self.assertEqual('"v1"', mock_request.call_args[1]["headers"]["If-None-Match"])
+        self.assertEqual("hi", message.subject)
+
     @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
     def test_put_folders_calls_request_uri_with_correct_args(self, mock_request):
         body = "catpants"
@@ -241,5 +273,13 @@ class TestMessage(unittest.TestCase):
 
         self.assertEqual("catpants", message.thread.subject)
 
+    def test_message_of_a_real_client_can_be_pickled(self):
+        account = Account(V2_0(consumer_key="foo", consumer_secret="bar"), {"id": "fake_id"})
+        message = Message(account, {"message_id": "fake_message_id", "subject": "hi"})
 
+        copy = pickle.loads(pickle.dumps(message))
 
+        self.assertEqual("fake_message_id", copy.message_id)
+        self.assertEqual("hi", copy.subject)
+        self.assertEqual("fake_id", copy.parent.id)
+        self.assertEqual("foo", copy.parent.parent.consumer_key)
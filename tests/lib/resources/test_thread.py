@@ -1,5 +1,6 @@
+import threading
 import unittest
-from mock import Mock
+from mock import Mock, patch
 
 from contextio.lib.resources.message import Message
 from contextio.lib.resources.thread import Thread
@@ -42,3 +43,74 @@ class TestThread(unittest.TestCase):
 
         self.assertIsInstance(thread.sources[0], Source)
         self.assertIsInstance(thread.sources[1], Source)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_get_populates_thread_and_keeps_thread_id(self, mock_request):
+        mock_request.return_value = {
+            "gmail_thread_id": "1234", "subject": "hello", "messages": [{"message_id": "foo"}]}
+
+        response = self.thread.get(include_body=1)
+
+        self.assertTrue(response)
+        self.assertEqual("hello", self.thread.subject)
+        self.assertEqual("foobar", self.thread.gmail_thread_id)
+        self.assertIsInstance(self.thread.messages[0], Message)
+        mock_request.assert_called_with(params={"include_body": 1})
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_lazy_stub_fetches_once_on_first_attribute_access(self, mock_request):
+        mock_request.return_value = {"gmail_thread_id": "foobar", "subject": "hello"}
+        thread = Thread(Mock(lazy_resources=True, api_version="2.0"), {"gmail_thread_id": "foobar"})
+
+        self.assertFalse(mock_request.called)
+        self.assertEqual("hello", thread.subject)
+        self.assertIsNone(thread.folders)
+        self.assertEqual(1, mock_request.call_count)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_lazy_stub_fetches_once_across_threads(self, mock_request):
+        started = threading.Event()
+
+        def respond(*args, **kwargs):
+            started.wait(1)
+            return {"gmail_thread_id": "foobar", "subject": "hello"}
+
+        mock_request.side_effect = respond
+        thread = Thread(Mock(lazy_resources=True, api_version="2.0"), {"gmail_thread_id": "foobar"})
+        subjects = []
+        readers = [
+            threading.Thread(target=lambda: subjects.append(thread.subject)) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        started.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(["hello"] * 8, subjects)
+        self.assertEqual(1, mock_request.call_count)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_lazy_stub_retries_after_failed_fetch(self, mock_request):
+        mock_request.side_effect = [Exception("down"), {"gmail_thread_id": "foobar", "subject": "hi"}]
+        thread = Thread(Mock(lazy_resources=True, api_version="2.0"), {"gmail_thread_id": "foobar"})
+
+        with self.assertRaises(Exception):
+            thread.subject
+
+        self.assertEqual("hi", thread.subject)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_stubs_are_not_lazy_by_default(self, mock_request):
+        self.assertIsNone(self.thread.subject)
+        self.assertFalse(mock_request.called)
+
+    @patch("contextio.lib.resources.base_resource.BaseResource._request_uri")
+    def test_hydrate_populates_all_threads_in_order(self, mock_request):
+        mock_request.side_effect = lambda params: {"subject": "subject"}
+        threads = [Thread(Mock(spec=["foo"]), {"gmail_thread_id": str(i)}) for i in range(10)]
+
+        hydrated = Thread.hydrate(threads, max_workers=4)
+
+        self.assertEqual([str(i) for i in range(10)], [t.gmail_thread_id for t in hydrated])
+        self.assertEqual(["subject"] * 10, [t.subject for t in hydrated])
+        self.assertEqual(10, mock_request.call_count)
@@ -1,10 +1,14 @@
 import json
 import mock
+import threading
 import unittest
 from rauth import OAuth1Session
 
-from contextio.lib.api import Api
+from contextio.lib.api import Api, get_lib_version
+from contextio.lib.conditional import NOT_MODIFIED, Validators
+from contextio.lib.decoding import LazyList
 from contextio.lib.errors import RequestError
+from contextio.lib.transport import Transport
 
 
 class TestApi(unittest.TestCase):
@@ -38,6 +42,58 @@ class TestApi(unittest.TestCase):
         self.assertEqual("lite", self.api.api_version)
         self.assertEqual("print", self.api.debug)
 
+    def test_constructor_builds_transport_from_keyword_arguments(self):
+        self.api = Api(
+            consumer_key="foo",
+            consumer_secret="bar",
+            pool_maxsize=64,
+            connect_timeout=2,
+            read_timeout=10
+        )
+
+        self.assertIsInstance(self.api.transport, Transport)
+        self.assertEqual(64, self.api.transport.pool_maxsize)
+        self.assertEqual((2, 10), self.api.transport.timeout)
+        self.assertEqual(64, self.api.session.adapters["https://"]._pool_maxsize)
+
+    def test_constructor_uses_custom_transport(self):
+        transport = mock.Mock()
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", transport=transport)
+
+        self.assertEqual(transport, self.api.transport)
+        transport.mount.assert_called_with(self.api.session)
+
+    def test_session_is_shared_by_threads_by_default(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(self.api._session()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.api.session, sessions[0])
+
+    def test_thread_safe_gives_other_threads_their_own_session(self):
+        self.api = Api(consumer_key="foo", consumer_secret="bar", thread_safe=True)
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(self.api._session()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.api.session, self.api._session())
+        self.assertIsNot(self.api.session, sessions[0])
+        self.assertIs(self.api.session.adapters["https://"], sessions[0].adapters["https://"])
+
+    def test_post_does_not_modify_the_callers_params(self):
+        self.api.session = mock.Mock()
+        self.api.session.request.return_value = mock.Mock(status_code=200, headers={})
+        params = {"seen": 1}
+
+        self.api._request_uri("accounts/1/messages/2/flags", method="POST", params=params)
+
+        self.assertEqual({"seen": 1}, params)
+        self.assertEqual(
+            {"seen": 1, "body": ""}, self.api.session.request.call_args[1]["data"])
+
     def test_constructor_maps_True_to_print_for_debug_value(self):
         self.api = Api(
             consumer_key="foo",
@@ -49,49 +105,37 @@ class TestApi(unittest.TestCase):
         self.assertEqual("bar", self.api.consumer_secret)
         self.assertEqual("print", self.api.debug)
 
-    @mock.patch("contextio.lib.api.six.print_")
+    @mock.patch("contextio.lib.debug.six.print_")
     def test_debug_prints_message_when_debug_equals_print(self, mock_six_print):
         self.api = Api(consumer_key="foo", consumer_secret="bar", debug="print")
-        mock_response = mock.Mock()
+        mock_response = mock.Mock(status_code=404, headers={}, _content=b"not found")
         mock_response.request.url = "fake_url"
         mock_response.request.method = "GET"
-        mock_response.status_code = 404
-
-        message = (
-            "--------------------------------------------------\n"
-            "URL:    {0}\nMETHOD: {1}\nSTATUS: 2\n\nREQUEST\n{3}\n\nRESPON"
-            "SE\n{4}\n").format(
-                mock_response.request.url, mock_response.request.method, mock_response.status_code,
-                mock_response.request.__dict__, mock_response.__dict__)
 
         self.api._debug(mock_response)
 
-        mock_six_print.assert_called_with(message)
+        message = mock_six_print.call_args[0][0]
+        self.assertIn("URL:    fake_url\nMETHOD: GET\nSTATUS: 404", message)
+        self.assertIn("RESPONSE BODY\nnot found", message)
 
-    @mock.patch("contextio.lib.api.logging.debug")
-    def test_debug_logs_message_when_debug_equals_log(self, mock_logging_debug):
+    @mock.patch("contextio.lib.debug.logger")
+    def test_debug_logs_message_when_debug_equals_log(self, mock_logger):
         self.api = Api(consumer_key="foo", consumer_secret="bar", debug="log")
-        mock_response = mock.Mock()
+        mock_logger.isEnabledFor.return_value = True
+        mock_response = mock.Mock(status_code=200)
         mock_response.request.url = "fake_url"
         mock_response.request.method = "GET"
-        mock_response.status_code = 404
-        message = (
-            "--------------------------------------------------\n"
-            "URL:    {0}\nMETHOD: {1}\nSTATUS: 2\n\nREQUEST\n{3}\n\nRESPON"
-            "SE\n{4}\n").format(
-                mock_response.request.url, mock_response.request.method, mock_response.status_code,
-                mock_response.request.__dict__, mock_response.__dict__)
 
         self.api._debug(mock_response)
 
-        mock_logging_debug.assert_called_with(message)
+        description = mock_logger.debug.call_args[0][1]
+        self.assertIs(mock_response, description.response)
+        self.assertIn("URL:    fake_url", str(description))
 
-    @mock.patch("contextio.lib.api.pkg_resources")
+    @mock.patch("contextio.lib.api.get_lib_version")
     @mock.patch("contextio.lib.api.OAuth1Session")
-    def test_request_defaults_to_GET_method_and_include_user_agent_header(self, mock_session, mock_pkg_resources):
-        mock_package = mock.Mock()
-        mock_package.version = "v1.0.0"
-        mock_pkg_resources.require.return_value = [mock_package]
+    def test_request_defaults_to_GET_method_and_include_user_agent_header(self, mock_session, mock_get_lib_version):
+        mock_get_lib_version.return_value = "v1.0.0"
 
         mock_session.return_value.request = mock.Mock()
         mock_request = mock_session.return_value.request
@@ -149,12 +193,10 @@ class TestApi(unittest.TestCase):
 
         self.assertEqual({"foo": "bar"}, response)
 
-    @mock.patch("contextio.lib.api.pkg_resources")
+    @mock.patch("contextio.lib.api.get_lib_version")
     @mock.patch("contextio.lib.api.OAuth1Session")
-    def test_request_includes_body_if_method_is_POST(self, mock_session, mock_pkg_resources):
-        mock_package = mock.Mock()
-        mock_package.version = "v1.0.0"
-        mock_pkg_resources.require.return_value = [mock_package]
+    def test_request_includes_body_if_method_is_POST(self, mock_session, mock_get_lib_version):
+        mock_get_lib_version.return_value = "v1.0.0"
 
         mock_request = mock_session.return_value.request
         mock_request.return_value.status_code = 200
@@ -169,3 +211,230 @@ class TestApi(unittest.TestCase):
             header_auth=True,
             headers={'user-agent': 'contextio/some_version/python-lib-v1.0.0'}
         )
+
+    @mock.patch("contextio.lib.api.get_lib_version")
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_merges_headers_without_mutating_arguments(self, mock_session, mock_get_lib_version):
+        mock_get_lib_version.return_value = "v1.0.0"
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        headers = {"Accept": "text/uri-list"}
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar")
+        self.api._request_uri("catpants", params={}, headers=headers)
+
+        self.assertEqual({"Accept": "text/uri-list"}, headers)
+        self.assertEqual({"user-agent": "contextio/2.0/python-lib-v1.0.0"}, self.api.default_headers)
+        mock_request.assert_called_with(
+            "GET", "https://api.context.io/2.0/catpants",
+            data="",
+            header_auth=True,
+            headers={"user-agent": "contextio/2.0/python-lib-v1.0.0", "Accept": "text/uri-list"},
+            params={}
+        )
+
+    def test_get_lib_version_is_only_looked_up_once(self):
+        with mock.patch("contextio.lib.api._lib_version", None):
+            with mock.patch("importlib.metadata.version") as mock_version:
+                mock_version.return_value = "v1.0.0"
+
+                self.assertEqual("v1.0.0", get_lib_version())
+                self.assertEqual("v1.0.0", get_lib_version())
+
+        mock_version.assert_called_once_with("contextio")
+
+    def test_get_lib_version_returns_dev_if_package_is_not_installed(self):
+        with mock.patch("contextio.lib.api._lib_version", None):
+            with mock.patch("importlib.metadata.version") as mock_version:
+                mock_version.side_effect = Exception
+
+                self.assertEqual("dev", get_lib_version())
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_stream_uri_returns_unread_streaming_response(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar")
+        response = self.api._stream_uri("accounts/foo/files/bar/content")
+
+        self.assertEqual(mock_request.return_value, response)
+        self.assertFalse(response.json.called)
+        self.assertTrue(mock_request.call_args[1]["stream"])
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_stream_uri_raises_RequestError_and_closes_response_on_error(self, mock_session):
+        mock_response = mock_session.return_value.request.return_value
+        mock_response.status_code = 404
+        mock_response.text = "not found"
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar")
+
+        with self.assertRaises(RequestError):
+            self.api._stream_uri("accounts/foo/files/bar/content")
+
+        mock_response.close.assert_called_with()
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_serves_cached_GET_responses(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = [{"name": "INBOX"}]
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", cache=True)
+        first = self.api._request_uri("accounts/1/folders", params={})
+        first[0]["name"] = "changed by a resource"
+        second = self.api._request_uri("accounts/1/folders", params={})
+
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual([{"name": "INBOX"}], second)
+        self.assertEqual(1, self.api.cache.hits)
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_invalidates_cache_on_write(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = [{"name": "INBOX"}]
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", cache=True)
+        self.api._request_uri("accounts/1/folders", params={})
+        self.api._request_uri("accounts/1/folders/Archive", method="PUT", params={})
+        self.api._request_uri("accounts/1/folders", params={})
+
+        self.assertEqual(3, mock_request.call_count)
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_keeps_cache_if_write_fails(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = [{"name": "INBOX"}]
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", cache=True)
+        self.api._request_uri("accounts/1/folders", params={})
+
+        mock_request.return_value.status_code = 500
+        with self.assertRaises(RequestError):
+            self.api._request_uri("accounts/1/folders/Archive", method="PUT", params={})
+
+        self.assertEqual(0, self.api.cache.invalidations)
+        self.assertEqual(1, len(self.api.cache.backend))
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_does_not_cache_by_default(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar")
+        self.api._request_uri("accounts/1/folders", params={})
+        self.api._request_uri("accounts/1/folders", params={})
+
+        self.assertIsNone(self.api.cache)
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_sends_validators_and_returns_NOT_MODIFIED_on_304(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.headers = {"ETag": '"v1"', "Last-Modified": "Tue, 01 Sep 2015 00:00:00 GMT"}
+        mock_request.return_value.json.return_value = {"name": "INBOX"}
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", conditional_requests=True)
+        validators = Validators()
+        self.assertEqual({"name": "INBOX"}, self.api._request_uri(
+            "accounts/1/folders/INBOX", params={}, validators=validators))
+        self.assertNotIn("If-None-Match", mock_request.call_args[1]["headers"])
+
+        mock_request.return_value.status_code = 304
+        response = self.api._request_uri("accounts/1/folders/INBOX", params={}, validators=validators)
+
+        self.assertIs(NOT_MODIFIED, response)
+        headers = mock_request.call_args[1]["headers"]
+        self.assertEqual('"v1"', headers["If-None-Match"])
+        self.assertEqual("Tue, 01 Sep 2015 00:00:00 GMT", headers["If-Modified-Since"])
+        self.assertNotIn("If-None-Match", self.api.default_headers)
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_is_not_conditional_unless_asked(self, mock_session):
+        mock_request = mock_session.return_value.request
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.headers = {"ETag": '"v1"'}
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", conditional_requests=True)
+        self.api._request_uri("accounts/1/folders", params={}, validators=Validators())
+        self.api._request_uri("accounts/1/folders", params={})
+
+        self.assertNotIn("If-None-Match", mock_request.call_args[1]["headers"])
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_retries_through_retry_engine(self, mock_session):
+        first, second = mock.Mock(status_code=503), mock.Mock(status_code=200)
+        second.json.return_value = {"success": True}
+        mock_session.return_value.request.side_effect = [first, second]
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", retry=True)
+        self.api.retry.sleep = mock.Mock()
+
+        self.assertEqual({"success": True}, self.api._request_uri("accounts/1", params={}))
+        self.assertEqual(1, self.api.retry.stats()["retries"])
+        first.close.assert_called_with()
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_uses_configured_json_decoder(self, mock_session):
+        mock_response = mock_session.return_value.request.return_value
+        mock_response.status_code = 200
+        mock_response.content = b'{"foo": "bar"}'
+        loads = mock.Mock(return_value={"foo": "bar"})
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", json_decoder=loads)
+
+        self.assertEqual({"foo": "bar"}, self.api._request_uri("catpants", params={}))
+        loads.assert_called_with(b'{"foo": "bar"}')
+        self.assertFalse(mock_response.json.called)
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_returns_LazyList_for_arrays_if_lazy_lists(self, mock_session):
+        mock_response = mock_session.return_value.request.return_value
+        mock_response.status_code = 200
+        mock_response.content = b'[{"message_id": "a"}, {"message_id": "b"}]'
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", lazy_lists=True)
+        response = self.api._request_uri("accounts/1/messages", params={})
+
+        self.assertIsInstance(response, LazyList)
+        self.assertEqual({"message_id": "b"}, response[1])
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_request_uri_runs_hooks_for_every_attempt(self, mock_session):
+        first, second = mock.Mock(status_code=503), mock.Mock(status_code=200)
+        second.json.return_value = {"success": True}
+        mock_session.return_value.request.side_effect = [first, second]
+        before, after = mock.Mock(), mock.Mock()
+
+        self.api = Api(
+            consumer_key="foo", consumer_secret="bar", retry=True,
+            hooks={"before_request": before, "after_response": [after]})
+        self.api.retry.sleep = mock.Mock()
+        self.api._request_uri("accounts/1", params={})
+
+        self.assertEqual([0, 1], [call[0][0].attempt for call in before.call_args_list])
+        self.assertEqual([first, second], [call[0][1] for call in after.call_args_list])
+        self.assertEqual("accounts/{id}", after.call_args[0][0].endpoint)
+
+    def test_constructor_has_no_hooks_by_default(self):
+        self.assertIsNone(self.api.hooks)
+        self.assertIsNone(self.api.metrics)
+
+    @mock.patch("contextio.lib.api.OAuth1Session")
+    def test_metrics_record_requests(self, mock_session):
+        mock_response = mock_session.return_value.request.return_value
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Length": "14"}
+        mock_response.json.return_value = {"foo": "bar"}
+
+        self.api = Api(consumer_key="foo", consumer_secret="bar", metrics=True)
+        self.api._request_uri("accounts/1/messages", params={})
+
+        stats = self.api.metrics.snapshot()[("GET", "accounts/{id}/messages")]
+        self.assertEqual(1, stats["count"])
+        self.assertEqual({200: 1}, stats["statuses"])
+        self.assertEqual(14, stats["bytes_received"])
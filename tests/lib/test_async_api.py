@@ -0,0 +1,244 @@
+import asyncio
+import json
+import unittest
+
+from contextio.lib.async_api import AsyncContextIO, AsyncResource
+from contextio.lib.cache import ResponseCache
+from contextio.lib.errors import ArgumentError, RequestError
+from contextio.lib.resources.account import Account
+from contextio.lib.resources.file import File
+from contextio.lib.resources.message import Message
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncContextIO(unittest.TestCase):
+    def setUp(self):
+        self.client = AsyncContextIO(consumer_key="foo", consumer_secret="bar")
+        self.sent = []
+        self.responses = []
+
+        async def fake_send(prepared):
+            self.sent.append(prepared)
+            status, body = self.responses.pop(0)
+            return status, json.dumps(body).encode("utf-8")
+
+        self.client.__dict__["_send"] = fake_send
+
+    def test_constructor_builds_api_for_requested_version(self):
+        lite = AsyncContextIO(consumer_key="foo", consumer_secret="bar", api_version="lite")
+
+        self.assertEqual("2.0", self.client.api.api_version)
+        self.assertEqual("lite", lite.api.api_version)
+
+    def test_api_methods_return_wrapped_resources(self):
+        self.responses.append((200, [{"id": "fake_id"}]))
+
+        accounts = run(self.client.get_accounts(limit=1))
+
+        self.assertEqual(1, len(accounts))
+        self.assertIsInstance(accounts[0], AsyncResource)
+        self.assertIsInstance(accounts[0].target, Account)
+        self.assertEqual("fake_id", accounts[0].id)
+
+    def test_requests_are_signed_with_oauth_header(self):
+        self.responses.append((200, [{"id": "fake_id"}]))
+
+        run(self.client.get_accounts(limit=1))
+
+        prepared = self.sent[0]
+        self.assertEqual("GET", prepared.method)
+        self.assertEqual("https://api.context.io/2.0/accounts?limit=1", prepared.url)
+        self.assertIn("oauth_signature", prepared.headers["Authorization"])
+        self.assertIn("python-lib", prepared.headers["user-agent"])
+
+    def test_resource_methods_are_awaitable(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+        self.responses.append((200, [{"message_id": "fake_message_id"}]))
+        self.responses.append((200, [{"type": "text/plain", "content": "hello"}]))
+
+        messages = run(account.get_messages(limit=1))
+        body = run(messages[0].get_body())
+
+        self.assertIsInstance(messages[0].target, Message)
+        self.assertEqual([{"type": "text/plain", "content": "hello"}], body)
+        self.assertEqual(body, messages[0].body)
+        self.assertTrue(
+            self.sent[1].url.startswith(
+                "https://api.context.io/2.0/accounts/fake_id/messages/fake_message_id/body"))
+
+    def test_error_status_raises_RequestError(self):
+        self.responses.append((404, {"type": "error"}))
+
+        with self.assertRaises(RequestError):
+            run(self.client.get_accounts())
+
+    def test_many_calls_can_be_in_flight_at_once(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+        in_flight = []
+        peak = []
+
+        async def slow_send(prepared):
+            in_flight.append(prepared)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return 200, b'{"seen": true}'
+
+        self.client.__dict__["_send"] = slow_send
+
+        async def fetch_all():
+            messages = [
+                self.client.wrap(Message(account.target, {"message_id": str(i)}))
+                for i in range(50)
+            ]
+            return await asyncio.gather(*[message.get_flags() for message in messages])
+
+        flags = run(fetch_all())
+
+        self.assertEqual(50, len(flags))
+        self.assertEqual(50, max(peak))
+
+    def test_calling_resource_outside_of_client_raises(self):
+        account = Account(self.client.api, {"id": "fake_id"})
+
+        with self.assertRaises(RuntimeError):
+            account.get_messages()
+
+    def route(self, answers):
+        """Answers requests by path, keeps the sent requests in self.sent."""
+        async def fake_send(prepared):
+            self.sent.append(prepared)
+            path = prepared.url.split("/2.0/", 1)[1].split("?", 1)[0].rstrip("/")
+            status, body = answers[path]
+            return status, json.dumps(body).encode("utf-8")
+
+        self.client.__dict__["_send"] = fake_send
+
+    def test_get_messages_bulk_sends_requests_concurrently(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+        in_flight = []
+        peak = []
+
+        async def slow_send(prepared):
+            in_flight.append(prepared)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            message_id = prepared.url.split("/messages/", 1)[1].split("?", 1)[0].rstrip("/")
+            body = {"message_id": message_id, "subject": message_id}
+            return 200, json.dumps(body).encode("utf-8")
+
+        self.client.__dict__["_send"] = slow_send
+
+        messages = run(account.get_messages_bulk([str(i) for i in range(20)], include=()))
+
+        self.assertEqual([str(i) for i in range(20)], [message.subject for message in messages])
+        self.assertIsInstance(messages[0], AsyncResource)
+        self.assertEqual(20, max(peak))
+
+    def test_get_threads_hydrates_threads(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+        self.route({
+            "accounts/fake_id/threads": (200, ["/2.0/accounts/fake_id/threads/a",
+                                               "/2.0/accounts/fake_id/threads/b"]),
+            "accounts/fake_id/threads/a": (200, {"gmail_thread_id": "a", "messages": []}),
+            "accounts/fake_id/threads/b": (200, {"gmail_thread_id": "b", "messages": []}),
+        })
+
+        threads = run(account.get_threads(hydrate=True))
+
+        self.assertEqual(["a", "b"], [thread.gmail_thread_id for thread in threads])
+        self.assertEqual([], threads[1].messages)
+        self.assertEqual(3, len(self.sent))
+
+    def test_post_message_flags_bulk_reports_each_failure(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+        self.route({
+            "accounts/fake_id/messages/foo/flags": (
+                200, {"success": True, "flags": {"seen": True}}),
+            "accounts/fake_id/messages/bad/flags": (404, {"type": "error"}),
+        })
+
+        report = run(account.post_message_flags_bulk(["foo", "bad"], seen=1))
+
+        self.assertEqual(["foo"], report.succeeded)
+        self.assertIsInstance(report.failed["bad"], RequestError)
+        self.assertEqual(2, len(self.sent))
+
+    def test_post_message_folders_bulk_sends_add_and_remove(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+        self.route({"accounts/fake_id/messages/foo/folders": (200, {"success": True})})
+
+        report = run(account.post_message_folders_bulk(["foo"], add="Archive"))
+
+        self.assertEqual(["foo"], report.succeeded)
+        self.assertIn("add=Archive", self.sent[0].body)
+
+    def test_bulk_rate_is_rejected(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+
+        with self.assertRaises(ArgumentError):
+            run(account.post_message_flags_bulk(["foo"], rate=10, seen=1))
+
+    def test_downloads_are_rejected_without_blocking_requests(self):
+        account = Account(self.client.api, {"id": "fake_id"})
+        attachment = self.client.wrap(File(account, {"file_id": "fake_file_id"}))
+
+        with self.assertRaises(NotImplementedError):
+            run(attachment.download("/tmp/never-written"))
+        with self.assertRaises(TypeError):
+            run(attachment.iter_content())
+        self.assertEqual([], self.sent)
+
+    def test_generators_are_rejected_when_called(self):
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+
+        with self.assertRaises(TypeError):
+            run(account.iter_messages())
+        self.assertEqual([], self.sent)
+
+    def test_fan_out_is_rejected(self):
+        with self.assertRaises(NotImplementedError):
+            run(self.client.fan_out(lambda account: None))
+
+    def test_unsupported_options_are_rejected(self):
+        with self.assertRaises(ArgumentError):
+            AsyncContextIO(consumer_key="foo", consumer_secret="bar", retry=True)
+
+    def test_json_decoder_and_lazy_lists_are_honored(self):
+        decoded = []
+
+        def decoder(content):
+            decoded.append(content)
+            return json.loads(content)
+
+        self.client = AsyncContextIO(
+            consumer_key="foo", consumer_secret="bar", json_decoder=decoder, lazy_lists=True)
+        account = self.client.wrap(Account(self.client.api, {"id": "fake_id"}))
+        self.route({
+            "accounts/fake_id": (200, {"id": "fake_id", "username": "foo"}),
+            "accounts/fake_id/email_addresses": (200, [{"email": "foo@bar.com"}]),
+        })
+
+        run(account.get())
+        addresses = run(account.get_email_addresses())
+
+        self.assertEqual("foo", account.username)
+        self.assertEqual("foo@bar.com", addresses[0].email)
+        # the list was split up front, then its element decoded on its own
+        self.assertEqual([b'{"email": "foo@bar.com"}'], [c.strip() for c in decoded[1:]])
+
+    def test_responses_are_cached(self):
+        client = AsyncContextIO(consumer_key="foo", consumer_secret="bar", cache=ResponseCache())
+        account = client.wrap(Account(client.api, {"id": "fake_id"}))
+        self.route({"accounts/fake_id/email_addresses": (200, [{"email": "foo@bar.com"}])})
+        client.__dict__["_send"] = self.client._send
+
+        run(account.get_email_addresses())
+        addresses = run(account.get_email_addresses())
+
+        self.assertEqual("foo@bar.com", addresses[0].email)
+        self.assertEqual(1, len(self.sent))
@@ -0,0 +1,59 @@
+import threading
+import unittest
+
+from mock import patch
+
+from contextio.lib.batch import run_batch
+from contextio.lib.errors import RequestError
+
+
+class TestRunBatch(unittest.TestCase):
+    def test_collects_successes_and_failures_in_order(self):
+        def work(message_id):
+            if message_id == "bad":
+                raise RequestError(500, "boom")
+            return message_id != "refused"
+
+        report = run_batch(work, ["a", "bad", "refused", "b"], max_workers=2)
+
+        self.assertEqual(["a", "b"], report.succeeded)
+        self.assertEqual(["bad", "refused"], sorted(report.failed))
+        self.assertIsInstance(report.failed["bad"], RequestError)
+        self.assertIs(False, report.failed["refused"])
+        self.assertFalse(report.ok)
+        self.assertEqual(4, len(report))
+
+    def test_sends_duplicates_once(self):
+        calls = []
+        lock = threading.Lock()
+
+        def work(message_id):
+            with lock:
+                calls.append(message_id)
+            return True
+
+        report = run_batch(work, ["a", "b", "a"], max_workers=4)
+
+        self.assertEqual(["a", "b"], sorted(calls))
+        self.assertEqual(["a", "b"], report.succeeded)
+        self.assertTrue(report.ok)
+
+    @patch("contextio.lib.batch.time.sleep")
+    def test_rate_limits_requests(self, mock_sleep):
+        report = run_batch(lambda message_id: True, ["a", "b", "c"], max_workers=1, rate=1)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertTrue(all(call[0][0] > 0 for call in mock_sleep.call_args_list))
+
+    @patch("contextio.lib.batch.time.sleep")
+    def test_does_not_wait_without_rate(self, mock_sleep):
+        run_batch(lambda message_id: True, ["a", "b", "c"], max_workers=1)
+
+        self.assertFalse(mock_sleep.called)
+
+    def test_empty_batch(self):
+        report = run_batch(lambda message_id: True, [])
+
+        self.assertEqual(0, len(report))
+        self.assertIn("succeeded=0", repr(report))
@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import unittest
+from mock import patch
+
+from contextio.lib.cache import DiskCache, MemoryCache, ResponseCache
+from contextio.lib.decoding import LazyList
+
+URL = "https://api.context.io/2.0/accounts/1"
+
+
+class TestMemoryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = MemoryCache(max_bytes=10)
+
+    def test_get_returns_what_was_set(self):
+        self.cache.set("a", b"123", 60)
+
+        self.assertEqual(b"123", self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+
+    def test_entries_expire(self):
+        with patch("contextio.lib.cache.time.time", return_value=1000):
+            self.cache.set("a", b"123", 60)
+
+        with patch("contextio.lib.cache.time.time", return_value=1061):
+            self.assertIsNone(self.cache.get("a"))
+
+        self.assertEqual(0, self.cache.size)
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        self.cache.set("a", b"1234", 60)
+        self.cache.set("b", b"1234", 60)
+        self.cache.get("a")
+        self.cache.set("c", b"1234", 60)
+
+        self.assertEqual(["a", "c"], self.cache.keys())
+        self.assertEqual(8, self.cache.size)
+
+    def test_entries_larger_than_the_cache_are_not_stored(self):
+        self.cache.set("a", b"x" * 11, 60)
+
+        self.assertEqual(0, len(self.cache))
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_entries_survive_a_new_instance(self):
+        DiskCache(self.directory).set("a", b"123", 60)
+
+        cache = DiskCache(self.directory)
+
+        self.assertEqual(b"123", cache.get("a"))
+        self.assertEqual(3, cache.size)
+
+    def test_files_hold_a_json_header_and_the_data(self):
+        cache = DiskCache(self.directory)
+        cache.set("a", b"123", 60)
+
+        with open(cache.path_for("a"), "rb") as f:
+            self.assertEqual(b'["a", ', f.read(6))
+            self.assertEqual(b"\n123", f.read()[-4:])
+
+    def test_unreadable_files_are_removed(self):
+        path = os.path.join(self.directory, "junk.cache")
+        with open(path, "wb") as f:
+            f.write(b"\x80\x04not json")
+
+        cache = DiskCache(self.directory)
+
+        self.assertEqual(0, len(cache))
+        self.assertFalse(os.path.exists(path))
+
+    def test_delete_removes_the_file(self):
+        cache = DiskCache(self.directory)
+        cache.set("a", b"123", 60)
+        cache.delete("a")
+
+        self.assertIsNone(DiskCache(self.directory).get("a"))
+
+    def test_size_is_bounded(self):
+        cache = DiskCache(self.directory, max_bytes=5)
+        cache.set("a", b"123", 60)
+        cache.set("b", b"456", 60)
+
+        self.assertEqual(["b"], DiskCache(self.directory, max_bytes=5).keys())
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+
+    def test_ttl_for_matches_lists_and_single_resources(self):
+        self.assertEqual(300, self.cache.ttl_for(URL + "/folders"))
+        self.assertEqual(300, self.cache.ttl_for(URL + "/contacts/jane@example.com"))
+        self.assertEqual(3600, self.cache.ttl_for("https://api.context.io/2.0/oauth_providers"))
+        self.assertEqual(0, self.cache.ttl_for(URL + "/contacts/jane@example.com/messages"))
+        self.assertEqual(0, self.cache.ttl_for(URL + "/messages"))
+
+    def test_custom_ttls(self):
+        cache = ResponseCache(ttls={"folders": 0, "messages": 30})
+
+        self.assertEqual(0, cache.ttl_for(URL + "/folders"))
+        self.assertEqual(30, cache.ttl_for(URL + "/messages"))
+        self.assertEqual(300, cache.ttl_for(URL + "/sources"))
+
+    def test_key_ignores_param_order(self):
+        self.assertEqual(
+            ResponseCache.key("k", URL, {"a": 1, "b": 2}),
+            ResponseCache.key("k", URL, {"b": 2, "a": 1}))
+        self.assertNotEqual(
+            ResponseCache.key("k", URL, {"a": 1}), ResponseCache.key("other", URL, {"a": 1}))
+
+    def test_counts_hits_and_misses(self):
+        self.assertIsNone(self.cache.get("k", URL + "/folders", {}))
+        self.cache.set("k", URL + "/folders", {}, [{"name": "INBOX"}])
+
+        self.assertEqual([{"name": "INBOX"}], self.cache.get("k", URL + "/folders", {}))
+        self.assertEqual(1, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+
+    def test_lazy_lists_are_stored_as_lists(self):
+        self.cache.set("k", URL + "/folders", {}, LazyList(b'[{"name": "INBOX"}]'))
+
+        self.assertEqual([{"name": "INBOX"}], self.cache.get("k", URL + "/folders", {}))
+
+    def test_responses_that_are_not_json_are_not_stored(self):
+        self.cache.set("k", URL + "/folders", {}, b"\x80")
+
+        self.assertEqual(0, self.cache.stats()["entries"])
+
+    def test_uncached_endpoints_are_not_stored(self):
+        self.cache.set("k", URL + "/messages", {}, [])
+
+        self.assertEqual(0, self.cache.stats()["entries"])
+        self.assertEqual(0, self.cache.misses)
+
+    def test_invalidate_drops_the_resource_its_children_and_lists_above_it(self):
+        for path in ["/sources", "/sources/0", "/sources/0/folders", "/folders"]:
+            self.cache.set("k", URL + path, {}, {})
+        self.cache.set("k", "https://api.context.io/2.0/accounts/12/sources", {}, {})
+
+        self.cache.invalidate(URL + "/sources/0")
+
+        self.assertEqual(
+            {URL + "/folders", "https://api.context.io/2.0/accounts/12/sources"},
+            set(key.split(" ")[2].split("?")[0] for key in self.cache.backend.keys()))
+        self.assertEqual(3, self.cache.invalidations)
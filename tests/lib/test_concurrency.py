@@ -0,0 +1,46 @@
+import threading
+import time
+import unittest
+
+from contextio.lib.concurrency import map_bounded
+
+
+class TestMapBounded(unittest.TestCase):
+    def test_returns_results_in_item_order(self):
+        def slow_square(x):
+            time.sleep(0.001 * (10 - x))
+            return x * x
+
+        self.assertEqual([x * x for x in range(10)], map_bounded(slow_square, range(10), 4))
+
+    def test_never_exceeds_max_workers(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work(item):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.005)
+            with lock:
+                state["running"] -= 1
+
+        map_bounded(work, range(20), max_workers=3)
+
+        self.assertEqual(3, state["peak"])
+
+    def test_reraises_first_exception(self):
+        def work(item):
+            if item == 2:
+                raise ValueError(item)
+            return item
+
+        with self.assertRaises(ValueError):
+            map_bounded(work, range(5), 2)
+
+    def test_runs_inline_when_single_worker(self):
+        threads = []
+
+        map_bounded(lambda item: threads.append(threading.current_thread()), range(3), 1)
+
+        self.assertEqual([threading.current_thread()] * 3, threads)
@@ -0,0 +1,27 @@
+import unittest
+
+from contextio.lib.conditional import NOT_MODIFIED, Validators
+
+
+class TestValidators(unittest.TestCase):
+    def setUp(self):
+        self.validators = Validators()
+
+    def test_headers_for_unknown_url_is_empty(self):
+        self.assertEqual({}, self.validators.headers_for("url", {}))
+
+    def test_headers_for_returns_stored_validators(self):
+        self.validators.update("url", {"b": 2, "a": 1}, {"ETag": '"v1"'})
+
+        self.assertEqual({"If-None-Match": '"v1"'}, self.validators.headers_for("url", {"a": 1, "b": 2}))
+        self.assertEqual({}, self.validators.headers_for("url", {"a": 1}))
+        self.assertEqual({}, self.validators.headers_for("other_url", {"a": 1, "b": 2}))
+
+    def test_update_without_validators_forgets_them(self):
+        self.validators.update("url", {}, {"Last-Modified": "Tue, 01 Sep 2015 00:00:00 GMT"})
+        self.validators.update("url", {}, {})
+
+        self.assertEqual({}, self.validators.headers_for("url", {}))
+
+    def test_NOT_MODIFIED_is_falsy(self):
+        self.assertFalse(NOT_MODIFIED)
@@ -0,0 +1,87 @@
+import logging
+import unittest
+
+from mock import Mock, patch
+
+from contextio.lib.debug import DebugLog, ResponseDescription, truncate
+
+
+def response(status_code=200, content=b'{"foo": "bar"}'):
+    mock_response = Mock(status_code=status_code, headers={"Content-Type": "application/json"})
+    mock_response._content = content
+    mock_response.request.url = "https://api.context.io/2.0/accounts"
+    mock_response.request.method = "GET"
+    mock_response.request.headers = {"Authorization": "OAuth secret", "user-agent": "contextio"}
+    mock_response.request.body = None
+    return mock_response
+
+
+class TestTruncate(unittest.TestCase):
+    def test_cuts_long_bodies(self):
+        self.assertEqual("abc... (3 more)", truncate(b"abcdef", 3))
+        self.assertEqual("abc", truncate(u"abc", 3))
+        self.assertEqual("", truncate(None, 3))
+
+
+class TestResponseDescription(unittest.TestCase):
+    def test_redacts_authorization_and_truncates_bodies(self):
+        text = str(ResponseDescription(response(content=b"x" * 100), 10))
+
+        self.assertIn("Authorization: <redacted>", text)
+        self.assertNotIn("secret", text)
+        self.assertIn("x" * 10 + "... (90 more)", text)
+
+    def test_does_not_read_streamed_bodies(self):
+        streamed = response()
+        streamed._content = False
+
+        self.assertIn("RESPONSE BODY\n<not read>", str(ResponseDescription(streamed, 10)))
+
+
+@patch("contextio.lib.debug.logger")
+class TestDebugLog(unittest.TestCase):
+    def test_formats_nothing_when_debug_is_disabled(self, mock_logger):
+        mock_logger.isEnabledFor.return_value = False
+
+        with patch.object(ResponseDescription, "__init__") as mock_init:
+            DebugLog("log")(response())
+
+        self.assertFalse(mock_init.called)
+        self.assertFalse(mock_logger.debug.called)
+
+    def test_defers_formatting_to_the_logger(self, mock_logger):
+        mock_logger.isEnabledFor.return_value = True
+
+        with patch.object(ResponseDescription, "__str__") as mock_str:
+            DebugLog("log")(response())
+
+        self.assertFalse(mock_str.called)
+        mock_logger.isEnabledFor.assert_called_with(logging.DEBUG)
+        self.assertEqual("%s", mock_logger.debug.call_args[0][0])
+
+    def test_samples_requests(self, mock_logger):
+        mock_logger.isEnabledFor.return_value = True
+        debug_log = DebugLog("log", sample=3)
+
+        for _ in range(7):
+            debug_log(response())
+
+        self.assertEqual(3, mock_logger.debug.call_count)
+
+    def test_always_logs_errors_as_warnings(self, mock_logger):
+        mock_logger.isEnabledFor.return_value = False
+        debug_log = DebugLog("log", sample=100)
+
+        debug_log(response())
+        debug_log(response(status_code=500))
+
+        self.assertEqual(1, mock_logger.warning.call_count)
+        self.assertEqual(500, mock_logger.warning.call_args[0][1].response.status_code)
+
+    def test_errors_can_be_sampled_too(self, mock_logger):
+        debug_log = DebugLog("log", sample=100, errors=False)
+
+        debug_log(response())
+        debug_log(response(status_code=500))
+
+        self.assertFalse(mock_logger.warning.called)
@@ -0,0 +1,85 @@
+import json
+import pickle
+import unittest
+from mock import Mock
+
+from contextio.lib.decoding import LazyList, get_decoder, is_json_array, map_list
+
+MESSAGES = [
+    {"message_id": "a", "subject": "brackets [in] {strings}, and \"quotes\\\""},
+    {"message_id": "b", "addresses": {"to": [{"email": "x@y.com"}]}},
+    42,
+    None,
+]
+
+
+class TestGetDecoder(unittest.TestCase):
+    def test_None_keeps_response_json(self):
+        self.assertIsNone(get_decoder(None))
+
+    def test_callable_is_used_as_is(self):
+        loads = Mock()
+
+        self.assertIs(loads, get_decoder(loads))
+
+    def test_json_is_the_stdlib(self):
+        self.assertIs(json.loads, get_decoder("json"))
+
+    def test_auto_picks_an_installed_decoder(self):
+        self.assertEqual({"a": 1}, get_decoder("auto")(b'{"a": 1}'))
+
+    def test_unknown_name_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            get_decoder("simplejson")
+
+
+class TestLazyList(unittest.TestCase):
+    def setUp(self):
+        self.raw = json.dumps(MESSAGES).encode("utf-8")
+        self.loads = Mock(side_effect=json.loads)
+        self.items = LazyList(self.raw, self.loads)
+
+    def test_elements_match_full_decoding(self):
+        self.assertEqual(MESSAGES, list(self.items))
+        self.assertEqual(4, len(self.items))
+        self.assertEqual(MESSAGES[-1], self.items[-1])
+        self.assertEqual(MESSAGES[1:3], self.items[1:3])
+
+    def test_elements_are_decoded_once_and_only_when_accessed(self):
+        self.items[1]
+        self.items[1]
+
+        self.assertEqual(1, self.loads.call_count)
+
+    def test_works_on_text(self):
+        self.assertEqual(MESSAGES, list(LazyList(json.dumps(MESSAGES, indent=2))))
+
+    def test_empty_arrays(self):
+        self.assertEqual(0, len(LazyList(b"[]")))
+        self.assertFalse(LazyList(b" [ \n ] "))
+
+    def test_index_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.items[4]
+
+    def test_map_transforms_elements_on_access(self):
+        transform = Mock(side_effect=lambda item: ("seen", item))
+
+        mapped = map_list(transform, self.items)
+
+        self.assertIsInstance(mapped, LazyList)
+        self.assertFalse(transform.called)
+        self.assertEqual(("seen", 42), mapped[2])
+        self.assertEqual(1, transform.call_count)
+
+    def test_map_list_on_lists(self):
+        self.assertEqual([2, 4], map_list(lambda item: item * 2, [1, 2]))
+
+    def test_pickles_as_a_list(self):
+        self.assertEqual(MESSAGES, pickle.loads(pickle.dumps(self.items)))
+
+    def test_is_json_array(self):
+        self.assertTrue(is_json_array(b"  [1]"))
+        self.assertTrue(is_json_array("[1]"))
+        self.assertFalse(is_json_array(b'{"a": [1]}'))
+        self.assertFalse(is_json_array(b""))
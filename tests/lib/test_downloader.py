@@ -0,0 +1,148 @@
+import os
+import shutil
+import tempfile
+import unittest
+from mock import Mock
+
+from contextio.lib.downloader import FileDownloader
+from contextio.lib.errors import RequestError
+from contextio.lib.resources.file import File
+
+
+class FakeFile(File):
+    """File whose content is served from memory, honoring Range requests."""
+
+    def __init__(self, file_id, content, supports_range=True, file_name="report.pdf"):
+        super(FakeFile, self).__init__(Mock(spec=[]), {
+            "file_id": file_id, "size": len(content), "file_name": file_name})
+        self.content = content
+        self.supports_range = supports_range
+        self.offsets = []
+
+    def stream_content(self, offset=0):
+        self.offsets.append(offset)
+        response = Mock()
+
+        if offset and self.supports_range:
+            response.status_code = 206
+            body = self.content[offset:]
+        else:
+            response.status_code = 200
+            body = self.content
+
+        response.iter_content.side_effect = lambda size: (
+            body[i:i + size] for i in range(0, len(body), size))
+        return response
+
+
+class TestFileDownloader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.downloader = FileDownloader(self.directory, max_workers=4, chunk_size=4)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self, file):
+        with open(self.downloader.path_for(file), "rb") as f:
+            return f.read()
+
+    def test_path_for_combines_file_id_and_sanitized_name(self):
+        file = FakeFile("abc", b"", file_name="Q1 report/final.pdf")
+
+        self.assertEqual(
+            os.path.join(self.directory, "abc_Q1_report_final.pdf"),
+            self.downloader.path_for(file))
+
+    def test_download_writes_all_files(self):
+        files = [FakeFile(str(i), ("content %d" % i).encode()) for i in range(10)]
+
+        report = self.downloader.download(files)
+
+        self.assertEqual(sorted(f.file_id for f in files), sorted(report.downloaded))
+        self.assertEqual(b"content 3", self.read(files[3]))
+        self.assertEqual(sum(len(f.content) for f in files), report.bytes)
+        self.assertGreater(report.throughput, 0)
+
+    def test_download_skips_files_already_present_with_the_right_size(self):
+        file = FakeFile("abc", b"0123456789")
+        with open(self.downloader.path_for(file), "wb") as f:
+            f.write(b"0123456789")
+
+        report = self.downloader.download([file])
+
+        self.assertEqual(["abc"], report.skipped)
+        self.assertEqual([], file.offsets)
+
+    def test_download_replaces_files_with_the_wrong_size(self):
+        file = FakeFile("abc", b"0123456789")
+        with open(self.downloader.path_for(file), "wb") as f:
+            f.write(b"0123")
+
+        report = self.downloader.download([file])
+
+        self.assertEqual(["abc"], report.downloaded)
+        self.assertEqual(b"0123456789", self.read(file))
+
+    def test_download_resumes_partial_file_with_range_request(self):
+        file = FakeFile("abc", b"0123456789")
+        with open(self.downloader.path_for(file) + ".part", "wb") as f:
+            f.write(b"0123")
+
+        report = self.downloader.download([file])
+
+        self.assertEqual([4], file.offsets)
+        self.assertEqual(["abc"], report.resumed)
+        self.assertEqual(6, report.bytes)
+        self.assertEqual(b"0123456789", self.read(file))
+
+    def test_download_restarts_when_server_ignores_range(self):
+        file = FakeFile("abc", b"0123456789", supports_range=False)
+        with open(self.downloader.path_for(file) + ".part", "wb") as f:
+            f.write(b"0123")
+
+        report = self.downloader.download([file])
+
+        self.assertEqual([], report.resumed)
+        self.assertEqual(b"0123456789", self.read(file))
+
+    def test_download_restarts_when_partial_file_is_longer_than_file(self):
+        file = FakeFile("abc", b"0123456789")
+        with open(self.downloader.path_for(file) + ".part", "wb") as f:
+            f.write(b"0123456789 and then some")
+
+        report = self.downloader.download([file])
+
+        self.assertEqual([0], file.offsets)
+        self.assertEqual([], report.resumed)
+        self.assertEqual(b"0123456789", self.read(file))
+
+    def test_download_finishes_complete_partial_file_without_fetching(self):
+        file = FakeFile("abc", b"0123456789")
+        with open(self.downloader.path_for(file) + ".part", "wb") as f:
+            f.write(b"0123456789")
+
+        report = self.downloader.download([file])
+
+        self.assertEqual([], file.offsets)
+        self.assertEqual(["abc"], report.downloaded)
+        self.assertEqual(b"0123456789", self.read(file))
+
+    def test_download_collects_failures(self):
+        good = FakeFile("good", b"data")
+        bad = FakeFile("bad", b"data")
+        bad.stream_content = Mock(side_effect=RequestError("boom"))
+
+        report = self.downloader.download([good, bad])
+
+        self.assertEqual(["good"], report.downloaded)
+        self.assertIsInstance(report.failed["bad"], RequestError)
+
+    def test_download_account_downloads_files_of_account(self):
+        account = Mock()
+        account.iter_files.return_value = iter([FakeFile("abc", b"data")])
+
+        report = self.downloader.download_account(account, file_name="*.pdf")
+
+        account.iter_files.assert_called_with(file_name="*.pdf")
+        self.assertEqual(["abc"], report.downloaded)
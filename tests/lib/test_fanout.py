@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+
+from contextio.lib.fanout import fan_out, resource_key
+from contextio.lib.resources.account import Account
+from contextio.lib.v2_0 import V2_0
+
+
+def describe(account):
+    # module level so that it can be sent to worker processes
+    return (account.id, account.username, account.parent.consumer_key)
+
+
+def fail_on_bar(account):
+    if account.id == "bar":
+        raise ValueError(account.id)
+    return account.id
+
+
+class TestFanOut(unittest.TestCase):
+    def setUp(self):
+        self.api = V2_0(consumer_key="foo", consumer_secret="bar")
+        self.accounts = [
+            Account(self.api, {"id": account_id, "username": account_id.upper()})
+            for account_id in ["foo", "bar", "baz"]]
+
+    def test_collects_results_and_failures_in_order(self):
+        report = fan_out(fail_on_bar, self.accounts, max_workers=3)
+
+        self.assertEqual([("foo", "foo"), ("baz", "baz")], report.results)
+        self.assertEqual(1, len(report.failed))
+        self.assertEqual("bar", report.failed[0][0])
+        self.assertIsInstance(report.failed[0][1], ValueError)
+        self.assertFalse(report.ok)
+        self.assertEqual(3, len(report))
+
+    def test_reads_resources_from_a_generator(self):
+        report = fan_out(lambda account: account.id, iter(self.accounts), max_workers=2)
+
+        self.assertEqual(["foo", "bar", "baz"], [value for _, value in report.results])
+
+    def test_never_exceeds_max_workers_or_per_account(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0, "per_account": {}, "peak_per_account": 0}
+
+        def work(account):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+                count = state["per_account"].get(account.id, 0) + 1
+                state["per_account"][account.id] = count
+                state["peak_per_account"] = max(state["peak_per_account"], count)
+            time.sleep(0.005)
+            with lock:
+                state["running"] -= 1
+                state["per_account"][account.id] -= 1
+
+        jobs = [self.accounts[0]] * 6 + self.accounts[1:] * 2
+        report = fan_out(work, jobs, max_workers=4, per_account=1)
+
+        self.assertEqual(10, len(report.results))
+        self.assertLessEqual(state["peak"], 4)
+        self.assertEqual(1, state["peak_per_account"])
+
+    def test_reports_progress(self):
+        calls = []
+
+        fan_out(lambda account: None, iter(self.accounts), max_workers=1,
+                progress=lambda done, total: calls.append((done, total)))
+
+        self.assertEqual(3, len(calls))
+        self.assertEqual([1, 2, 3], [done for done, _ in calls])
+        self.assertEqual((3, 3), calls[-1])
+
+        calls = []
+        fan_out(lambda account: None, self.accounts,
+                progress=lambda done, total: calls.append((done, total)))
+
+        self.assertEqual([3, 3, 3], [total for _, total in calls])
+
+    def test_runs_jobs_in_worker_processes(self):
+        report = fan_out(describe, self.accounts, max_workers=2, processes=True)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(
+            [("foo", ("foo", "FOO", "foo")), ("bar", ("bar", "BAR", "foo")),
+             ("baz", ("baz", "BAZ", "foo"))],
+            report.results)
+
+    def test_resource_key_uses_resource_id(self):
+        self.assertEqual("foo", resource_key(self.accounts[0]))
@@ -1,5 +1,9 @@
+import os
+import shutil
+import tempfile
 import unittest
 from datetime import datetime
+from mock import patch
 
 from contextio.lib import helpers
 from contextio.lib.errors import ArgumentError
@@ -20,6 +24,44 @@ class TestHelpers(unittest.TestCase):
             helpers.uncamelize(test_dict)
         )
 
+    def test_to_underscore_handles_acronyms_and_digits(self):
+        self.assertEqual("gmail_thread_id", helpers.to_underscore("gmailThreadID"))
+        self.assertEqual("person_info2", helpers.to_underscore("personInfo2"))
+        self.assertEqual("id", helpers.to_underscore("ID"))
+
+    def test_to_underscore_memoizes_conversions(self):
+        helpers.to_underscore("dateReceived")
+
+        with patch("contextio.lib.helpers._first_cap_re") as mock_re:
+            self.assertEqual("date_received", helpers.to_underscore("dateReceived"))
+
+        self.assertFalse(mock_re.sub.called)
+
+    def test_to_underscore_memo_is_bounded(self):
+        with patch("contextio.lib.helpers._underscore_memo", {}) as memo:
+            with patch("contextio.lib.helpers.UNDERSCORE_MEMO_SIZE", 1):
+                helpers.to_underscore("fooBar")
+                helpers.to_underscore("barBaz")
+
+        self.assertEqual({"fooBar": "foo_bar"}, memo)
+
+    def test_uncamelize_leaves_underscore_dicts_untouched(self):
+        test_dict = {"message_id": "foo", "date": 1}
+
+        with patch("contextio.lib.helpers.to_underscore") as mock_to_underscore:
+            self.assertIs(test_dict, helpers.uncamelize(test_dict))
+
+        self.assertEqual({"message_id": "foo", "date": 1}, test_dict)
+        self.assertFalse(mock_to_underscore.called)
+
+    def test_uncamelize_raises_for_non_dict_definitions(self):
+        with self.assertRaises(AttributeError):
+            helpers.uncamelize("id")
+
+    def test_uncamelize_keeps_camel_key_if_underscore_key_exists(self):
+        self.assertEqual(
+            {"foo_bar": 1, "fooBar": 2}, helpers.uncamelize({"foo_bar": 1, "fooBar": 2}))
+
     def test_as_datetime_converts_UNIX_time_to_datetime_object(self):
         self.assertEqual(datetime(2016, 3, 25, 16, 46, 4), helpers.as_datetime(1458942364))
 
@@ -84,6 +126,22 @@ class TestHelpers(unittest.TestCase):
 
         self.assertTrue(result)
 
+    def test_replace_file_overwrites_the_destination(self):
+        directory = tempfile.mkdtemp()
+        try:
+            source, destination = [os.path.join(directory, name) for name in ("new", "old")]
+            for path, content in ((source, "new"), (destination, "old")):
+                with open(path, "w") as f:
+                    f.write(content)
+
+            helpers.replace_file(source, destination)
+
+            self.assertFalse(os.path.exists(source))
+            with open(destination) as f:
+                self.assertEqual("new", f.read())
+        finally:
+            shutil.rmtree(directory)
+
     def test_check_for_account_credentials_raises_ArgumentError_if_no_credentials(self):
         with self.assertRaises(ArgumentError):
             helpers.check_for_account_credentials({})
@@ -0,0 +1,59 @@
+import unittest
+
+from mock import Mock
+
+from contextio.lib.hooks import Hooks, endpoint
+
+
+class TestEndpoint(unittest.TestCase):
+    def test_replaces_ids_and_drops_version(self):
+        self.assertEqual(
+            "accounts/{id}/messages/{id}/flags",
+            endpoint("https://api.context.io/2.0/accounts/abc/messages/def/flags?x=1"))
+        self.assertEqual(
+            "users/{id}/email_accounts",
+            endpoint("https://api.context.io/lite/users/abc/email_accounts"))
+        self.assertEqual("accounts", endpoint("https://api.context.io/2.0/accounts"))
+
+
+class TestHooks(unittest.TestCase):
+    def setUp(self):
+        self.hooks = Hooks()
+        self.kwargs = {"headers": {"user-agent": "test"}}
+
+    def test_before_request_can_replace_headers(self):
+        def add_header(request):
+            request.kwargs["headers"] = dict(request.kwargs["headers"], **{"X-Trace": "1"})
+
+        self.hooks.add("before_request", add_header)
+        send = Mock(side_effect=lambda: self.kwargs["headers"])
+
+        headers = self.hooks.wrap("GET", "https://api.context.io/2.0/accounts", self.kwargs, send)()
+
+        self.assertEqual({"user-agent": "test", "X-Trace": "1"}, headers)
+
+    def test_on_error_is_called_and_error_raised_again(self):
+        on_error = Mock()
+        self.hooks.add("on_error", on_error)
+        send = self.hooks.wrap("GET", "https://x/2.0/accounts", self.kwargs, Mock(side_effect=IOError))
+
+        with self.assertRaises(IOError):
+            send()
+
+        request, error = on_error.call_args[0]
+        self.assertIsInstance(error, IOError)
+        self.assertIsNotNone(request.elapsed)
+
+    def test_broken_hooks_do_not_break_requests(self):
+        after = Mock()
+        self.hooks.add("after_response", Mock(side_effect=ValueError))
+        self.hooks.add("after_response", after)
+        response = Mock()
+
+        self.assertIs(response, self.hooks.wrap("GET", "https://x/2.0/accounts", self.kwargs,
+                                                 Mock(return_value=response))())
+        self.assertTrue(after.called)
+
+    def test_unknown_events_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            self.hooks.add("after_request", Mock())
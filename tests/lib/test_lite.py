@@ -17,6 +17,15 @@ class TestLite(unittest.TestCase):
         self.assertEqual(1, len(accounts))
         self.assertIsInstance(accounts[0], User)
 
+    @mock.patch("contextio.lib.api.Api._request_uri")
+    def test_fan_out_runs_job_over_every_user(self, mock_request):
+        mock_request.return_value = [{"id": "foo"}, {"id": "bar"}]
+        users = self.api.get_users()
+
+        report = self.api.fan_out(lambda user: user.id, users)
+
+        self.assertEqual([("foo", "foo"), ("bar", "bar")], report.results)
+
     @mock.patch("contextio.lib.api.Api._request_uri")
     def test_post_user_returns_User(self, mock_request):
         mock_request.return_value = {"id": "some_id"}
@@ -0,0 +1,83 @@
+import unittest
+
+from mock import Mock
+from six.moves import http_client
+
+from contextio.lib.hooks import RequestInfo
+from contextio.lib.metrics import MetricsCollector
+
+
+def request(method="GET", url="https://api.context.io/2.0/accounts/abc", elapsed=0.02, attempt=0,
+            **kwargs):
+    info = RequestInfo(method, url, kwargs, attempt)
+    info.elapsed = elapsed
+    return info
+
+
+class TestMetricsCollector(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsCollector(buckets=(0.01, 0.1))
+
+    def record(self):
+        self.metrics.before_request(request(data={"seen": 1}))
+        self.metrics.after_response(
+            request(elapsed=0.005), Mock(status_code=200, headers={"Content-Length": "100"}))
+        self.metrics.before_request(request(attempt=1))
+        self.metrics.after_response(
+            request(elapsed=0.05, attempt=1), Mock(status_code=503, headers={}, content=b"down"))
+        self.metrics.on_error(request(elapsed=1), IOError())
+
+    def test_snapshot(self):
+        self.record()
+
+        stats = self.metrics.snapshot()[("GET", "accounts/{id}")]
+
+        self.assertEqual(3, stats["count"])
+        self.assertAlmostEqual(1.055, stats["sum"])
+        self.assertEqual({0.01: 1, 0.1: 2, float("inf"): 3}, stats["buckets"])
+        self.assertEqual(len("seen=1"), stats["bytes_sent"])
+        self.assertEqual(104, stats["bytes_received"])
+        self.assertEqual({200: 1, 503: 1}, stats["statuses"])
+        self.assertEqual({"IOError" if str is bytes else "OSError": 1}, stats["errors"])
+        self.assertEqual(1, stats["retries"])
+
+    def test_streamed_bodies_are_not_read(self):
+        response = Mock(status_code=200, headers={})
+
+        self.metrics.after_response(request(stream=True), response)
+
+        self.assertEqual(0, self.metrics.snapshot()[("GET", "accounts/{id}")]["bytes_received"])
+
+    def test_prometheus_text(self):
+        self.record()
+
+        text = self.metrics.prometheus()
+
+        labels = 'method="GET",endpoint="accounts/{id}"'
+        self.assertIn("# TYPE contextio_request_duration_seconds histogram", text)
+        self.assertIn('contextio_request_duration_seconds_bucket{' + labels + ',le="0.1"} 2', text)
+        self.assertIn('contextio_request_duration_seconds_bucket{' + labels + ',le="+Inf"} 3', text)
+        self.assertIn('contextio_request_duration_seconds_count{' + labels + '} 3', text)
+        self.assertIn('contextio_request_responses_total{' + labels + ',status="503"} 1', text)
+        self.assertIn('contextio_request_retries_total{' + labels + '} 1', text)
+        self.assertIn('contextio_request_bytes_received_total{' + labels + '} 104', text)
+
+    def test_serve(self):
+        self.record()
+        server = self.metrics.serve(0, host="127.0.0.1")
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        connection = http_client.HTTPConnection(*server.server_address)
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+
+        self.assertEqual(200, response.status)
+        self.assertIn(b"contextio_request_retries_total", response.read())
+        connection.close()
+
+    def test_reset(self):
+        self.record()
+        self.metrics.reset()
+
+        self.assertEqual({}, self.metrics.snapshot())
@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextio.lib.mirror import AccountMirror
+from contextio.lib.resources.contact import Contact
+from contextio.lib.resources.file import File
+from contextio.lib.resources.message import Message
+from contextio.lib.resources.thread import Thread
+
+
+class FakeAccount(object):
+    """Serves list endpoints from memory, honoring the filters the mirror uses."""
+
+    def __init__(self):
+        self.messages = []
+        self.files = []
+        self.contacts = []
+        self.threads = []
+        self.calls = []
+
+    def _request_uri(self, endpoint, params=None):
+        params = dict(params or {})
+        self.calls.append((endpoint, params))
+
+        if endpoint == "contacts":
+            items = [c for c in self.contacts
+                     if max(c["last_received"], c["last_sent"]) > params.get("active_after", -1)]
+        else:
+            items = [i for i in getattr(self, endpoint)
+                     if i["date_indexed"] > params.get("indexed_after", -1)]
+            if endpoint == "threads":
+                items = ["https://api.context.io/2.0/accounts/1/threads/" + i["id"] for i in items]
+
+        page = items[params["offset"]:params["offset"] + params["limit"]]
+        return {"matches": page} if endpoint == "contacts" else page
+
+
+def message(message_id, date_indexed, thread="t1"):
+    return {
+        "message_id": message_id, "gmail_thread_id": thread, "date": date_indexed - 5,
+        "date_indexed": date_indexed, "subject": "subject " + message_id}
+
+
+class TestAccountMirror(unittest.TestCase):
+    def setUp(self):
+        self.account = FakeAccount()
+        self.account.messages = [message("m1", 100), message("m2", 110, thread="t2")]
+        self.account.files = [
+            {"file_id": "f1", "message_id": "m1", "file_name": "report.pdf", "size": 10,
+             "date": 95, "date_indexed": 100},
+            {"file_id": "f2", "message_id": "m2", "file_name": "photo.jpg", "size": 20,
+             "date": 105, "date_indexed": 110}]
+        self.account.contacts = [
+            {"email": "jane@example.com", "name": "Jane", "count": 3,
+             "last_received": 100, "last_sent": 90},
+            {"email": "john@example.com", "name": "John", "count": 7,
+             "last_received": 80, "last_sent": 110}]
+        self.account.threads = [{"id": "t1", "date_indexed": 100}, {"id": "t2", "date_indexed": 110}]
+
+        self.mirror = AccountMirror(self.account, page_size=1)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def test_sync_stores_everything_on_first_run(self):
+        counts = self.mirror.sync()
+
+        self.assertEqual({"messages": 2, "files": 2, "contacts": 2, "threads": 2}, counts)
+        self.assertNotIn("indexed_after", self.account.calls[0][1])
+
+    def test_sync_only_requests_new_items(self):
+        self.mirror.sync()
+        self.account.messages.append(message("m3", 120))
+        self.account.calls = []
+
+        self.mirror.sync()
+
+        messages_calls = [params for endpoint, params in self.account.calls if endpoint == "messages"]
+        self.assertEqual(109, messages_calls[0]["indexed_after"])
+        self.assertEqual(3, len(self.mirror.get_messages()))
+
+    def test_resync_replaces_instead_of_duplicating(self):
+        self.mirror.sync()
+        self.mirror.sync()
+
+        self.assertEqual(2, len(self.mirror.get_messages()))
+        self.assertEqual(2, len(self.mirror.get_files()))
+        self.assertEqual(2, len(self.mirror.get_contacts()))
+        self.assertEqual(2, len(self.mirror.get_threads()))
+
+    def test_sync_state_survives_reopening_the_database(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "mirror.db")
+            mirror = AccountMirror(self.account, path)
+            mirror.sync()
+            mirror.close()
+
+            self.account.calls = []
+            mirror = AccountMirror(self.account, path)
+            mirror.sync()
+            mirror.close()
+
+            self.assertEqual(109, self.account.calls[0][1]["indexed_after"])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_get_messages_reads_locally(self):
+        self.mirror.sync()
+        self.account.calls = []
+
+        messages = self.mirror.get_messages(gmail_thread_id="t2")
+
+        self.assertEqual([], self.account.calls)
+        self.assertEqual(1, len(messages))
+        self.assertIsInstance(messages[0], Message)
+        self.assertEqual("m2", messages[0].message_id)
+        self.assertIs(self.account, messages[0].parent)
+
+    def test_get_messages_orders_newest_first_and_pages(self):
+        self.mirror.sync()
+
+        self.assertEqual(["m2", "m1"], [m.message_id for m in self.mirror.get_messages()])
+        self.assertEqual(["m1"], [m.message_id for m in self.mirror.get_messages(limit=1, offset=1)])
+        self.assertEqual(["m2"], [m.message_id for m in self.mirror.get_messages(date_after=100)])
+
+    def test_get_message(self):
+        self.mirror.sync()
+
+        self.assertEqual("subject m1", self.mirror.get_message("m1").subject)
+        self.assertIsNone(self.mirror.get_message("missing"))
+
+    def test_get_files_filters_by_name(self):
+        self.mirror.sync()
+
+        files = self.mirror.get_files(file_name="%.pdf")
+
+        self.assertEqual(1, len(files))
+        self.assertIsInstance(files[0], File)
+        self.assertEqual("f1", files[0].file_id)
+
+    def test_get_contacts_searches_name_and_email(self):
+        self.mirror.sync()
+
+        contacts = self.mirror.get_contacts(search="jan")
+
+        self.assertEqual(1, len(contacts))
+        self.assertIsInstance(contacts[0], Contact)
+        self.assertEqual("jane@example.com", contacts[0].email)
+
+    def test_get_threads(self):
+        self.mirror.sync()
+
+        threads = self.mirror.get_threads()
+
+        self.assertTrue(all(isinstance(t, Thread) for t in threads))
+        self.assertEqual({"t1", "t2"}, set(t.gmail_thread_id for t in threads))
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextio.lib.downloader import FileDownloader
+from contextio.lib.lite import Lite
+from contextio.lib.mock_server import MockServer
+from contextio.lib.resources.message import Message
+from contextio.lib.v2_0 import V2_0
+
+
+class TestMockServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockServer(accounts=3, messages=10, body_size=100, file_size=1000)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.api = V2_0(consumer_key="foo", consumer_secret="bar", url_base=self.server.url_base)
+        self.account = self.api.get_accounts(limit=1)[0]
+
+    def test_lists_accounts_and_messages(self):
+        self.assertEqual(3, len(self.api.get_accounts()))
+        self.assertEqual("account-0", self.account.id)
+
+        messages = self.account.get_messages(limit=4, offset=2, include_body=1)
+
+        self.assertEqual(["message-2", "message-3", "message-4", "message-5"],
+                         [message.message_id for message in messages])
+        self.assertEqual(100, len(messages[0].body[0]["content"]))
+
+    def test_hydrates_and_mutates_messages(self):
+        message = Message(self.account, {"message_id": "message-3"})
+
+        self.assertTrue(message.get())
+        self.assertEqual("Message 3", message.subject)
+        self.assertTrue(message.post_flag(seen=1))
+        self.assertEqual({"seen": True}, message.flags)
+        self.assertTrue(message.post_folder(add="Archive"))
+        self.assertEqual(
+            ("POST", "/2.0/accounts/account-0/messages/message-3/folders"),
+            self.server.log[-1][:2])
+        self.assertEqual("Archive", self.server.log[-1][2]["add"])
+
+    def test_downloads_files_with_ranges(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        files = self.account.get_files()
+        downloader = FileDownloader(directory, max_workers=2)
+
+        # leave half a file behind, as an interrupted download would
+        with open(downloader.path_for(files[0]) + ".part", "wb") as f:
+            f.write(b"\0" * 500)
+
+        report = downloader.download(files)
+
+        self.assertEqual(5, len(report.downloaded))
+        self.assertEqual([files[0].file_id], report.resumed)
+        self.assertEqual(1000, os.path.getsize(downloader.path_for(files[0])))
+
+    def test_folders_of_sources(self):
+        folder = self.account.get_sources()[0].get_folders()[0]
+
+        self.assertEqual("INBOX", folder.name)
+        self.assertEqual(2, len(folder.get_messages(limit=2)))
+
+    def test_lite_users(self):
+        lite = Lite(
+            consumer_key="foo", consumer_secret="bar", api_version="lite",
+            url_base=self.server.url_base)
+
+        user = lite.get_users()[0]
+        folder = user.get_email_accounts()[0].get_folders()[0]
+
+        self.assertEqual("user-0", user.id)
+        self.assertEqual(10, len(folder.get_messages()))
+
+    def test_unknown_urls_are_404s(self):
+        status, content, _ = self.server.respond("GET", "/2.0/accounts/account-99", {})
+
+        self.assertEqual(404, status)
+        self.assertEqual("error", content["type"])
@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+from contextio.lib.pagination import iter_pages
+
+
+class FakeEndpoint(object):
+    def __init__(self, total):
+        self.items = list(range(total))
+        self.calls = []
+
+    def __call__(self, **params):
+        self.calls.append(params)
+        return self.items[params["offset"]:params["offset"] + params["limit"]]
+
+
+class TestIterPages(unittest.TestCase):
+    def test_yields_every_item_across_pages(self):
+        fetch = FakeEndpoint(25)
+
+        self.assertEqual(list(range(25)), list(iter_pages(fetch, {}, page_size=10)))
+        self.assertEqual([0, 10, 20], [call["offset"] for call in fetch.calls])
+
+    def test_stops_on_empty_page_when_total_is_multiple_of_page_size(self):
+        fetch = FakeEndpoint(20)
+
+        self.assertEqual(20, len(list(iter_pages(fetch, {}, page_size=10))))
+        self.assertEqual(3, len(fetch.calls))
+
+    def test_limit_caps_total_and_offset_sets_start(self):
+        fetch = FakeEndpoint(100)
+
+        items = list(iter_pages(fetch, {"offset": 5, "limit": 12}, page_size=10))
+
+        self.assertEqual(list(range(5, 17)), items)
+        self.assertEqual(
+            [{"offset": 5, "limit": 10}, {"offset": 15, "limit": 2}], fetch.calls)
+
+    def test_passes_other_params_through(self):
+        fetch = FakeEndpoint(3)
+
+        list(iter_pages(fetch, {"folder": "INBOX"}, page_size=10))
+
+        self.assertEqual({"folder": "INBOX", "offset": 0, "limit": 10}, fetch.calls[0])
+
+    def test_is_lazy(self):
+        fetch = FakeEndpoint(100)
+
+        items = iter_pages(fetch, {}, page_size=10)
+        self.assertEqual([], fetch.calls)
+
+        next(items)
+        self.assertEqual(1, len(fetch.calls))
+
+    def test_read_ahead_requests_next_page_on_background_thread(self):
+        fetch = FakeEndpoint(25)
+        threads = []
+
+        def tracking_fetch(**params):
+            threads.append(threading.current_thread())
+            return fetch(**params)
+
+        items = list(iter_pages(tracking_fetch, {}, page_size=10, read_ahead=True))
+
+        self.assertEqual(list(range(25)), items)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_read_ahead_propagates_errors(self):
+        def failing_fetch(**params):
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            list(iter_pages(failing_fetch, {}, read_ahead=True))
@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from mock import Mock
+
+from contextio.lib.poller import JSONFileStore, MessagePoller, PollScheduler
+from contextio.lib.resources.message import Message
+
+
+class FakeAccount(object):
+    """Serves get_messages() from memory, honoring indexed_after, limit and offset."""
+
+    def __init__(self, account_id="account-0"):
+        self.id = account_id
+        self.messages = []
+        self.calls = []
+
+    def add(self, message_id, date_indexed):
+        self.messages.append({"message_id": message_id, "date_indexed": date_indexed})
+
+    def get_messages(self, **params):
+        self.calls.append(params)
+        items = [m for m in self.messages if m["date_indexed"] > params.get("indexed_after", -1)]
+        page = items[params["offset"]:params["offset"] + params["limit"]]
+        return [Message(self, dict(m)) for m in page]
+
+
+def ids(messages):
+    return [message.message_id for message in messages]
+
+
+class TestMessagePoller(unittest.TestCase):
+    def setUp(self):
+        self.account = FakeAccount()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "pollers.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_first_poll_returns_everything_then_only_new_messages(self):
+        self.account.add("a", 10)
+        self.account.add("b", 11)
+        poller = MessagePoller(self.account, page_size=1)
+
+        self.assertEqual(["a", "b"], ids(poller.poll()))
+        self.assertEqual([], poller.poll())
+
+        self.account.add("c", 15)
+        self.assertEqual(["c"], ids(poller.poll()))
+        self.assertEqual({"date_indexed": 15, "ids": ["c"]}, poller.state)
+
+    def test_messages_indexed_in_the_same_second_as_the_mark_are_not_lost(self):
+        self.account.add("a", 10)
+        poller = MessagePoller(self.account)
+        poller.poll()
+
+        # indexed in the second of the mark, after the previous poll
+        self.account.add("b", 10)
+
+        self.assertEqual(["b"], ids(poller.poll()))
+        self.assertEqual({"date_indexed": 10, "ids": ["a", "b"]}, poller.state)
+        self.assertEqual(9, self.account.calls[-1]["indexed_after"])
+
+    def test_since_skips_older_messages_on_the_first_poll(self):
+        self.account.add("a", 10)
+        self.account.add("b", 20)
+
+        self.assertEqual(["b"], ids(MessagePoller(self.account, since=20).poll()))
+
+    def test_pages_shifted_by_new_messages_do_not_give_duplicates(self):
+        self.account.get_messages = Mock(side_effect=[
+            [Message(self.account, {"message_id": "a", "date_indexed": 10}),
+             Message(self.account, {"message_id": "b", "date_indexed": 10})],
+            [Message(self.account, {"message_id": "b", "date_indexed": 10})],
+        ])
+
+        self.assertEqual(["a", "b"], ids(MessagePoller(self.account, page_size=2).poll()))
+
+    def test_state_is_saved_and_restored_from_the_store(self):
+        self.account.add("a", 10)
+        MessagePoller(self.account, store=JSONFileStore(self.path)).poll()
+
+        with open(self.path) as f:
+            self.assertEqual({"account-0": {"date_indexed": 10, "ids": ["a"]}}, json.load(f))
+
+        self.account.add("b", 12)
+        poller = MessagePoller(self.account, store=JSONFileStore(self.path))
+
+        self.assertEqual(["b"], ids(poller.poll()))
+        self.assertEqual(["b"], JSONFileStore(self.path).load("account-0")["ids"])
+
+
+class TestPollScheduler(unittest.TestCase):
+    def setUp(self):
+        self.handled = []
+        self.accounts = [FakeAccount("account-{0}".format(i)) for i in range(3)]
+        self.pollers = [MessagePoller(account) for account in self.accounts]
+        self.scheduler = PollScheduler(
+            self.pollers, lambda account, messages: self.handled.append((account.id, ids(messages))),
+            min_interval=10, max_interval=80, jitter=0)
+
+    def test_first_polls_are_spread_over_min_interval(self):
+        now = time.time()
+        dues = sorted(entry[0] for entry in self.scheduler._heap)
+
+        self.assertTrue(all(now - 1 <= due <= now + 10 for due in dues))
+        self.assertEqual(0, self.scheduler.run_pending(now=now - 1))
+
+    def test_run_pending_polls_due_accounts_and_calls_handler(self):
+        self.accounts[1].add("a", 10)
+
+        self.assertEqual(1, self.scheduler.run_pending(now=time.time() + 10))
+
+        self.assertEqual([("account-1", ["a"])], self.handled)
+        self.assertEqual({"polls": 3, "messages": 1, "errors": 0, "pollers": 3},
+                         self.scheduler.stats())
+
+    def test_quiet_accounts_back_off_and_active_ones_are_polled_often(self):
+        self.accounts[0].add("a", 10)
+        for _ in range(4):
+            self.scheduler.run_pending(now=time.time() + 1000)
+
+        intervals = dict((entry[2].poller.key, entry[2].interval) for entry in self.scheduler._heap)
+        self.assertEqual(80, intervals["account-1"])
+
+        self.accounts[0].add("b", 20)
+        self.scheduler.run_pending(now=time.time() + 1000)
+
+        intervals = dict((entry[2].poller.key, entry[2].interval) for entry in self.scheduler._heap)
+        self.assertEqual(10, intervals["account-0"])
+
+    def test_failed_polls_are_counted_and_backed_off(self):
+        self.pollers[2].poll = Mock(side_effect=ValueError("down"))
+
+        self.scheduler.run_pending(now=time.time() + 10)
+
+        self.assertEqual(1, self.scheduler.stats()["errors"])
+        entry = [e[2] for e in self.scheduler._heap if e[2].poller is self.pollers[2]][0]
+        self.assertEqual(20, entry.interval)
+
+    def test_jitter_keeps_intervals_within_bounds(self):
+        scheduler = PollScheduler([], Mock(), min_interval=10, jitter=0.5)
+        scheduler.add(self.pollers[0], delay=0)
+
+        scheduler.run_pending()
+
+        delay = scheduler.next_due() - time.time()
+        self.assertTrue(9 < delay <= 30)
+
+    def test_start_and_stop(self):
+        self.accounts[0].add("a", 10)
+        scheduler = PollScheduler([], self.scheduler.handler, min_interval=0.01, max_interval=0.05)
+        scheduler.add(self.pollers[0], delay=0)
+
+        scheduler.start()
+        deadline = time.time() + 5
+        while not self.handled and time.time() < deadline:
+            time.sleep(0.01)
+        scheduler.stop()
+
+        self.assertEqual([("account-0", ["a"])], self.handled)
+        self.assertGreater(scheduler.stats()["polls"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+from mock import Mock, patch
+from requests.exceptions import ConnectionError
+
+from contextio.lib.errors import CircuitOpenError
+from contextio.lib.retry import CircuitBreaker, RetryEngine, TokenBucket
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status_code, headers=None):
+    return Mock(status_code=status_code, headers=headers or {})
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, capacity=2, clock=self.clock)
+
+    def test_burst_is_free_then_requests_wait(self):
+        self.assertEqual(0, self.bucket.reserve())
+        self.assertEqual(0, self.bucket.reserve())
+        self.assertEqual(0.5, self.bucket.reserve())
+
+    def test_tokens_refill_over_time(self):
+        for _ in range(2):
+            self.bucket.reserve()
+        self.clock.now += 1
+
+        self.assertEqual(0, self.bucket.reserve())
+
+    def test_pause_holds_back_tokens(self):
+        self.bucket.pause(10)
+
+        self.assertEqual(10, self.bucket.reserve())
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual("open", self.breaker.state)
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual("closed", self.breaker.state)
+
+    def test_half_open_lets_one_trial_through(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now += 30
+
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual("open", self.breaker.state)
+
+
+class TestRetryEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = RetryEngine(max_retries=2, backoff_factor=1)
+        self.engine.sleep = Mock()
+
+    def test_returns_successful_response_without_retrying(self):
+        send = Mock(return_value=response(200))
+
+        self.assertEqual(200, self.engine.send("GET", "url", send).status_code)
+        self.assertEqual(1, send.call_count)
+        self.assertEqual(0, self.engine.stats()["retries"])
+
+    def test_retries_5xx_for_idempotent_methods(self):
+        send = Mock(side_effect=[response(503), response(502), response(200)])
+
+        self.assertEqual(200, self.engine.send("GET", "url", send).status_code)
+        self.assertEqual(2, self.engine.stats()["retries"])
+        self.assertEqual(2, self.engine.stats()["failures"])
+
+    def test_does_not_retry_5xx_for_POST(self):
+        send = Mock(return_value=response(503))
+
+        self.assertEqual(503, self.engine.send("POST", "url", send).status_code)
+        self.assertEqual(1, send.call_count)
+
+    def test_gives_up_after_max_retries(self):
+        send = Mock(return_value=response(500))
+
+        self.assertEqual(500, self.engine.send("GET", "url", send).status_code)
+        self.assertEqual(3, send.call_count)
+
+    def test_retries_429_after_Retry_After_for_any_method(self):
+        send = Mock(side_effect=[response(429, {"Retry-After": "7"}), response(200)])
+
+        self.assertEqual(200, self.engine.send("POST", "url", send).status_code)
+        self.engine.sleep.assert_called_once_with(7.0)
+        self.assertEqual(1, self.engine.stats()["rate_limited"])
+
+    def test_retry_after_accepts_http_dates_and_is_capped(self):
+        self.assertEqual(30, self.engine.retry_after(response(429, {"Retry-After": "3600"})))
+        self.assertEqual(0, self.engine.retry_after(
+            response(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})))
+        self.assertIsNone(self.engine.retry_after(response(429)))
+
+    def test_backoff_is_jittered_and_bounded(self):
+        with patch("contextio.lib.retry.random.uniform", return_value=1.5) as mock_uniform:
+            self.assertEqual(1.5, self.engine.backoff(3))
+
+        mock_uniform.assert_called_with(0, 8)
+        self.assertLessEqual(self.engine.backoff(20), self.engine.max_backoff)
+
+    def test_retries_connection_errors_then_reraises(self):
+        send = Mock(side_effect=ConnectionError("down"))
+
+        with self.assertRaises(ConnectionError):
+            self.engine.send("GET", "url", send)
+
+        self.assertEqual(3, send.call_count)
+
+    def test_open_circuit_raises_without_sending(self):
+        engine = RetryEngine(max_retries=0, failure_threshold=2)
+        send = Mock(return_value=response(500))
+        engine.send("GET", "url", send)
+        engine.send("GET", "url", send)
+
+        with self.assertRaises(CircuitOpenError):
+            engine.send("GET", "url", send)
+
+        self.assertEqual(2, send.call_count)
+        self.assertEqual("open", engine.stats()["circuit"])
+
+    def test_unexpected_error_in_trial_lets_the_next_request_through(self):
+        clock = FakeClock()
+        engine = RetryEngine(max_retries=0, failure_threshold=1)
+        engine.circuit_breaker.clock = clock
+        engine.send("GET", "url", Mock(return_value=response(500)))
+        clock.now += 30
+
+        with self.assertRaises(ValueError):
+            engine.send("GET", "url", Mock(side_effect=ValueError("bad url")))
+
+        send = Mock(return_value=response(200))
+        self.assertEqual(200, engine.send("GET", "url", send).status_code)
+        self.assertEqual("closed", engine.stats()["circuit"])
+
+    def test_account_requests_are_rate_limited_per_account(self):
+        engine = RetryEngine(account_rate=1, account_burst=1)
+        engine.sleep = Mock()
+        send = Mock(return_value=response(200))
+
+        engine.send("GET", "https://api.context.io/2.0/accounts/a/messages", send, key="k")
+        engine.send("GET", "https://api.context.io/2.0/accounts/b/messages", send, key="k")
+        self.assertFalse(engine.sleep.called)
+
+        engine.send("GET", "https://api.context.io/2.0/accounts/a/files", send, key="k")
+        self.assertTrue(engine.sleep.called)
+        self.assertEqual(1, engine.stats()["throttled"])
@@ -0,0 +1,158 @@
+import sys
+import time
+import unittest
+from mock import Mock, patch
+
+from contextio.lib.errors import SyncTimeout
+from contextio.lib.resources.account import Account
+from contextio.lib.resources.source import Source
+from contextio.lib.sync_watcher import SyncWatcher, sync_status
+
+
+def status(finished=True, start=100, stop=110):
+    return {"initial_import_finished": finished, "last_sync_start": start,
+            "last_sync_stop": stop, "last_expunge": 0}
+
+
+class TestSyncStatus(unittest.TestCase):
+    def test_finds_source_under_account(self):
+        response = {"account": {"a": status(stop=110), "b": status(finished=False)}}
+
+        self.assertEqual(
+            {"initial_import_finished": True, "last_sync_start": 100, "last_sync_stop": 110},
+            sync_status(response, "a"))
+        self.assertFalse(sync_status(response, "b")["initial_import_finished"])
+        self.assertIsNone(sync_status(response, "c"))
+
+    def test_combines_statuses_per_folder_and_for_whole_account(self):
+        response = {"a": {"INBOX": status(stop=120), "Sent": status(start=130, stop=90)}}
+
+        self.assertEqual(
+            {"initial_import_finished": True, "last_sync_start": 130, "last_sync_stop": 90},
+            sync_status(response, "a"))
+
+        response["b"] = status(finished=False)
+        self.assertFalse(sync_status(response)["initial_import_finished"])
+
+
+class TestSyncWatcher(unittest.TestCase):
+    def setUp(self):
+        self.account = Account(Mock(spec=[]), {"id": "account-1"})
+        self.account.get_sync = Mock()
+        self.sources = [Source(self.account, {"label": label}) for label in ["a", "b"]]
+        self.watcher = SyncWatcher(min_interval=1, max_interval=4, jitter=0, background=False)
+
+    def tearDown(self):
+        self.watcher.close()
+
+    def test_coalesces_watches_on_one_account_into_one_call(self):
+        self.account.get_sync.return_value = {"account-1": {"a": status(), "b": status()}}
+        futures = [self.watcher.watch(source) for source in self.sources]
+        futures.append(self.watcher.watch(self.account))
+
+        self.assertEqual(1, self.watcher.poll())
+
+        self.assertEqual(1, self.account.get_sync.call_count)
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertTrue(futures[0].result()["initial_import_finished"])
+        self.assertEqual({"polls": 1, "finished": 3, "timeouts": 0, "errors": 0, "watching": 0},
+                         self.watcher.stats())
+
+    def test_backs_off_until_the_initial_import_is_finished(self):
+        self.account.get_sync.side_effect = [
+            {"a": status(finished=False)}, {"a": status(finished=False)},
+            {"a": status(finished=False)}, {"a": status()}]
+        future = self.watcher.watch(self.sources[0])
+        entry = self.watcher._accounts["account-1"]
+
+        intervals = []
+        while not future.done():
+            self.watcher.poll(now=time.time() + 10)
+            intervals.append(entry.interval)
+
+        self.assertEqual([2, 4, 4, 4], intervals)
+        self.assertIsNone(self.watcher.next_due())
+
+    def test_since_waits_for_a_sync_that_stopped_after_it(self):
+        self.account.get_sync.side_effect = [{"a": status(stop=100)}, {"a": status(stop=200)}]
+        future = self.watcher.watch(self.sources[0], since=150)
+
+        self.watcher.poll()
+        self.assertFalse(future.done())
+
+        self.watcher.poll(now=time.time() + 10)
+        self.assertEqual(200, future.result()["last_sync_stop"])
+
+    @patch("contextio.lib.resources.source.Source.get_sync")
+    def test_asks_sources_missing_from_the_account_answer(self, mock_get_sync):
+        self.account.get_sync.return_value = {"a": status()}
+        mock_get_sync.return_value = {"b": status()}
+        future = self.watcher.watch(self.sources[1])
+
+        self.watcher.poll()
+
+        self.assertTrue(future.result()["initial_import_finished"])
+        self.assertEqual(2, self.watcher.stats()["polls"])
+
+    def test_watch_fails_with_SyncTimeout(self):
+        self.account.get_sync.return_value = {"a": status(finished=False)}
+        future = self.watcher.watch(self.sources[0], timeout=0)
+
+        self.watcher.poll()
+
+        self.assertIsInstance(future.exception(), SyncTimeout)
+        self.assertEqual(1, self.watcher.stats()["timeouts"])
+
+    def test_watch_fails_after_max_errors(self):
+        self.watcher.max_errors = 2
+        self.account.get_sync.side_effect = ValueError("down")
+        future = self.watcher.watch(self.sources[0])
+
+        self.watcher.poll()
+        self.assertFalse(future.done())
+        self.watcher.poll(now=time.time() + 10)
+
+        self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(2, self.watcher.stats()["errors"])
+
+    def test_close_cancels_pending_watches(self):
+        future = self.watcher.watch(self.sources[0])
+
+        self.watcher.close()
+
+        self.assertTrue(future.cancelled())
+        with self.assertRaises(RuntimeError):
+            self.watcher.watch(self.sources[0])
+
+    def test_background_thread_serves_blocking_and_callback_watches(self):
+        self.account.get_sync.side_effect = [{"a": status(finished=False)}, {"a": status()}]
+        done = []
+
+        with SyncWatcher(min_interval=0.01, max_interval=0.05) as watcher:
+            watcher.watch(self.sources[0], callback=done.append)
+            result = watcher.wait(self.sources[0], timeout=5)
+
+        self.assertTrue(result["initial_import_finished"])
+        self.assertEqual(1, len(done))
+
+    @unittest.skipIf(sys.version_info < (3, 4), "asyncio is python 3.4+")
+    def test_wait_async_returns_an_awaitable(self):
+        import asyncio
+
+        self.account.get_sync.return_value = {"a": status()}
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        with SyncWatcher(min_interval=0.01) as watcher:
+            try:
+                result = loop.run_until_complete(
+                    asyncio.wait_for(watcher.wait_async(self.sources[0]), 5))
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+        self.assertTrue(result["initial_import_finished"])
+
+
+if __name__ == "__main__":
+    unittest.main()
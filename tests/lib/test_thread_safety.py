@@ -0,0 +1,102 @@
+import pickle
+import threading
+import unittest
+
+from contextio.lib.mock_server import MockServer
+from contextio.lib.v2_0 import V2_0
+
+THREADS = 64
+ROUNDS = 3
+
+
+class TestThreadSafeClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockServer(accounts=1, messages=THREADS, body_size=10)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.log.clear()
+        self.api = V2_0(
+            consumer_key="foo", consumer_secret="bar", url_base=self.server.url_base,
+            thread_safe=True, pool_maxsize=THREADS)
+
+    def run_threads(self, worker):
+        start = threading.Event()
+        errors = []
+
+        def run(i):
+            start.wait()
+            try:
+                worker(i)
+            except Exception as e:
+                errors.append((i, e))
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join(30)
+
+        self.assertEqual([], errors)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+
+    def test_every_thread_gets_its_own_session_on_one_pool(self):
+        sessions = {}
+
+        def worker(i):
+            sessions[i] = self.api._session()
+
+        self.run_threads(worker)
+
+        self.assertEqual(THREADS, len(set(id(session) for session in sessions.values())))
+        adapter = self.api.transport.shared_adapter()
+        for session in sessions.values():
+            self.assertIs(adapter, session.adapters["http://"])
+
+    def test_pickled_client_shares_one_pool_again(self):
+        api = pickle.loads(pickle.dumps(self.api))
+
+        adapter = api.transport.shared_adapter()
+        self.assertIs(adapter, api._session().adapters["http://"])
+        self.assertEqual("message-0", api._request_uri(
+            "accounts/account-0/messages/message-0")["message_id"])
+
+    def test_concurrent_requests_do_not_leak_params_headers_or_responses(self):
+        shared_params = {"seen": 1}
+        answers = {}
+
+        def worker(i):
+            uri = "accounts/account-0/messages/message-{0}".format(i)
+            headers = {"X-Worker": str(i)}
+            for _ in range(ROUNDS):
+                message = self.api._request_uri(uri, params={"include_flags": i}, headers=headers)
+                answers.setdefault(i, set()).add(message["message_id"])
+
+                self.api._request_uri(
+                    uri + "/flags", method="POST", params=shared_params, headers=headers)
+
+        self.run_threads(worker)
+
+        self.assertEqual({"seen": 1}, shared_params)
+        for i in range(THREADS):
+            self.assertEqual({"message-{0}".format(i)}, answers[i])
+
+        self.assertEqual(THREADS * ROUNDS * 2, len(self.server.log))
+        for method, path, params, headers in self.server.log:
+            worker = headers["x-worker"]
+            self.assertIn("/message-{0}".format(worker), path)
+            if method == "GET":
+                self.assertEqual(worker, params["include_flags"])
+            else:
+                self.assertEqual("1", params["seen"])
+            self.assertNotIn("X-Worker", self.api.default_headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
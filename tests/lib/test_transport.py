@@ -0,0 +1,91 @@
+import mock
+import pickle
+import socket
+import unittest
+
+from contextio.lib.transport import PoolingAdapter, Transport
+
+
+class TestTransport(unittest.TestCase):
+    def test_timeout_is_None_when_no_timeouts_are_configured(self):
+        self.assertIsNone(Transport().timeout)
+
+    def test_timeout_is_tuple_of_connect_and_read_timeouts(self):
+        transport = Transport(connect_timeout=3.05, read_timeout=30)
+
+        self.assertEqual((3.05, 30), transport.timeout)
+
+    def test_adapter_is_built_with_pool_settings(self):
+        transport = Transport(pool_connections=4, pool_maxsize=32, pool_block=True)
+
+        adapter = transport.adapter()
+
+        self.assertIsInstance(adapter, PoolingAdapter)
+        self.assertEqual(32, adapter.poolmanager.connection_pool_kw["maxsize"])
+        self.assertTrue(adapter.poolmanager.connection_pool_kw["block"])
+
+    def test_socket_options_include_tcp_keepalive_when_enabled(self):
+        options = Transport(tcp_keepalive=True).socket_options()
+
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
+        self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), options)
+
+    def test_socket_options_can_disable_tcp_nodelay(self):
+        options = Transport(tcp_nodelay=False).socket_options()
+
+        self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 0), options)
+        self.assertNotIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), options)
+
+    def test_mount_installs_adapter_for_http_and_https(self):
+        session = mock.Mock()
+        session.headers = {}
+
+        Transport(keep_alive=False).mount(session)
+
+        self.assertEqual(2, session.mount.call_count)
+        self.assertEqual("close", session.headers["Connection"])
+
+    def test_request_passes_timeout_to_session(self):
+        session = mock.Mock()
+
+        Transport(connect_timeout=1, read_timeout=2).request(session, "GET", "http://fake.url")
+
+        session.request.assert_called_with("GET", "http://fake.url", timeout=(1, 2))
+
+    def test_request_does_not_pass_timeout_when_not_configured(self):
+        session = mock.Mock()
+
+        Transport().request(session, "GET", "http://fake.url", params={})
+
+        session.request.assert_called_with("GET", "http://fake.url", params={})
+
+    def test_shared_adapter_is_built_once(self):
+        transport = Transport()
+
+        self.assertIs(transport.shared_adapter(), transport.shared_adapter())
+        self.assertIsNot(transport.shared_adapter(), transport.adapter())
+
+    def test_mount_can_install_the_shared_adapter(self):
+        transport = Transport()
+        session = mock.Mock()
+
+        transport.mount(session, shared=True)
+
+        session.mount.assert_called_with("http://", transport.shared_adapter())
+
+    def test_adapter_keeps_socket_options_when_pickled(self):
+        adapter = pickle.loads(pickle.dumps(Transport(tcp_keepalive=True).adapter()))
+
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), adapter.socket_options)
+        self.assertEqual(
+            adapter.socket_options, adapter.poolmanager.connection_pool_kw["socket_options"])
+
+    def test_pickled_transport_gets_a_new_lock_and_shared_adapter(self):
+        transport = Transport(pool_maxsize=4)
+        adapter = transport.shared_adapter()
+
+        copy = pickle.loads(pickle.dumps(transport))
+
+        self.assertEqual(4, copy.pool_maxsize)
+        self.assertIsNot(adapter, copy.shared_adapter())
+        self.assertIs(copy.shared_adapter(), copy.shared_adapter())
@@ -20,6 +20,24 @@ class TestV2_0(unittest.TestCase):
         self.assertEqual(1, len(accounts))
         self.assertIsInstance(accounts[0], Account)
 
+    @mock.patch("contextio.lib.api.Api._request_uri")
+    def test_iter_accounts_pages_through_accounts(self, mock_request):
+        mock_request.side_effect = [[{"id": "foo"}, {"id": "bar"}], []]
+
+        accounts = list(self.api.iter_accounts(page_size=2))
+
+        self.assertEqual(["foo", "bar"], [account.id for account in accounts])
+        mock_request.assert_called_with("accounts", params={"limit": 2, "offset": 2})
+
+    @mock.patch("contextio.lib.api.Api._request_uri")
+    def test_fan_out_runs_job_over_every_account(self, mock_request):
+        mock_request.side_effect = [[{"id": "foo"}, {"id": "bar"}], []]
+
+        report = self.api.fan_out(lambda account: account.id.upper(), page_size=2, status_ok=1)
+
+        self.assertEqual([("foo", "FOO"), ("bar", "BAR")], report.results)
+        mock_request.assert_any_call("accounts", params={"status_ok": 1, "limit": 2, "offset": 0})
+
     @mock.patch("contextio.lib.api.Api._request_uri")
     def test_post_account_returns_Account_object(self, mock_request):
         mock_request.return_value = {"id": "some_id"}
@@ -0,0 +1,170 @@
+import hashlib
+import hmac
+import json
+import threading
+import unittest
+
+from mock import patch
+from six.moves import http_client
+
+from contextio.lib.resources.account import Account
+from contextio.lib.resources.message import Message
+from contextio.lib.resources.user import User
+from contextio.lib.v2_0 import V2_0
+from contextio.lib.webhooks import WebhookEvent, WebhookReceiver, verify_signature
+
+
+def sign(payload, secret="bar"):
+    message = "{0}{1}".format(payload["timestamp"], payload["token"]).encode("utf-8")
+    payload["signature"] = hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
+    return payload
+
+
+def callback(account_id="fake_account", message_id="fake_message"):
+    return sign({
+        "account_id": account_id,
+        "webhook_id": "fake_webhook",
+        "timestamp": 1420070400,
+        "token": "fake_token",
+        "message_data": {"message_id": message_id, "subject": "hi", "date": 1420070399},
+    })
+
+
+class TestVerifySignature(unittest.TestCase):
+    def test_accepts_valid_signature(self):
+        self.assertTrue(verify_signature(callback(), "bar"))
+
+    def test_rejects_bad_or_missing_signature(self):
+        self.assertFalse(verify_signature(callback(), "other secret"))
+        self.assertFalse(verify_signature(dict(callback(), signature=123), "bar"))
+        self.assertFalse(verify_signature({"timestamp": 1}, "bar"))
+
+
+class TestWebhookEvent(unittest.TestCase):
+    def setUp(self):
+        self.api = V2_0(consumer_key="foo", consumer_secret="bar")
+
+    def test_builds_account_and_message(self):
+        event = WebhookEvent(self.api, callback())
+
+        self.assertIsInstance(event.account, Account)
+        self.assertEqual("fake_account", event.account.id)
+        self.assertIsInstance(event.message, Message)
+        self.assertIs(event.account, event.message.parent)
+        self.assertEqual("hi", event.message.subject)
+        self.assertEqual("fake_webhook", event.webhook_id)
+
+    def test_builds_user_for_lite_callbacks(self):
+        payload = callback()
+        payload["user_id"] = payload.pop("account_id")
+
+        event = WebhookEvent(self.api, payload)
+
+        self.assertIsInstance(event.account, User)
+
+    def test_message_is_None_without_message_data(self):
+        payload = callback()
+        del payload["message_data"]
+
+        self.assertIsNone(WebhookEvent(self.api, payload).message)
+
+
+class TestWebhookReceiver(unittest.TestCase):
+    def setUp(self):
+        self.api = V2_0(consumer_key="foo", consumer_secret="bar")
+        self.events = []
+        self.handled = threading.Event()
+
+        def handler(event):
+            self.events.append(event)
+            if event.message.message_id == "boom":
+                raise ValueError("boom")
+            self.handled.set()
+
+        self.receiver = WebhookReceiver(self.api, handler, host="127.0.0.1", port=0, workers=2)
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def post(self, body, path="/"):
+        host, port = self.receiver.address
+        connection = http_client.HTTPConnection(host, port, timeout=5)
+        connection.request("POST", path, body, {"Content-Type": "application/json"})
+        status = connection.getresponse().status
+        connection.close()
+        return status
+
+    def test_acknowledges_and_dispatches_callbacks(self):
+        self.receiver.start()
+
+        self.assertEqual(200, self.post(json.dumps(callback())))
+        self.assertTrue(self.handled.wait(5))
+        self.assertEqual("fake_message", self.events[0].message.message_id)
+
+    def test_rejects_bad_signatures_and_bodies(self):
+        self.receiver.start()
+
+        self.assertEqual(401, self.post(json.dumps(dict(callback(), token="forged"))))
+        self.assertEqual(400, self.post("not json"))
+        self.assertEqual(400, self.post(json.dumps(["not", "a", "dict"])))
+        self.assertEqual(3, self.receiver.stats()["rejected"])
+
+    def test_only_accepts_callbacks_on_its_path(self):
+        self.receiver.path = "/contextio"
+        self.receiver.start()
+
+        self.assertEqual(404, self.post(json.dumps(callback()), path="/elsewhere"))
+        self.assertEqual(200, self.post(json.dumps(callback()), path="/contextio?x=1"))
+
+    def test_refused_requests_close_the_connection(self):
+        self.receiver.path = "/contextio"
+        self.receiver.start()
+        host, port = self.receiver.address
+        connection = http_client.HTTPConnection(host, port, timeout=5)
+        try:
+            connection.request("POST", "/elsewhere", json.dumps(callback()))
+            response = connection.getresponse()
+            response.read()
+            self.assertEqual(404, response.status)
+            self.assertEqual("close", response.getheader("Connection"))
+
+            # the unread body isn't taken for the next request
+            connection.request("POST", "/contextio", json.dumps(callback()))
+            self.assertEqual(200, connection.getresponse().status)
+        finally:
+            connection.close()
+
+    @patch("contextio.lib.webhooks.time.time", return_value=1420070400 + 301)
+    def test_rejects_stale_callbacks_when_max_age_is_set(self, time):
+        receiver = WebhookReceiver(self.api, lambda event: None, port=0, max_age=300)
+        try:
+            self.assertEqual(401, receiver.accept(json.dumps(callback()).encode("utf-8")))
+            self.assertEqual(401, receiver.accept(
+                json.dumps(sign(dict(callback(), timestamp="soon"))).encode("utf-8")))
+            self.assertEqual(2, receiver.stats()["rejected"])
+
+            time.return_value = 1420070400 + 300
+            self.assertEqual(200, receiver.accept(json.dumps(callback()).encode("utf-8")))
+        finally:
+            receiver.stop()
+
+    def test_answers_503_when_queue_is_full(self):
+        receiver = WebhookReceiver(self.api, lambda event: None, port=0, queue_size=1)
+        try:
+            self.assertEqual(200, receiver.accept(json.dumps(callback()).encode("utf-8")))
+            self.assertEqual(503, receiver.accept(json.dumps(callback()).encode("utf-8")))
+            self.assertEqual(1, receiver.stats()["dropped"])
+            self.assertEqual(1, receiver.stats()["queued"])
+        finally:
+            receiver.stop()
+
+    def test_handler_errors_are_counted(self):
+        self.receiver.start()
+
+        self.receiver.accept(json.dumps(callback(message_id="boom")).encode("utf-8"))
+        self.receiver.accept(json.dumps(callback()).encode("utf-8"))
+        self.assertTrue(self.handled.wait(5))
+        self.receiver.stop()
+
+        self.assertEqual(1, self.receiver.stats()["failed"])
+        self.assertEqual(1, self.receiver.stats()["handled"])
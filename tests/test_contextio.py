@@ -1,3 +1,5 @@
+import subprocess
+import sys
 import unittest
 from contextio.contextio import ContextIO
 
@@ -15,3 +17,17 @@ class TestContextIOFactory(unittest.TestCase):
         contextio = ContextIO(consumer_key="foo", consumer_secret="bar", api_version="lite")
 
         self.assertIsInstance(contextio, Lite)
+
+    def test_importing_contextio_does_not_import_pkg_resources(self):
+        code = "import sys, contextio; sys.exit('pkg_resources' in sys.modules)"
+
+        self.assertEqual(0, subprocess.call([sys.executable, "-c", code]))
+
+    @unittest.skipIf(sys.version_info < (3, 7), "AsyncContextIO needs python 3.7")
+    def test_AsyncContextIO_is_imported_on_first_use(self):
+        code = (
+            "import sys, contextio; loaded = 'contextio.lib.async_api' in sys.modules; "
+            "contextio.AsyncContextIO; "
+            "sys.exit(loaded or 'contextio.lib.async_api' not in sys.modules)")
+
+        self.assertEqual(0, subprocess.call([sys.executable, "-c", code]))